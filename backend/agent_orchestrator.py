@@ -1,93 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import json
 import os
 from fastapi import UploadFile
 import PyPDF2
 import docx
 import io
-import ollama
+from llm_client import ollama_client, PRIORITY_BACKGROUND
+from ollama_lifecycle import ollama_lifecycle
+from resume_cache import resume_cache, file_hash, prompt_version
 
-class AgentOrchestrator:
-    """Orchestrates AI agents for resume parsing, cover letter generation, etc."""
-    
-    def __init__(self):
-        self.agents = {}
-    
-    async def process_resume_upload(self, file: UploadFile, title: str = "Resume Profile") -> Dict[str, Any]:
-        """Process uploaded resume file and extract text for parsing"""
-        try:
-            # Read file content
-            content = await file.read()
-            return await self.process_resume_content(content, file.filename, title)
-            
-        except Exception as e:
-            raise Exception(f"Failed to process resume upload: {str(e)}")
-    
-    async def process_resume_content(self, content: bytes, filename: str, title: str = "Resume Profile") -> Dict[str, Any]:
-        """Process resume content and extract text for parsing"""
-        try:
-            print(f"🔍 DEBUG: Processing resume file: {filename}")
-            print(f"🔍 DEBUG: File size: {len(content)} bytes")
-            
-            # Extract text based on file type
-            if filename.lower().endswith('.pdf'):
-                print("🔍 DEBUG: Processing PDF file")
-                resume_text = self.extract_text_from_pdf(content)
-            elif filename.lower().endswith(('.doc', '.docx')):
-                print("🔍 DEBUG: Processing DOCX file")
-                resume_text = self.extract_text_from_docx(content)
-            elif filename.lower().endswith('.txt'):
-                print("🔍 DEBUG: Processing TXT file")
-                resume_text = content.decode('utf-8')
-            else:
-                raise ValueError(f"Unsupported file type: {filename}")
-            
-            print(f"🔍 DEBUG: Extracted text length: {len(resume_text)} characters")
-            print(f"🔍 DEBUG: First 200 chars: {resume_text[:200]}...")
-            
-            # Parse the extracted text
-            print("🔍 DEBUG: Starting resume parsing...")
-            result = self.parse_resume(resume_text)
-            print(f"🔍 DEBUG: Parsing completed. Result keys: {list(result.keys())}")
-            print(f"🔍 DEBUG: Personal info: {result.get('personal_information', {})}")
-            
-            return result
-            
-        except Exception as e:
-            print(f"❌ DEBUG: Error in process_resume_content: {str(e)}")
-            raise Exception(f"Failed to process resume content: {str(e)}")
-    
-    def extract_text_from_pdf(self, content: bytes) -> str:
-        """Extract text from PDF content"""
-        try:
-            pdf_file = io.BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {str(e)}")
-    
-    def extract_text_from_docx(self, content: bytes) -> str:
-        """Extract text from DOCX content"""
-        try:
-            doc_file = io.BytesIO(content)
-            doc = docx.Document(doc_file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            raise Exception(f"Failed to extract text from DOCX: {str(e)}")
-    
-    def parse_resume(self, resume_text: str) -> Dict[str, Any]:
-        """Parse resume text using Ollama AI model"""
-        print(f"🤖 DEBUG: Starting AI-powered resume parsing with Ollama")
-        print(f"🤖 DEBUG: Resume text length: {len(resume_text)} characters")
-        
-        # Create the AI prompt for resume parsing
-        prompt = f"""
+# Resume parsing prompt (str.format template, {resume_text} is the only field)
+RESUME_PARSE_PROMPT = """
 You are an expert data extraction agent. Your task is to extract structured information from the provided resume and return a **strictly valid JSON** object matching the schema defined below. All keys must always be present, even if values are missing.
 
 ## Output Format (MUST MATCH EXACTLY):
@@ -260,341 +183,197 @@ Now extract the structured data from the following resume:
 
 Return only the JSON."""
 
+def _object_schema(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Object with every property required (the prompt asks for all keys) and no others"""
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+STRING = {"type": "string"}
+NULLABLE_STRING = {"type": ["string", "null"]}
+
+# RESUME_PARSE_PROMPT's output format as a JSON schema, sent as Ollama's output format
+RESUME_SCHEMA = _object_schema({
+    "personal_information": _object_schema({
+        "full_name": STRING,
+        "email": STRING,
+        "phone": STRING,
+        **{key: NULLABLE_STRING for key in ("gender", "address", "city", "state", "zip_code", "country", "citizenship")}
+    }),
+    "work_experience": {"type": "array", "items": _object_schema({
+        "title": STRING,
+        "company": STRING,
+        "location": STRING,
+        "start_date": STRING,
+        "end_date": NULLABLE_STRING,
+        "description": STRING
+    })},
+    "education": {"type": "array", "items": _object_schema({
+        "degree": STRING,
+        "school": STRING,
+        "start_date": STRING,
+        "end_date": NULLABLE_STRING,
+        "gpa": NULLABLE_STRING
+    })},
+    "skills": {"type": "array", "items": _object_schema({
+        "name": STRING,
+        "years": {"type": ["integer", "null"]}
+    })},
+    "languages": {"type": "array", "items": STRING},
+    "job_preferences": _object_schema({
+        key: STRING for key in (
+            "linkedin_link", "github_link", "portfolio_link", "other_url", "current_salary", "expected_salary",
+            "notice_period", "total_work_experience", "highest_education", "willing_to_relocate",
+            "driving_license", "visa_requirement"
+        )
+    }),
+    "achievements": {"type": "array", "items": _object_schema({
+        "title": STRING,
+        "issuer": NULLABLE_STRING,
+        "date": NULLABLE_STRING,
+        "description": NULLABLE_STRING
+    })},
+    "certificates": {"type": "array", "items": _object_schema({
+        "name": STRING,
+        **{key: NULLABLE_STRING for key in ("organization", "issue_date", "expiry_date", "credential_id", "credential_url")}
+    })}
+})
+
+class AgentOrchestrator:
+    """Orchestrates AI agents for resume parsing, cover letter generation, etc."""
+    
+    def __init__(self):
+        self.agents = {}
+    
+    async def process_resume_upload(self, file: UploadFile, title: str = "Resume Profile") -> Dict[str, Any]:
+        """Process uploaded resume file and extract text for parsing"""
         try:
-            print("🤖 DEBUG: Attempting to connect to Ollama...")
-            
-            # Check if Ollama is available
-            try:
-                ollama.list()  # Test connection
-                print("✅ DEBUG: Ollama is running, sending parsing request...")
-            except Exception as e:
-                print(f"❌ DEBUG: Ollama not available: {e}")
-                raise Exception("Ollama service not available")
-            
-            # Use Ollama to parse the resume
-            response = ollama.chat(model='llama3.2', messages=[
-                {
-                    'role': 'user',
-                    'content': prompt
-                }
-            ])
-            
-            ai_response = response['message']['content']
-            print(f"🤖 DEBUG: Ollama response length: {len(ai_response)} characters")
-            print(f"🤖 DEBUG: First 200 chars of response: {ai_response[:200]}...")
+            # Read file content
+            content = await file.read()
+            return await self.process_resume_content(content, file.filename, title)
             
-            # Try to parse the JSON response
-            try:
-                # Clean the response to extract just the JSON
-                # Handle case where AI returns code blocks or other formats
-                if '```json' in ai_response:
-                    # Extract from code block
-                    start_marker = ai_response.find('```json') + 7
-                    end_marker = ai_response.find('```', start_marker)
-                    if end_marker > start_marker:
-                        ai_response = ai_response[start_marker:end_marker].strip()
-                elif '```' in ai_response:
-                    # Extract from generic code block
-                    start_marker = ai_response.find('```') + 3
-                    end_marker = ai_response.find('```', start_marker)
-                    if end_marker > start_marker:
-                        ai_response = ai_response[start_marker:end_marker].strip()
-                
-                json_start = ai_response.find('{')
-                json_end = ai_response.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = ai_response[json_start:json_end]
-                    
-                    # Clean invalid control characters that break JSON parsing
-                    import re
-                    # Replace problematic control characters with escaped versions
-                    json_str = re.sub(r'[\x00-\x1f\x7f]', lambda m: '\\n' if m.group() == '\n' else '', json_str)
-                    # Also handle unescaped newlines in strings
-                    json_str = re.sub(r'(?<!\\)"\s*\n\s*"', '""', json_str)
-                    # Remove trailing commas before closing braces/brackets
-                    json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)
-                    
-                    print(f"🔧 DEBUG: Cleaned JSON length: {len(json_str)} characters")
-                    
-                    parsed_profile = json.loads(json_str)
-                    
-                    print("✅ DEBUG: Successfully parsed JSON from Ollama")
-                    print(f"✅ DEBUG: Extracted data summary:")
-                    print(f"  - Name: {parsed_profile.get('personal_information', {}).get('full_name', 'N/A')}")
-                    print(f"  - Email: {parsed_profile.get('personal_information', {}).get('email', 'N/A')}")
-                    print(f"  - Education entries: {len(parsed_profile.get('education', []))}")
-                    print(f"  - Work experience entries: {len(parsed_profile.get('work_experience', []))}")
-                    print(f"  - Skills: {len(parsed_profile.get('skills', []))}")
-                    print(f"  - Languages: {len(parsed_profile.get('languages', []))}")
-                    print(f"  - Achievements: {len(parsed_profile.get('achievements', []))}")
-                    print(f"  - Certificates: {len(parsed_profile.get('certificates', []))}")
-                    
-                    return parsed_profile
-                else:
-                    raise ValueError("No valid JSON found in response")
-                    
-            except json.JSONDecodeError as e:
-                print(f"❌ DEBUG: JSON parsing failed: {e}")
-                print(f"❌ DEBUG: Raw response (first 1000 chars): {ai_response[:1000]}")
-                print(f"❌ DEBUG: Cleaned JSON (first 500 chars): {json_str[:500] if 'json_str' in locals() else 'N/A'}")
-                
-                # Try a more aggressive cleaning approach
-                try:
-                    print("🔧 DEBUG: Attempting aggressive JSON cleaning...")
-                    
-                    # Step 1: Clean the response more thoroughly
-                    cleaned = ai_response
-                    
-                    # Universal approach: Clean ALL non-standard characters
-                    import re
-                    import unicodedata
-                    
-                    # Method 1: Replace common bullets/symbols with safe equivalents
-                    bullet_chars = ['•', '●', '○', '◦', '▪', '▫', '■', '□', '➢', '→', '⇒', '▶', '►']
-                    for bullet in bullet_chars:
-                        cleaned = cleaned.replace(bullet, '-')
-                    
-                    # Method 2: Normalize Unicode characters to ASCII equivalents where possible
-                    # This handles accented characters, smart quotes, etc.
-                    cleaned = unicodedata.normalize('NFKD', cleaned)
-                    
-                    # Method 3: Convert remaining Unicode to ASCII or remove
-                    def unicode_to_ascii(text):
-                        """Convert Unicode to ASCII, removing or replacing problematic chars"""
-                        result = []
-                        for char in text:
-                            # Keep basic ASCII printable + whitespace
-                            if ord(char) <= 127:
-                                result.append(char)
-                            else:
-                                # Try to get ASCII equivalent
-                                try:
-                                    ascii_char = unicodedata.normalize('NFKD', char).encode('ascii', 'ignore').decode('ascii')
-                                    if ascii_char:
-                                        result.append(ascii_char)
-                                    else:
-                                        # Replace with space for unknown chars
-                                        result.append(' ')
-                                except:
-                                    result.append(' ')
-                        return ''.join(result)
-                    
-                    cleaned = unicode_to_ascii(cleaned)
-                    
-                    # Method 4: Final cleanup of remaining problematic characters
-                    # Keep only safe characters for JSON
-                    cleaned = re.sub(r'[^\x20-\x7E\n\r\t]', ' ', cleaned)
-                    
-                    # Find JSON boundaries
-                    json_start = cleaned.find('{')
-                    json_end = cleaned.rfind('}') + 1
-                    
-                    if json_start >= 0 and json_end > json_start:
-                        json_str = cleaned[json_start:json_end]
-                        
-                        # Step 2: Fix the main issue - unescaped newlines in JSON strings
-                        # This is a much simpler and more reliable approach
-                        
-                        # Find all string values that span multiple lines and fix them
-                        def fix_multiline_strings(text):
-                            """Fix JSON strings that contain unescaped newlines"""
-                            import re
-                            
-                            # Pattern to find string values with newlines: "description": "content with\n more content"
-                            def replace_multiline(match):
-                                field_name = match.group(1)
-                                content = match.group(2)
-                                
-                                # Escape all newlines and clean up the content
-                                escaped_content = content.replace('\n', '\\n').replace('\r', '\\r')
-                                escaped_content = re.sub(r'\s+', ' ', escaped_content)  # Normalize whitespace
-                                escaped_content = escaped_content.strip()
-                                
-                                return f'"{field_name}": "{escaped_content}"'
-                            
-                            # Match field: "multiline content"
-                            pattern = r'"([^"]+)":\s*"([^"]*(?:\n[^"]*)*)"'
-                            fixed = re.sub(pattern, replace_multiline, text, flags=re.DOTALL)
-                            
-                            return fixed
-                        
-                        json_str = fix_multiline_strings(json_str)
-                        
-                        # Step 3: Additional cleanup
-                        json_str = re.sub(r',(\s*[}\]])', r'\1', json_str)  # Remove trailing commas
-                        json_str = re.sub(r'\n\s*\n', '\n', json_str)  # Remove empty lines
-                        
-                        # Step 4: Final escape any remaining literal newlines/control chars in strings
-                        json_str = re.sub(r':\s*"([^"]*[\x00-\x1f][^"]*)"', 
-                                         lambda m: f': "{m.group(1).encode("unicode_escape").decode("ascii")}"', 
-                                         json_str)
-                        
-                        print(f"🔧 DEBUG: Final cleaned JSON (first 400 chars): {json_str[:400]}...")
-                        
-                        # Debug the specific error location
-                        try:
-                            parsed_profile = json.loads(json_str)
-                        except json.JSONDecodeError as detailed_error:
-                            error_pos = detailed_error.pos
-                            print(f"🔍 DEBUG: JSON error at position {error_pos}")
-                            print(f"🔍 DEBUG: Context around error:")
-                            start = max(0, error_pos - 100)
-                            end = min(len(json_str), error_pos + 100)
-                            print(f"🔍 DEBUG: ...{json_str[start:end]}...")
-                            
-                            # Try a more aggressive fix for common JSON issues
-                            fixed_json = self._fix_json_structure(json_str)
-                            if fixed_json:
-                                parsed_profile = json.loads(fixed_json)
-                                print("✅ DEBUG: Successfully parsed JSON after structural fix!")
-                            else:
-                                raise detailed_error
-                        print("✅ DEBUG: Successfully parsed JSON after aggressive cleaning!")
-                        return parsed_profile
-                        
-                except Exception as cleanup_error:
-                    print(f"❌ DEBUG: Aggressive cleaning also failed: {cleanup_error}")
-                    
-                    # Last resort: try to build a minimal valid JSON
-                    try:
-                        print("🔧 DEBUG: Attempting minimal JSON extraction...")
-                        lines = ai_response.split('\n')
-                        email = phone = name = ""
-                        
-                        for line in lines:
-                            if 'email' in line.lower() and '@' in line:
-                                match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', line)
-                                if match:
-                                    email = match.group()
-                            elif 'phone' in line.lower() and ('(' in line or '+' in line):
-                                match = re.search(r'[\+\(]?[\d\-\)\(\s]+', line)
-                                if match:
-                                    phone = match.group().strip()
-                            elif 'full_name' in line.lower() and ':' in line:
-                                match = re.search(r'"([^"]+)"', line)
-                                if match and match.group(1):
-                                    name = match.group(1)
-                        
-                        minimal_profile = {
-                            "personal_information": {
-                                "full_name": name,
-                                "email": email,
-                                "phone": phone,
-                                "gender": "",
-                                "address": "",
-                                "city": "",
-                                "state": "",
-                                "zip_code": "",
-                                "country": "",
-                                "citizenship": ""
-                            },
-                            "work_experience": [],
-                            "education": [],
-                            "skills": [],
-                            "languages": [],
-                            "job_preferences": {},
-                            "achievements": [],
-                            "certificates": []
-                        }
-                        
-                        print("✅ DEBUG: Created minimal profile from extracted data")
-                        return minimal_profile
-                        
-                    except Exception as minimal_error:
-                        print(f"❌ DEBUG: Even minimal extraction failed: {minimal_error}")
-                
-                raise ValueError(f"Invalid JSON response from Ollama: {e}")
-                
         except Exception as e:
-            print(f"❌ DEBUG: Ollama request failed: {e}")
-            print("⚠️ DEBUG: Falling back to basic parsing...")
-            
-            # Fallback to basic parsing if Ollama fails
-            return self._fallback_parse(resume_text)
+            raise Exception(f"Failed to process resume upload: {str(e)}")
     
-    def _fix_json_structure(self, json_str: str) -> str:
-        """Try to fix common JSON structural issues"""
+    async def process_resume_content(self, content: bytes, filename: str, title: str = "Resume Profile") -> Dict[str, Any]:
+        """Process resume content and extract text for parsing (both cached by the file's SHA-256)"""
         try:
-            print("🔧 DEBUG: Attempting structural JSON fix...")
-            
-            import re
-            
-            # Fix 1: Escape unescaped quotes in string values
-            def fix_quotes_in_strings(text):
-                # Pattern to match string values and escape internal quotes
-                def escape_internal_quotes(match):
-                    field_name = match.group(1)
-                    value = match.group(2)
-                    # Escape internal quotes but not the boundary quotes
-                    escaped_value = value.replace('"', '\\"')
-                    return f'"{field_name}": "{escaped_value}"'
-                
-                # Match "field": "value with possible unescaped quotes"
-                pattern = r'"([^"]+)":\s*"([^"]*(?:[^"\\]"[^"]*)*)"'
-                return re.sub(pattern, escape_internal_quotes, text)
-            
-            fixed = fix_quotes_in_strings(json_str)
+            print(f"🔍 DEBUG: Processing resume file: {filename}")
+            print(f"🔍 DEBUG: File size: {len(content)} bytes")
             
-            # Fix 2: Fix invalid numeric expressions like "gpa": 3.87/4.0
-            fixed = re.sub(r'"gpa":\s*(\d+\.\d+)/(\d+\.\d+)', r'"gpa": "\1"', fixed)
-            fixed = re.sub(r'"years":\s*(\d+)', r'"years": \1', fixed)  # Keep years as numbers
+            # An unchanged file parsed with the same prompt and model is answered from the cache
+            content_hash = file_hash(content)
+            parse_key = resume_cache.parse_key(content_hash, prompt_version(RESUME_PARSE_PROMPT), ollama_client.model)
+            cached_profile = resume_cache.get_profile(parse_key)
+            if cached_profile is not None:
+                print(f"⚡ Resume {content_hash[:12]} parsed before with this prompt and model, using the cached profile")
+                return cached_profile
             
-            # Fix 2.5: Fix truncated descriptions that might end abruptly
-            # Look for lines that end with text but no closing quote before a newline with structure
-            def fix_truncated_descriptions(text):
-                lines = text.split('\n')
-                fixed_lines = []
-                for i, line in enumerate(lines):
-                    # Check if this line looks like a truncated description
-                    if ('"description":' in line and 
-                        line.count('"') == 3 and  # Field name + opening quote, but no closing quote
-                        i + 1 < len(lines) and 
-                        (lines[i + 1].strip().startswith('}') or lines[i + 1].strip().startswith('],'))):
-                        # Add closing quote
-                        line = line.rstrip() + '"'
-                    fixed_lines.append(line)
-                return '\n'.join(fixed_lines)
+            resume_text = resume_cache.get_text(content_hash)
+            if resume_text is not None:
+                print(f"⚡ Resume {content_hash[:12]} text extracted before, skipping extraction")
+            else:
+                resume_text = self.extract_text(content, filename)
+                resume_cache.put_text(content_hash, resume_text)
             
-            fixed = fix_truncated_descriptions(fixed)
+            print(f"🔍 DEBUG: Extracted text length: {len(resume_text)} characters")
+            print(f"🔍 DEBUG: First 200 chars: {resume_text[:200]}...")
             
-            # Fix 3: Remove trailing commas before closing brackets/braces
-            fixed = re.sub(r',(\s*[}\]])', r'\1', fixed)
+            # Parse the extracted text
+            print("🔍 DEBUG: Starting resume parsing...")
+            result, complete = await self._parse_resume(resume_text)
+            if complete:
+                resume_cache.put_profile(parse_key, result)
+            print(f"🔍 DEBUG: Parsing completed. Result keys: {list(result.keys())}")
+            print(f"🔍 DEBUG: Personal info: {result.get('personal_information', {})}")
             
-            # Fix 4: Fix missing commas between objects/arrays
-            fixed = re.sub(r'}\s*{', '}, {', fixed)
-            fixed = re.sub(r']\s*\[', '], [', fixed)
+            return result
             
-            # Fix 4: Fix incomplete strings (strings that don't close)
-            lines = fixed.split('\n')
-            fixed_lines = []
-            for line in lines:
-                # Count quotes in the line
-                quote_count = line.count('"')
-                # If odd number of quotes, the string is incomplete
-                if quote_count % 2 == 1 and ':' in line:
-                    # Try to close the incomplete string
-                    if line.rstrip().endswith(','):
-                        line = line.rstrip()[:-1] + '",\n'
-                    else:
-                        line = line.rstrip() + '"\n'
-                fixed_lines.append(line)
+        except Exception as e:
+            print(f"❌ DEBUG: Error in process_resume_content: {str(e)}")
+            raise Exception(f"Failed to process resume content: {str(e)}")
+    
+    def extract_text(self, content: bytes, filename: str) -> str:
+        """Extract text based on file type"""
+        if filename.lower().endswith('.pdf'):
+            print("🔍 DEBUG: Processing PDF file")
+            return self.extract_text_from_pdf(content)
+        elif filename.lower().endswith(('.doc', '.docx')):
+            print("🔍 DEBUG: Processing DOCX file")
+            return self.extract_text_from_docx(content)
+        elif filename.lower().endswith('.txt'):
+            print("🔍 DEBUG: Processing TXT file")
+            return content.decode('utf-8')
+        else:
+            raise ValueError(f"Unsupported file type: {filename}")
+    
+    def extract_text_from_pdf(self, content: bytes) -> str:
+        """Extract text from PDF content"""
+        try:
+            pdf_file = io.BytesIO(content)
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            text = ""
+            for page in pdf_reader.pages:
+                text += page.extract_text() + "\n"
+            return text.strip()
+        except Exception as e:
+            raise Exception(f"Failed to extract text from PDF: {str(e)}")
+    
+    def extract_text_from_docx(self, content: bytes) -> str:
+        """Extract text from DOCX content"""
+        try:
+            doc_file = io.BytesIO(content)
+            doc = docx.Document(doc_file)
+            text = ""
+            for paragraph in doc.paragraphs:
+                text += paragraph.text + "\n"
+            return text.strip()
+        except Exception as e:
+            raise Exception(f"Failed to extract text from DOCX: {str(e)}")
+    
+    async def parse_resume(self, resume_text: str) -> Dict[str, Any]:
+        """Parse resume text using Ollama AI model"""
+        profile, _ = await self._parse_resume(resume_text)
+        return profile
+    
+    async def _parse_resume(self, resume_text: str) -> Tuple[Dict[str, Any], bool]:
+        """Parse resume text; returns (profile, complete) - False for the fallback profile, which is not cached"""
+        print(f"🤖 DEBUG: Starting AI-powered resume parsing with Ollama")
+        print(f"🤖 DEBUG: Resume text length: {len(resume_text)} characters")
+        
+        # Create the AI prompt for resume parsing
+        prompt = RESUME_PARSE_PROMPT.format(resume_text=resume_text)
+
+        try:
+            print("🤖 DEBUG: Attempting to connect to Ollama...")
             
-            fixed = '\n'.join(fixed_lines)
+            # Check if Ollama is available (cached by the lifecycle manager)
+            if not ollama_lifecycle.available():
+                print("❌ DEBUG: Ollama not available")
+                raise Exception("Ollama service not available")
+            print("✅ DEBUG: Ollama is running, sending parsing request...")
             
-            # Fix 5: Ensure proper closing of the main JSON object
-            if not fixed.rstrip().endswith('}'):
-                fixed = fixed.rstrip() + '\n}'
+            # Schema-constrained output parses directly; complete_json regenerates if it still does not
+            parsed_profile = await ollama_client.complete_json(prompt, RESUME_SCHEMA, task='resume_parse', chat=True,
+                                                               priority=PRIORITY_BACKGROUND)
             
-            print(f"🔧 DEBUG: Structural fix applied, new length: {len(fixed)}")
+            print("✅ DEBUG: Successfully parsed JSON from Ollama")
+            print(f"✅ DEBUG: Extracted data summary:")
+            print(f"  - Name: {parsed_profile.get('personal_information', {}).get('full_name', 'N/A')}")
+            print(f"  - Email: {parsed_profile.get('personal_information', {}).get('email', 'N/A')}")
+            print(f"  - Education entries: {len(parsed_profile.get('education', []))}")
+            print(f"  - Work experience entries: {len(parsed_profile.get('work_experience', []))}")
+            print(f"  - Skills: {len(parsed_profile.get('skills', []))}")
+            print(f"  - Languages: {len(parsed_profile.get('languages', []))}")
+            print(f"  - Achievements: {len(parsed_profile.get('achievements', []))}")
+            print(f"  - Certificates: {len(parsed_profile.get('certificates', []))}")
             
-            # Test if the fix worked
-            json.loads(fixed)
-            return fixed
+            return parsed_profile, True
             
         except Exception as e:
-            print(f"❌ DEBUG: Structural fix failed: {e}")
-            return None
+            print(f"❌ DEBUG: Ollama request failed: {e}")
+            print("⚠️ DEBUG: Falling back to basic parsing...")
+            
+            # Fallback to basic parsing if Ollama fails
+            return self._fallback_parse(resume_text), False
     
     def _fallback_parse(self, resume_text: str) -> Dict[str, Any]:
         """Fallback parsing when Ollama is not available"""
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Per-user answer memory
+Custom screening questions ("Are you legally authorized to work in the United
+States?", "How did you hear about us?") come back on application after
+application in slightly different wording. Accepted answers - the values of a
+form the user submitted, or answers they saved or corrected themselves - are
+stored per user (saved_answers table); generated answers the user has not
+accepted never are. Later questions are matched against them:
+- exact match on the normalized question
+- otherwise token-set similarity (Jaccard over stemmed content words), so extra
+  or reordered words still match but a changed word ("US" -> "UK") does not
+Only confident matches are answered without the LLM. Each user keeps at most
+ANSWER_MEMORY_MAX_ENTRIES answers; the least recently used are evicted first.
+
+Configuration (environment):
+    ANSWER_MEMORY_MAX_ENTRIES  answers kept per user, default 500
+    ANSWER_MEMORY_THRESHOLD    similarity needed to reuse an answer, default 0.8
+"""
+
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import SavedAnswer
+
+ANSWER_MEMORY_MAX_ENTRIES = int(os.getenv("ANSWER_MEMORY_MAX_ENTRIES", "500"))
+ANSWER_MEMORY_THRESHOLD = float(os.getenv("ANSWER_MEMORY_THRESHOLD", "0.8"))
+
+# Words that carry no meaning of their own in a screening question
+STOPWORDS = frozenset("""
+a an the and or of to in on at for from by with about as is are be been being was were will would
+do does did have has had can could should may might must shall you your yours we our us i me my
+this that these those it its if any please which what when where who whom how there here
+""".split())
+
+STEM_LENGTH = 6  # "authorized"/"authorization", "sponsor"/"sponsorship" share a stem
+
+def question_key(question: str) -> str:
+    """Exact-match key: lowercase words without punctuation or required-field markers"""
+    return ' '.join(re.findall(r'[a-z0-9]+', (question or '').lower()))
+
+def question_tokens(question: str) -> frozenset:
+    """Stemmed content words of a question"""
+    return frozenset(word[:STEM_LENGTH] for word in question_key(question).split() if word not in STOPWORDS)
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def compatible_answer(answer, field: Dict[str, Any]):
+    """The answer as this field can take it: dropdowns need one of their options, otherwise None"""
+    valid_options = field.get("all_options") or field.get("options")
+    if not valid_options:
+        return answer
+    answer_lower = str(answer).strip().lower()
+    return next((option for option in valid_options if option.strip().lower() == answer_lower), None)
+
+class AnswerMemory:
+    """Stored answers per user with fuzzy question lookup and LRU eviction"""
+
+    def __init__(self, max_entries: int = ANSWER_MEMORY_MAX_ENTRIES, threshold: float = ANSWER_MEMORY_THRESHOLD):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.revisions: Dict[int, int] = {}  # Bumped on every change; part of the form cache's answer version
+
+    def revision(self, user_id: int) -> int:
+        """Changes whenever the user's stored answers change (in this process)"""
+        return self.revisions.get(user_id, 0)
+
+    def changed(self, user_id: int):
+        self.revisions[user_id] = self.revisions.get(user_id, 0) + 1
+
+    def match(self, entries: List[SavedAnswer], question: str) -> Tuple[Optional[SavedAnswer], float]:
+        """Best stored entry for a question and its similarity (1.0 for an exact match)"""
+        key = question_key(question)
+        tokens = question_tokens(question)
+        best, best_score = None, 0.0
+        for entry in entries:
+            score = 1.0 if entry.question_key == key else similarity(tokens, question_tokens(entry.question))
+            if score > best_score:
+                best, best_score = entry, score
+        return best, best_score
+
+    def lookup(self, db: Session, user_id: int, fields: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Answers for the fields (clean form entries) confidently matched to stored questions: {field id: answer}"""
+        entries = db.query(SavedAnswer).filter(SavedAnswer.user_id == user_id).all()
+        if not entries or not fields:
+            return {}
+
+        answers = {}
+        used = set()
+        for field in fields:
+            entry, score = self.match(entries, field.get("question", ""))
+            if entry is None or score < self.threshold:
+                continue
+            answer = compatible_answer(entry.answer, field)
+            if answer is None:
+                continue
+            print(f"🧠 Memory: '{field.get('question')}' ~ '{entry.question}' ({score:.2f}) -> {answer!r}")
+            answers[field["id"]] = answer
+            if entry.id not in used:
+                used.add(entry.id)
+                entry.hits = (entry.hits or 0) + 1
+                entry.last_used_at = datetime.now()
+
+        if used:
+            db.commit()
+        return answers
+
+    def remember(self, db: Session, user_id: int, items: List[Dict[str, Any]], source: str = "submitted") -> int:
+        """Store {question, answer, field_type} items (replacing answers to the same question); returns the count"""
+        # One entry per question: the session doesn't autoflush, so a repeated key would be inserted twice
+        pending = {}
+        for item in items:
+            key = question_key(item.get("question"))
+            if key and item.get("answer") not in (None, ""):
+                pending[key] = item  # The last answer to a question wins
+        if not pending:
+            return 0
+
+        existing = {entry.question_key: entry for entry in db.query(SavedAnswer).filter(
+            SavedAnswer.user_id == user_id, SavedAnswer.question_key.in_(list(pending)))}
+        stored = 0
+        now = datetime.now()
+        for key, item in pending.items():
+            entry = existing.get(key)
+            if entry is None:
+                entry = SavedAnswer(user_id=user_id, question_key=key)
+                db.add(entry)
+            elif entry.source == "user" and source != "user":
+                continue  # Never overwrite the user's own answer with one from a submitted form
+            entry.question = item["question"]
+            entry.answer = item["answer"]
+            entry.field_type = item.get("field_type")
+            entry.source = source
+            entry.last_used_at = now
+            stored += 1
+
+        db.flush()
+        self.evict(db, user_id)
+        db.commit()
+        if stored:
+            self.changed(user_id)
+        return stored
+
+    def evict(self, db: Session, user_id: int):
+        """Drop the least recently used answers beyond max_entries"""
+        count = db.query(func.count(SavedAnswer.id)).filter(SavedAnswer.user_id == user_id).scalar()
+        if count <= self.max_entries:
+            return
+        stale = (db.query(SavedAnswer.id).filter(SavedAnswer.user_id == user_id)
+                 .order_by(SavedAnswer.last_used_at.asc(), SavedAnswer.id.asc())
+                 .limit(count - self.max_entries).all())
+        db.query(SavedAnswer).filter(SavedAnswer.id.in_([row.id for row in stale])).delete(synchronize_session=False)
+        print(f"🧹 Memory: evicted {len(stale)} least recently used answers for user {user_id}")
+
+    def entries(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
+        rows = (db.query(SavedAnswer).filter(SavedAnswer.user_id == user_id)
+                .order_by(SavedAnswer.last_used_at.desc()).all())
+        return [{
+            "id": row.id,
+            "question": row.question,
+            "answer": row.answer,
+            "field_type": row.field_type,
+            "source": row.source,
+            "hits": row.hits or 0,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "last_used_at": row.last_used_at.isoformat() if row.last_used_at else None
+        } for row in rows]
+
+    def delete(self, db: Session, user_id: int, answer_id: int) -> bool:
+        deleted = db.query(SavedAnswer).filter(SavedAnswer.user_id == user_id, SavedAnswer.id == answer_id).delete()
+        db.commit()
+        self.changed(user_id)
+        return bool(deleted)
+
+    def clear(self, db: Session, user_id: int) -> int:
+        deleted = db.query(SavedAnswer).filter(SavedAnswer.user_id == user_id).delete()
+        db.commit()
+        self.changed(user_id)
+        return deleted
+
+# Shared by the form-analysis and answer-memory endpoints
+answer_memory = AnswerMemory()
@@ -18,6 +18,7 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)  # Endpoints that also serve anonymous callers
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -77,4 +78,18 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     user = db.query(User).filter(User.id == int(user_id)).first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+async def get_optional_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+                            db: Session = Depends(get_db)) -> Optional[User]:
+    """The signed-in user when a valid token is sent, otherwise None"""
+    if credentials is None:
+        return None
+    try:
+        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = payload.get("sub")
+    except JWTError:
+        return None
+    if user_id is None:
+        return None
+    return db.query(User).filter(User.id == int(user_id)).first()
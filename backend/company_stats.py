@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case
+from datetime import datetime, timedelta
 from database import get_db
-from models import Job
-from typing import Dict, Any, List
+from models import Job, ScrapeRun
+from typing import Dict, Any, List, Optional
 
 def get_comprehensive_stats(db: Session = None) -> Dict[str, Any]:
     """Get comprehensive job statistics"""
@@ -75,4 +76,83 @@ def get_simple_job_stats_by_source(db: Session = None) -> Dict[str, int]:
         
         return {stat.platform or "unknown": stat.count for stat in stats}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
+
+def get_scrape_performance_report(db: Session = None, platform: Optional[str] = None,
+                                  days: int = 30, limit: int = 10) -> Dict[str, Any]:
+    """Per-company scrape telemetry: slowest, least productive and most failing targets"""
+    if db is None:
+        db = next(get_db())
+    
+    try:
+        since = datetime.now() - timedelta(days=days)
+        failed = case((ScrapeRun.status.like('success%'), 0), else_=1)
+        
+        query = db.query(
+            ScrapeRun.platform,
+            ScrapeRun.company,
+            func.count(ScrapeRun.id).label('runs'),
+            func.avg(ScrapeRun.wall_seconds).label('avg_wall_seconds'),
+            func.max(ScrapeRun.wall_seconds).label('max_wall_seconds'),
+            func.avg(ScrapeRun.parse_seconds).label('avg_parse_seconds'),
+            func.sum(ScrapeRun.requests).label('requests'),
+            func.sum(ScrapeRun.request_errors).label('request_errors'),
+            func.sum(ScrapeRun.bytes_received).label('bytes_received'),
+            func.sum(ScrapeRun.jobs_found).label('jobs_found'),
+            func.sum(ScrapeRun.jobs_new).label('jobs_new'),
+            func.sum(ScrapeRun.jobs_updated).label('jobs_updated'),
+            func.sum(failed).label('failures'),
+            func.max(ScrapeRun.started_at).label('last_run')
+        ).filter(ScrapeRun.started_at >= since)
+        
+        runs_query = db.query(func.count(func.distinct(ScrapeRun.run_id))).filter(ScrapeRun.started_at >= since)
+        if platform:
+            query = query.filter(ScrapeRun.platform == platform)
+            runs_query = runs_query.filter(ScrapeRun.platform == platform)
+        
+        targets = []
+        for row in query.group_by(ScrapeRun.platform, ScrapeRun.company).all():
+            requests = row.requests or 0
+            jobs_found = row.jobs_found or 0
+            targets.append({
+                "platform": row.platform,
+                "company": row.company,
+                "runs": row.runs,
+                "avg_wall_seconds": round(row.avg_wall_seconds or 0.0, 2),
+                "max_wall_seconds": round(row.max_wall_seconds or 0.0, 2),
+                "avg_parse_seconds": round(row.avg_parse_seconds or 0.0, 3),
+                "requests": requests,
+                "request_errors": row.request_errors or 0,
+                "bytes_received": row.bytes_received or 0,
+                "jobs_found": jobs_found,
+                "jobs_new": row.jobs_new or 0,
+                "jobs_updated": row.jobs_updated or 0,
+                "failures": row.failures or 0,
+                "jobs_per_request": round(jobs_found / requests, 2) if requests else 0.0,
+                "kb_per_job": round((row.bytes_received or 0) / 1024 / jobs_found, 1) if jobs_found else None,
+                "last_run": row.last_run.isoformat() if isinstance(row.last_run, datetime) else row.last_run
+            })
+        
+        least_productive = sorted(
+            targets, key=lambda t: (t["jobs_per_request"], t["jobs_new"] + t["jobs_updated"], -t["avg_wall_seconds"])
+        )
+        
+        return {
+            "days": days,
+            "platform": platform,
+            "targets": len(targets),
+            "runs": runs_query.scalar() or 0,
+            "slowest": sorted(targets, key=lambda t: t["avg_wall_seconds"], reverse=True)[:limit],
+            "least_productive": least_productive[:limit],
+            "most_failing": sorted(
+                [t for t in targets if t["failures"]], key=lambda t: (t["failures"], t["request_errors"]), reverse=True
+            )[:limit]
+        }
+    except Exception as e:
+        return {
+            "targets": 0,
+            "slowest": [],
+            "least_productive": [],
+            "most_failing": [],
+            "error": str(e)
+        }
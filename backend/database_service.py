@@ -4,10 +4,12 @@ Provides both SQLAlchemy ORM and raw SQL access to the same database
 """
 
 import sqlite3
+import threading
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from database import engine, SessionLocal, SCRAPING_DB_PATH
-from models import Base, Job, User, Profile, Application, Company
+from known_jobs import KnownJobIndex
+from models import Base, Job, User, Profile, Application, Company, JOB_CONTENT_FIELDS, job_content_hash, migrate_schema
 
 
 class UnifiedDatabaseService:
@@ -19,11 +21,13 @@ class UnifiedDatabaseService:
     def __init__(self):
         self.db_path = SCRAPING_DB_PATH
         self.setup_database()
+        self._known_jobs = None
+        self._known_jobs_lock = threading.Lock()
     
     def setup_database(self):
         """Create all tables using SQLAlchemy schema"""
-        # Create all SQLAlchemy tables
-        Base.metadata.create_all(bind=engine)
+        # Create all SQLAlchemy tables and bring older databases up to date
+        migrate_schema(engine)
         
         # The companies table from SQLAlchemy models is sufficient
         # No additional scraper-specific tables needed
@@ -36,6 +40,15 @@ class UnifiedDatabaseService:
         """Get raw SQLite connection for scraper operations"""
         return sqlite3.connect(self.db_path)
     
+    def known_jobs(self, db: Session) -> KnownJobIndex:
+        """Index of stored link keys, loaded on first use so new jobs skip the duplicate query"""
+        with self._known_jobs_lock:
+            if self._known_jobs is None:
+                rows = db.query(Job.link_key, Job.content_hash, Job.closed_at).filter(
+                    Job.link_key.isnot(None)).yield_per(5000)
+                self._known_jobs = KnownJobIndex.from_rows(rows, db.query(Job).count())
+            return self._known_jobs
+    
     def save_scraped_job(self, job_data: Dict[str, Any]) -> int:
         """
         Save job from scraper using SQLAlchemy schema
@@ -56,15 +69,27 @@ class UnifiedDatabaseService:
                 experience_level=job_data.get('experience_level'),
                 salary_range=job_data.get('salary_range')
             )
+            job.content_hash = job_content_hash({field: getattr(job, field) for field in JOB_CONTENT_FIELDS})
             
-            # Check for duplicates by link
-            existing = db.query(Job).filter(Job.link == job.link).first()
+            # Check for duplicates by canonical link key (skipped when the index knows the key is new);
+            # rewrite the stored row only if its content changed or it was closed
+            known = self.known_jobs(db)
+            is_new = known.classify(job.link_key, job.content_hash) == KnownJobIndex.NEW
+            existing = None if is_new else db.query(Job).filter(Job.link_key == job.link_key).first()
             if existing:
+                previous_hash = existing.content_hash
+                if existing.content_hash != job.content_hash or existing.closed_at is not None:
+                    for field in JOB_CONTENT_FIELDS + ('content_hash',):
+                        setattr(existing, field, getattr(job, field))
+                    existing.closed_at = None
+                    db.commit()
+                    known.add(job.link_key, job.content_hash, previous_hash=previous_hash)
                 return existing.id
             
             db.add(job)
             db.commit()
             db.refresh(job)
+            known.add(job.link_key, job.content_hash)
             return job.id
             
         except Exception as e:
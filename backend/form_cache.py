@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Form template cache
+Lever and Greenhouse serve the same application form to thousands of companies;
+only the HTML field ids change. A form's fingerprint hashes what the LLM sees
+(question texts, types and option sets, in order) and not the ids, so every
+posting built on the same template shares:
+- the template: semantic field names and the LLM-ready form
+- the validated answers, per (fingerprint, profile version - plus the answer
+  memory revision for signed-in users), stored by field position so they map
+  back onto the next posting's field ids
+Both live in bounded in-memory LRUs and are rebuilt after a restart.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+TEMPLATE_CACHE_SIZE = 512
+ANSWER_CACHE_SIZE = 2048
+
+def normalize_question(question: str) -> str:
+    return re.sub(r'\s+', ' ', (question or '').lower().replace('✱', '').replace('*', '')).strip()
+
+def form_fingerprint(clean_form: List[Dict[str, Any]]) -> str:
+    """Digest of the form's questions, types and options (field ids excluded)"""
+    structure = [
+        [
+            normalize_question(field.get('question')),
+            field.get('type'),
+            sorted(field.get('all_options') or field.get('options') or [])
+        ]
+        for field in clean_form
+    ]
+    return hashlib.blake2b(json.dumps(structure).encode('utf-8'), digest_size=16).hexdigest()
+
+def profile_version(user_data: Dict[str, Any]) -> str:
+    """Digest of the extracted profile data; editing the profile starts a new answer set"""
+    encoded = json.dumps(user_data, sort_keys=True, default=str)
+    return hashlib.blake2b(encoded.encode('utf-8'), digest_size=16).hexdigest()
+
+class FormCache:
+    """LRU caches of form templates and validated answers (thread-safe)"""
+
+    def __init__(self, max_templates: int = TEMPLATE_CACHE_SIZE, max_answers: int = ANSWER_CACHE_SIZE):
+        self.max_templates = max_templates
+        self.max_answers = max_answers
+        self.templates: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.answers: 'OrderedDict[tuple, Dict[int, Any]]' = OrderedDict()
+        self.hits = {'templates': 0, 'answers': 0}
+        self.misses = {'templates': 0, 'answers': 0}
+        self._lock = threading.Lock()
+
+    def _get(self, cache: OrderedDict, key, kind: str):
+        with self._lock:
+            value = cache.get(key)
+            if value is None:
+                self.misses[kind] += 1
+                return None
+            cache.move_to_end(key)
+            self.hits[kind] += 1
+            return value
+
+    def _put(self, cache: OrderedDict, key, value, limit: int):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > limit:
+                cache.popitem(last=False)
+
+    def get_template(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """{"semantic_names": [per field position], "llm_form": [...]} or None"""
+        return self._get(self.templates, fingerprint, 'templates')
+
+    def put_template(self, fingerprint: str, template: Dict[str, Any]):
+        self._put(self.templates, fingerprint, template, self.max_templates)
+
+    def get_answers(self, fingerprint: str, version: str) -> Optional[Dict[int, Any]]:
+        """{field position: answer} from an earlier analysis of this form for this profile, or None"""
+        return self._get(self.answers, (fingerprint, version), 'answers')
+
+    def put_answers(self, fingerprint: str, version: str, answers: Dict[int, Any]):
+        """Merge validated answers into the entry (a later analysis may cover more fields)"""
+        key = (fingerprint, version)
+        with self._lock:
+            merged = {**self.answers.get(key, {}), **answers}
+        self._put(self.answers, key, merged, self.max_answers)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'templates': len(self.templates),
+                'answer_sets': len(self.answers),
+                'hits': dict(self.hits),
+                'misses': dict(self.misses)
+            }
+
+# Shared by the form-analysis endpoints
+form_cache = FormCache()
@@ -451,6 +451,25 @@ class JobAutomationService:
             "job_url": next_job.job_url
         }
 
+    def skip_pending_jobs(self, session_id: str, job_ids: List[int], reason: str) -> List[int]:
+        """Drop jobs the session has not reached yet (e.g. dead links found after creation); returns the dropped ids"""
+        session = self.get_session(session_id)
+        if not session:
+            return []
+        
+        job_ids = set(job_ids)
+        keep = session.current_job_index + 1
+        upcoming = session.jobs[keep:]
+        dropped = [job for job in upcoming if job.job_id in job_ids and job.status == JobApplicationStatus.PENDING]
+        if not dropped:
+            return []
+        
+        session.jobs = session.jobs[:keep] + [job for job in upcoming if job not in dropped]
+        session.total_jobs = len(session.jobs)
+        for job in dropped:
+            print(f"⏭️ Skipped job {job.job_title}: {reason}")
+        return [job.job_id for job in dropped]
+
 
 # Global instance
 automation_service = JobAutomationService()
\ No newline at end of file
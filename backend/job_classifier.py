@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Job classification engine
+Shared job_type / work_type / experience_level rules for every scraper, so Lever,
+Workday, Greenhouse and Ashby jobs are labelled the same way.
+
+Each dimension's keyword rules are compiled into a single regex alternation with one
+named group per label. One finditer pass over a text yields every matching label and
+the highest-priority one wins - no per-keyword substring loops. Short field values
+(commitments, workplace types, titles) repeat heavily across a board, so their
+results are memoized in a bounded LRU.
+
+Run directly for a throughput benchmark:
+    python job_classifier.py
+"""
+
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+CACHE_SIZE = 4096
+MAX_CACHED_TEXT = 200  # Descriptions are too long and too unique to be worth caching
+
+# Rules per dimension, highest priority first: (label, regex fragments)
+JOB_TYPE_RULES = [
+    ('Internship', [r'interns?', r'internships?', r'co-?op', r'est[aá]gi[oa]', r'estagi[aá]rio',
+                    r'praktikum', r'werkstudent', r'working student', r'apprentice(?:ship)?', r'trainee(?:ship)?']),
+    ('Part-time', [r'part[- ]?time', r'half[- ]time', r'teilzeit']),
+    ('Contract', [r'contract', r'contractor', r'freelancer?', r'temporary', r'temp', r'fixed[- ]term',
+                  r'seasonal']),
+    ('Full-time', [r'full[- ]?time', r'permanent', r'regular', r'employee', r'vollzeit', r'clt']),
+]
+
+# Short fields only (workplace type, location, title)
+WORK_TYPE_RULES = [
+    ('Remote', [r'remote(?:ly)?', r'fully remote', r'work from home', r'wfh', r'anywhere',
+                r'telecommute', r'home[- ]based']),
+    ('Hybrid', [r'hybrid', r'h[ií]brido', r'flexible location']),
+    ('On-site', [r'on-?site', r'in[- ]office', r'in[- ]person', r'office[- ]based']),
+]
+
+# Descriptions mention "remote teams" or "distributed systems" in passing; only explicit phrases count
+DESCRIPTION_WORK_TYPE_RULES = [
+    ('Remote', [r'fully remote', r'100% remote', r'remote[- ]first', r'work(?:ing)? from anywhere',
+                r'work(?:ing)? from home', r'remote (?:position|role|job|opportunity)']),
+    ('Hybrid', [r'hybrid (?:role|position|job|setup|model|schedule|working|work)']),
+    ('On-site', [r'(?:fully|100%) on-?site', r'on-?site (?:role|position|job)']),
+]
+
+EXPERIENCE_LEVEL_RULES = [
+    ('Senior', [r'senior', r'sr\.?', r'snr']),
+    ('Lead', [r'lead(?:er)?', r'principal', r'staff', r'head of', r'director', r'vp', r'svp',
+              r'vice president', r'chief']),
+    ('Entry Level', [r'junior', r'jr\.?', r'entry[- ]level', r'entry', r'graduate', r'new grad',
+                     r'associate', r'interns?', r'internship', r'trainee', r'apprentice']),
+]
+
+DEFAULTS = {
+    'job_type': 'Full-time',
+    'work_type': 'On-site',
+    'experience_level': 'Mid'
+}
+
+class CompiledRules:
+    """One dimension's rules as a single alternation; lower label index = higher priority"""
+
+    def __init__(self, rules: Sequence[Tuple[str, List[str]]]):
+        self.labels = [label for label, _ in rules]
+        branches = [
+            f"(?P<g{index}>{'|'.join(fragments)})" for index, (_, fragments) in enumerate(rules)
+        ]
+        # Lookarounds instead of \b so "sr." and "co-op" still match at word edges
+        self.pattern = re.compile(r'(?<![a-z0-9])(?:' + '|'.join(branches) + r')(?![a-z0-9])')
+
+    def match(self, text: str) -> Optional[str]:
+        """Highest-priority label found anywhere in the text, or None"""
+        best = len(self.labels)
+        for found in self.pattern.finditer(text.lower()):
+            index = int(found.lastgroup[1:])
+            if index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.labels[best] if best < len(self.labels) else None
+
+COMPILED = {
+    'job_type': CompiledRules(JOB_TYPE_RULES),
+    'work_type': CompiledRules(WORK_TYPE_RULES),
+    'work_type_description': CompiledRules(DESCRIPTION_WORK_TYPE_RULES),
+    'experience_level': CompiledRules(EXPERIENCE_LEVEL_RULES),
+}
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _match_cached(dimension: str, text: str) -> Optional[str]:
+    return COMPILED[dimension].match(text)
+
+def match_label(dimension: str, text: str) -> Optional[str]:
+    if not text:
+        return None
+    if len(text) <= MAX_CACHED_TEXT:
+        return _match_cached(dimension, text)
+    return COMPILED[dimension].match(text)
+
+class JobClassifier:
+    """Classify jobs into standard job_type, work_type and experience_level values"""
+
+    def classify_field(self, dimension: str, texts: Iterable[str]) -> str:
+        """First text (in priority order, e.g. structured field before title) with a match decides"""
+        for text in texts:
+            label = match_label(dimension, text)
+            if label:
+                return label
+        return DEFAULTS[dimension]
+
+    def job_type(self, *texts: str) -> str:
+        """Full-time, Part-time, Contract or Internship"""
+        return self.classify_field('job_type', texts)
+
+    def work_type(self, *texts: str, description: str = '') -> str:
+        """Remote, Hybrid or On-site from short fields, then explicit phrases in the description"""
+        for text in texts:
+            label = match_label('work_type', text)
+            if label:
+                return label
+        return match_label('work_type_description', description) or DEFAULTS['work_type']
+
+    def experience_level(self, title: str, job_type: str = None) -> str:
+        """Entry Level, Mid, Senior or Lead; internships are always Entry Level"""
+        if job_type == 'Internship':
+            return 'Entry Level'
+        return self.classify_field('experience_level', (title,))
+
+    def classify(self, job: Dict[str, str]) -> Dict[str, str]:
+        """Classify one job described by title plus optional job_type / work_type / text hints"""
+        title = job.get('title') or ''
+        job_type = self.job_type(job.get('job_type') or '', title)
+        return {
+            'job_type': job_type,
+            'work_type': self.work_type(job.get('work_type') or '', title, description=job.get('text') or ''),
+            'experience_level': self.experience_level(title, job_type)
+        }
+
+    def classify_batch(self, jobs: Sequence[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Classify a whole board at once; identical (title, hints) rows are classified once"""
+        seen = {}
+        results = []
+        for job in jobs:
+            key = (job.get('title'), job.get('job_type'), job.get('work_type'), job.get('text'))
+            if key not in seen:
+                seen[key] = self.classify(job)
+            results.append(seen[key])
+        return results
+
+    @staticmethod
+    def cache_info():
+        return _match_cached.cache_info()
+
+def _legacy_classify(job: Dict[str, str]) -> Dict[str, str]:
+    """Baseline for the benchmark: the per-keyword substring chains the scrapers used to run"""
+    commitment = (job.get('job_type') or '').lower()
+    title = (job.get('title') or '').lower()
+    text = (job.get('text') or '').lower()
+    if any(word in commitment for word in ['intern ', 'internship', ' intern', 'co-op', 'coop']):
+        job_type = 'Internship'
+    elif 'part' in commitment and 'time' in commitment:
+        job_type = 'Part-time'
+    elif any(word in commitment for word in ['contract', 'contractor', 'consultant', 'freelance', 'temporary', 'fixed']):
+        job_type = 'Contract'
+    else:
+        job_type = 'Full-time'
+    hint = (job.get('work_type') or '').lower()
+    if 'remote' in hint or 'remote' in title or 'remote' in text:
+        work_type = 'Remote'
+    elif 'hybrid' in hint or 'hybrid' in title or 'hybrid' in text:
+        work_type = 'Hybrid'
+    else:
+        work_type = 'On-site'
+    if any(term in title for term in ['senior', 'sr.', 'sr ']):
+        level = 'Senior'
+    elif any(term in title for term in ['lead', 'principal', 'staff', 'head of', 'director', 'vp', 'vice president']):
+        level = 'Lead'
+    elif any(term in title for term in ['junior', 'jr.', 'jr ', 'entry', 'graduate', 'new grad']):
+        level = 'Entry Level'
+    else:
+        level = 'Mid'
+    return {'job_type': job_type, 'work_type': work_type, 'experience_level': level}
+
+BENCHMARK_JOBS = [
+    {'title': 'Senior Software Engineer, Payments', 'job_type': 'Full-time', 'work_type': 'hybrid'},
+    {'title': 'Software Engineering Intern (Summer 2025)', 'job_type': 'Intern'},
+    {'title': 'Staff Data Scientist', 'job_type': 'Full Time', 'work_type': 'remote'},
+    {'title': 'Account Executive - Remote', 'job_type': 'Permanent'},
+    {'title': 'Director of Product Marketing', 'job_type': 'Full-time', 'work_type': 'onsite'},
+    {'title': 'Junior Accountant', 'job_type': 'Part time'},
+    {'title': 'Internal Communications Manager', 'job_type': 'Full-time'},
+    {'title': 'Contract Technical Writer', 'job_type': 'Contractor'},
+    {'title': 'Associate Product Manager, New Grad', 'job_type': ''},
+    {'title': 'Estágio em Engenharia de Dados', 'job_type': 'Estágio', 'work_type': 'Híbrido'},
+    {'title': 'Customer Success Manager', 'job_type': 'Full-time',
+     'text': 'You will work from our Berlin office three days a week in a hybrid setup. ' * 20},
+    {'title': 'Principal Engineer, Infrastructure', 'job_type': 'Regular', 'work_type': 'Remote - US'},
+]
+
+def run_benchmark(rounds: int = 5000):
+    """Throughput benchmark: legacy substring chains vs compiled rules (single and batch)"""
+    classifier = JobClassifier()
+    jobs = BENCHMARK_JOBS * rounds
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<30} {len(jobs) / elapsed:12,.0f} jobs/s  ({elapsed:.3f}s for {len(jobs):,} jobs)")
+
+    print(f"🏷️  Job classifier benchmark ({len(BENCHMARK_JOBS)} samples x {rounds} rounds)")
+    timed('legacy substring chains', lambda: [_legacy_classify(job) for job in jobs])
+    _match_cached.cache_clear()
+    timed('compiled rules (per job)', lambda: [classifier.classify(job) for job in jobs])
+    timed('compiled rules (batch)', lambda: classifier.classify_batch(jobs))
+    print(f"  cache: {classifier.cache_info()}")
+    print()
+    for job, result in zip(BENCHMARK_JOBS, classifier.classify_batch(BENCHMARK_JOBS)):
+        print(f"  {job['title'][:40]:<40} → {result['job_type']:<10} {result['work_type']:<8} {result['experience_level']}")
+
+if __name__ == "__main__":
+    run_benchmark()
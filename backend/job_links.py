@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Canonical job link keys
+The same posting shows up under many URLs: with tracking parameters, with
+/apply appended by the Chrome extension, on different ATS hostnames or locale
+prefixes. canonical_job_key() reduces them to one key that is stored in
+jobs.link_key (unique index) at ingest, so every lookup is a single index hit.
+
+    https://jobs.lever.co/acme/5f1c.../apply?lever-source=LinkedIn
+    -> jobs.lever.co/acme/5f1c...
+
+Only Greenhouse, Lever and Workday links, whose URL layout is known, are cut
+down to the posting id. Any other link keeps its full query (sorted, minus
+tracking parameters) and fragment: company boards identify the job with
+anything from ?gh_jid= to ?cid=...&jobId= or #job-slug, and a key that drops
+one of them would merge different jobs into one row.
+"""
+
+import re
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs, parse_qsl, urlencode
+
+# Bump when canonical_job_key() changes so stored keys are recomputed once (models.backfill_link_keys)
+LINK_KEY_VERSION = 2
+
+# Query parameters that track the visit rather than identify the job
+TRACKING_PARAM_PATTERN = re.compile(
+    r'^(?:utm_.*|gh_src|lever-source|lever-origin|source|src|ref|referrer|refid|trk|gclid|fbclid|msclkid|mc_cid|mc_eid|_ga)$',
+    re.IGNORECASE
+)
+
+# Trailing path segments added by apply flows
+APPLY_SUFFIX_PATTERN = re.compile(
+    r'(?:/(?:apply|application|apply-now|applynow|applymanually|autofillwithresume|useMyLastApplication|thanks|confirmation))+$',
+    re.IGNORECASE
+)
+LOCALE_SEGMENT_PATTERN = re.compile(r'^/[a-z]{2}(?:-[A-Za-z]{2})?(?=/)')
+
+GREENHOUSE_HOST_PATTERN = re.compile(r'^(?:job-)?boards(?:\.[a-z]{2})?\.greenhouse\.io$')
+GREENHOUSE_JOB_PATTERN = re.compile(r'^/([^/]+)/jobs/(\d+)')
+LEVER_HOST_PATTERN = re.compile(r'^jobs(?:\.[a-z]{2})?\.lever\.co$')
+WORKDAY_HOST_PATTERN = re.compile(r'\.myworkdayjobs\.com$|\.myworkdaysite\.com$')
+
+def canonical_job_key(url: Optional[str]) -> Optional[str]:
+    """Key identifying a posting: the link without scheme, www, tracking parameters or apply suffix"""
+    if not url:
+        return None
+
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        parts = urlsplit(f"https://{url.strip()}")
+    host = parts.netloc.lower().split('@')[-1]
+    host = re.sub(r':(80|443)$', '', host)
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return url.strip()  # Not an absolute link; nothing to normalize
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    query = {key.lower(): values for key, values in parse_qs(parts.query).items()}
+
+    # Greenhouse: several board hostnames and the embed form all map to greenhouse.io/{board}/jobs/{id}
+    if GREENHOUSE_HOST_PATTERN.match(host):
+        if path.rstrip('/').endswith('/embed/job_app') and 'for' in query and 'token' in query:
+            return f"greenhouse.io/{query['for'][0].lower()}/jobs/{query['token'][0]}"
+        match = GREENHOUSE_JOB_PATTERN.match(path)
+        if match:
+            return f"greenhouse.io/{match.group(1).lower()}/jobs/{match.group(2)}"
+
+    # Lever: jobs.lever.co/{company}/{posting id}, whatever follows is the apply flow
+    if LEVER_HOST_PATTERN.match(host):
+        segments = [segment for segment in path.split('/') if segment]
+        if len(segments) >= 2:
+            return f"{host}/{segments[0].lower()}/{segments[1].lower()}"
+
+    # Workday: drop the locale prefix (/en-US/) and everything after the job slug
+    if WORKDAY_HOST_PATTERN.search(host):
+        path = LOCALE_SEGMENT_PATTERN.sub('', path)
+        match = re.match(r'^(.*?/(?:job|details)/(?:[^/]+/)*?[^/]*_[A-Za-z0-9-]+)(?:/|$)', path)
+        if match:
+            return f"{host}{match.group(1)}"
+
+    # Anything else: the whole link minus tracking parameters, in a stable order
+    path = APPLY_SUFFIX_PATTERN.sub('', path.rstrip('/')) or ''
+    params = sorted((name.lower(), value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                    if not TRACKING_PARAM_PATTERN.match(name))
+    key = f"{host}{path}"
+    if params:
+        key += f"?{urlencode(params)}"
+    if parts.fragment:
+        key += f"#{parts.fragment}"
+    return key
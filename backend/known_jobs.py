@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+In-memory index of jobs already stored
+Loaded once per writer so saving a scraped job rarely needs a database lookup:
+- a Bloom filter of canonical link keys answers "definitely new" with no false negatives
+- an exact set of 64-bit (link, content hash) fingerprints answers "stored,
+  open and unchanged"
+Only keys the filter has seen but whose fingerprint differs (edited postings,
+closed jobs, Bloom false positives) still go to the database.
+"""
+
+import hashlib
+import math
+from typing import Iterable, Optional, Tuple
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one blake2b digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(capacity, 1)
+        self.num_bits = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 64)
+        self.num_hashes = max(int(round(self.num_bits / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+def version_fingerprint(link: str, content_hash: Optional[str]) -> int:
+    """64-bit fingerprint of one stored version of a job"""
+    digest = hashlib.blake2b(f"{link}\x1f{content_hash or ''}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+class KnownJobIndex:
+    """Known links plus the current content of every open job"""
+
+    NEW = 'new'
+    UNCHANGED = 'unchanged'
+    CHECK = 'check'
+
+    def __init__(self, expected_jobs: int = 0, headroom: int = 50000):
+        # Sized for the stored jobs plus this run's growth; error rate rises gently beyond that
+        self.links = BloomFilter(expected_jobs * 2 + headroom)
+        self.versions = set()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, Optional[str], Optional[object]]], expected_jobs: int = 0):
+        """Build from (link, content_hash, closed_at) rows"""
+        index = cls(expected_jobs)
+        for link, content_hash, closed_at in rows:
+            index.links.add(link)
+            if closed_at is None:
+                index.versions.add(version_fingerprint(link, content_hash))
+        return index
+
+    def classify(self, link: str, content_hash: str) -> str:
+        """NEW (not stored), UNCHANGED (stored, open, same content) or CHECK (ask the database)"""
+        if link not in self.links:
+            return self.NEW
+        if version_fingerprint(link, content_hash) in self.versions:
+            return self.UNCHANGED
+        return self.CHECK
+
+    def add(self, link: str, content_hash: str, previous_hash: Optional[str] = None):
+        """Record an inserted or rewritten job"""
+        self.links.add(link)
+        if previous_hash is not None:
+            self.versions.discard(version_fingerprint(link, previous_hash))
+        self.versions.add(version_fingerprint(link, content_hash))
+
+    def close(self, link: str, content_hash: Optional[str]):
+        """A closed job must be rewritten (reopened) if it shows up again"""
+        self.versions.discard(version_fingerprint(link, content_hash))
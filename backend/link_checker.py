@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Job link liveness checker
+Postings removed between crawls stay in the jobs table until their company is
+re-scraped. This checker probes Job.link with rate-limited, concurrent HEAD
+requests (GET when HEAD is refused) and marks dead links so search and
+automation sessions skip them.
+
+Jobs a user has applied to are checked first, then the oldest postings;
+links are rechecked once RECHECK_AFTER has passed. When an automation session
+is created only its first INLINE_VERIFY_LIMIT stale links are checked in the
+request; the rest are checked in the background and dropped from the session
+before it reaches them.
+
+Run one pass from the command line:
+    python link_checker.py [--limit 500]
+"""
+
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_
+
+from database import SessionLocal, engine
+from models import Job, Application, migrate_schema
+
+# Reuse the scrapers' pooled HTTP client and per-host rate limiter
+sys.path.append(str(Path(__file__).parent / "scrapers"))
+from shared_utils import HttpClient, RateLimiter, ScrapeMetrics
+
+RECHECK_AFTER = timedelta(days=1)
+DEAD_STATUS_CODES = (404, 410)
+HEAD_REFUSED_CODES = (400, 403, 405, 501)  # Servers that don't answer HEAD properly
+INLINE_VERIFY_LIMIT = 3  # Stale links checked while an automation session is created; the rest in the background
+DEAD_URL_MARKERS = ('error=true',)  # Greenhouse redirects removed postings to the board with ?error=true
+
+class LinkChecker:
+    """Check job links concurrently and record alive/dead in the jobs table"""
+
+    def __init__(self, max_workers: int = 8, per_host_delay: float = 1.0, timeout: float = 10,
+                 recheck_after: timedelta = RECHECK_AFTER, session_factory=SessionLocal):
+        self.max_workers = max_workers
+        self.recheck_after = recheck_after
+        self.session_factory = session_factory
+        self.metrics = ScrapeMetrics('link_checker')
+        self.http_client = HttpClient(RateLimiter(per_host_delay), self.metrics,
+                                      pool_size=max_workers * 2, timeout=timeout, max_retries=1)
+        self._thread = None
+        self._stop = threading.Event()
+
+    def check_url(self, url: str) -> Optional[bool]:
+        """True if the link is alive, False if dead, None if it could not be decided"""
+        response = self.http_client.request('HEAD', url, allow_redirects=True)
+        if response is not None and response.status_code in HEAD_REFUSED_CODES:
+            response = self.http_client.request('GET', url, allow_redirects=True, stream=True)
+            if response is not None:
+                response.close()
+
+        if response is None:
+            return None
+        if response.status_code in DEAD_STATUS_CODES:
+            return False
+        if response.status_code == 200:
+            return not any(marker in response.url for marker in DEAD_URL_MARKERS)
+        return None  # Rate limited, server errors, bot walls: try again next pass
+
+    def check_links(self, jobs: List[Tuple[int, str]]) -> Dict[int, Optional[bool]]:
+        """Check (job_id, link) pairs concurrently; returns job_id -> alive/dead/unknown"""
+        if not jobs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(jobs))) as executor:
+            results = executor.map(lambda job: self.check_url(job[1]), jobs)
+            return {job_id: alive for (job_id, _), alive in zip(jobs, results)}
+
+    def record_results(self, db, results: Dict[int, Optional[bool]]):
+        """Store results; dead links also close the job so every open-jobs query drops it"""
+        now = datetime.now()
+        by_outcome = {True: [], False: [], None: []}
+        for job_id, alive in results.items():
+            by_outcome[alive].append(job_id)
+
+        if by_outcome[True]:
+            db.query(Job).filter(Job.id.in_(by_outcome[True])).update(
+                {Job.link_status: 'alive', Job.link_checked_at: now}, synchronize_session=False)
+        if by_outcome[False]:
+            db.query(Job).filter(Job.id.in_(by_outcome[False])).update(
+                {Job.link_status: 'dead', Job.link_checked_at: now, Job.closed_at: now}, synchronize_session=False)
+        if by_outcome[None]:
+            db.query(Job).filter(Job.id.in_(by_outcome[None])).update(
+                {Job.link_checked_at: now}, synchronize_session=False)
+        db.commit()
+
+    def due_jobs(self, db, limit: int) -> List[Tuple[int, str]]:
+        """Open jobs not checked recently: applied-to jobs first, then oldest postings"""
+        cutoff = datetime.now() - self.recheck_after
+        applied = db.query(Application.job_id).distinct().subquery()
+        rows = db.query(Job.id, Job.link).outerjoin(
+            applied, applied.c.job_id == Job.id
+        ).filter(
+            Job.closed_at.is_(None),
+            or_(Job.link_checked_at.is_(None), Job.link_checked_at < cutoff)
+        ).order_by(
+            applied.c.job_id.is_(None), Job.fetched_at.asc()
+        ).limit(limit).all()
+        return [(job_id, link) for job_id, link in rows]
+
+    def run_once(self, limit: int = 200) -> Dict[str, int]:
+        """Check one batch of due links and record the results"""
+        db = self.session_factory()
+        try:
+            jobs = self.due_jobs(db, limit)
+            results = self.check_links(jobs)
+            self.record_results(db, results)
+        finally:
+            db.close()
+
+        outcomes = list(results.values())
+        summary = {
+            'checked': len(outcomes),
+            'alive': outcomes.count(True),
+            'dead': outcomes.count(False),
+            'unknown': outcomes.count(None)
+        }
+        if outcomes:
+            print(f"🔗 Link check: {summary['checked']} checked, {summary['alive']} alive, "
+                  f"{summary['dead']} dead, {summary['unknown']} unknown")
+        return summary
+
+    def verify_jobs(self, db, job_ids: List[int], inline_limit: int = INLINE_VERIFY_LIMIT) -> Tuple[List[int], List[int]]:
+        """
+        Used before starting an automation session. Returns (dead, deferred): the ids that are
+        closed or dead on a fresh check, and the stale ids left for verify_in_background().
+        Only the first inline_limit stale links (in job_ids order, the order the session opens
+        them) are checked now; the per-host delay would otherwise add a second per job.
+        """
+        cutoff = datetime.now() - self.recheck_after
+        jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_(job_ids)).all()}
+        stale = [(job_id, jobs[job_id].link) for job_id in dict.fromkeys(job_ids)
+                 if job_id in jobs and jobs[job_id].closed_at is None
+                 and (jobs[job_id].link_checked_at is None or jobs[job_id].link_checked_at < cutoff)]
+        results = self.check_links(stale[:inline_limit])
+        self.record_results(db, results)
+
+        closed = {job.id for job in jobs.values() if job.closed_at is not None}
+        dead = sorted(closed | {job_id for job_id, alive in results.items() if alive is False})
+        return dead, [job_id for job_id, _ in stale[inline_limit:]]
+
+    def verify_in_background(self, job_ids: List[int], on_dead: Callable[[List[int]], None]):
+        """Check the given jobs' links in a daemon thread and pass the dead ids to on_dead"""
+        def run():
+            db = self.session_factory()
+            try:
+                jobs = db.query(Job.id, Job.link).filter(Job.id.in_(job_ids)).all()
+                results = self.check_links([(job_id, link) for job_id, link in jobs])
+                self.record_results(db, results)
+            except Exception as e:
+                print(f"❌ Background link check failed: {e}")
+                return
+            finally:
+                db.close()
+            dead = sorted(job_id for job_id, alive in results.items() if alive is False)
+            if dead:
+                on_dead(dead)
+
+        threading.Thread(target=run, name='link-verify', daemon=True).start()
+
+    def start(self, interval_seconds: float = 3600, batch_size: int = 200):
+        """Run check passes in a daemon thread until stop(); a full batch is followed immediately by another"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    summary = self.run_once(batch_size)
+                except Exception as e:
+                    print(f"❌ Link check pass failed: {e}")
+                    summary = {'checked': 0}
+                if summary['checked'] < batch_size:
+                    self._stop.wait(interval_seconds)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=loop, name='link-checker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check job links and mark dead postings")
+    parser.add_argument('--limit', type=int, default=500, help="Links to check in this pass (default 500)")
+    args = parser.parse_args()
+
+    migrate_schema(engine)
+    checker = LinkChecker()
+    checker.run_once(args.limit)
+    checker.http_client.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Async Ollama client
+Every LLM call (form analysis, resume parsing) goes through one pooled aiohttp
+session, so a 60-second generation awaits on the event loop instead of blocking
+the worker thread that also serves job search and everything else.
+
+Ollama only runs a few generations at a time, so calls are admitted by an
+LLMScheduler: at most OLLAMA_MAX_CONCURRENT run at once, the rest queue by
+priority (interactive form filling before background resume parsing and
+pre-generation), identical requests already in flight share one generation,
+and queue depth and wait times are kept for GET /ai/llm/stats.
+
+Calls that need JSON back (complete_json) pass Ollama a JSON schema as the
+output format, so generation is constrained to a valid object and parses on the
+first try. The old fence-stripping and brace-scanning survive only as one light
+repair step for free-form output, followed by a retry; how often each happens
+is counted per task and output mode, so schema and free-form runs compare.
+
+Configuration (environment):
+    OLLAMA_URL              default http://localhost:11434
+    OLLAMA_MODEL            default llama3.2
+    OLLAMA_TIMEOUT          seconds for one generation, default 120
+    OLLAMA_CONNECT_TIMEOUT  seconds to connect, default 5
+    OLLAMA_MAX_CONNECTIONS  pooled connections, default 4
+    OLLAMA_MAX_CONCURRENT   generations sent to Ollama at once, default 2
+    OLLAMA_STRUCTURED_OUTPUT  send JSON schemas as the output format (1/0), default 1;
+                              needs Ollama 0.5+
+    OLLAMA_JSON_RETRIES     extra generations when a JSON answer does not parse, default 1
+    OLLAMA_KEEP_ALIVE       how long Ollama keeps the model loaded after each call, default 30m
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import re
+import time
+from collections import deque, defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Awaitable, Callable, AsyncIterator, Tuple, Union
+
+import aiohttp
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip('/')
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "4"))
+OLLAMA_MAX_CONCURRENT = int(os.getenv("OLLAMA_MAX_CONCURRENT", "2"))
+OLLAMA_STRUCTURED_OUTPUT = os.getenv("OLLAMA_STRUCTURED_OUTPUT", "1").lower() not in ("0", "false", "no")
+OLLAMA_JSON_RETRIES = int(os.getenv("OLLAMA_JSON_RETRIES", "1"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Scheduling priorities, lowest runs first
+PRIORITY_INTERACTIVE = 0  # Form filling - a user is waiting on the page
+PRIORITY_BACKGROUND = 1  # Resume parsing
+PRIORITY_PREGENERATION = 2  # Speculative work nobody is waiting for yet
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_BACKGROUND: 'background',
+    PRIORITY_PREGENERATION: 'pregeneration'
+}
+
+class LLMError(Exception):
+    """The LLM call failed (bad status, invalid response)"""
+
+class LLMTimeoutError(LLMError):
+    """The LLM did not answer within the timeout"""
+
+class LLMUnavailableError(LLMError):
+    """The Ollama server could not be reached"""
+
+def timing_summary(samples) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0, 'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    return {
+        'count': len(ordered),
+        'avg': round(sum(ordered) / len(ordered), 3),
+        'p50': round(ordered[len(ordered) // 2], 3),
+        'p95': round(ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)], 3),
+        'max': round(ordered[-1], 3)
+    }
+
+class LLMScheduler:
+    """Bounded-concurrency priority queue in front of Ollama, with in-flight deduplication and queue metrics"""
+
+    def __init__(self, max_concurrent: int = OLLAMA_MAX_CONCURRENT, history: int = 500):
+        self.max_concurrent = max(max_concurrent, 1)
+        self.history = history
+        self.counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'cancelled': 0, 'deduplicated': 0}
+        self.max_queue_depth = 0
+        self.waits = {name: deque(maxlen=history) for name in PRIORITY_NAMES.values()}
+        self.runs = {name: deque(maxlen=history) for name in PRIORITY_NAMES.values()}
+        self._reset()
+
+    def _reset(self):
+        self.active = 0
+        self._waiting = []  # Heap of (priority, sequence, ticket future)
+        self._sequence = itertools.count()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._joiners: Dict[asyncio.Task, int] = {}
+        self._loop = None
+
+    def _bind_loop(self):
+        """Queue state belongs to one event loop (the app's); start fresh if a new loop uses the scheduler"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset()
+            self._loop = loop
+
+    def queued(self) -> Dict[str, int]:
+        """Waiting requests per priority"""
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, ticket in self._waiting:
+            if not ticket.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+        return depth
+
+    async def _acquire(self, priority: int):
+        self._bind_loop()
+        if self.active < self.max_concurrent and not any(not ticket.done() for _, _, ticket in self._waiting):
+            self.active += 1
+            return
+        ticket = self._loop.create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), ticket))
+        self.max_queue_depth = max(self.max_queue_depth, sum(self.queued().values()))
+        try:
+            await ticket
+        except asyncio.CancelledError:
+            if ticket.done() and not ticket.cancelled():
+                self._release()  # The slot was handed over just as we were cancelled; pass it on
+            raise
+
+    def _release(self):
+        """Hand the slot to the most urgent waiter, or free it"""
+        while self._waiting:
+            _, _, ticket = heapq.heappop(self._waiting)
+            if not ticket.done():
+                ticket.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE):
+        """Hold one of the max_concurrent Ollama slots (queued by priority until one is free)"""
+        name = PRIORITY_NAMES.get(priority, str(priority))
+        self.counters['submitted'] += 1
+        start = time.perf_counter()
+        try:
+            await self._acquire(priority)
+        except asyncio.CancelledError:
+            self.counters['cancelled'] += 1
+            raise
+        waited = time.perf_counter() - start
+        self.waits.setdefault(name, deque(maxlen=self.history)).append(waited)
+        if waited >= 1:
+            print(f"⏳ LLM {name} request waited {waited:.1f}s for a free slot "
+                  f"({sum(self.queued().values())} still queued)")
+
+        start = time.perf_counter()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.counters['cancelled'] += 1
+            raise
+        except GeneratorExit:
+            self.counters['completed'] += 1  # A stream its reader stopped early (e.g. after the closing brace)
+            raise
+        except BaseException:
+            self.counters['failed'] += 1
+            raise
+        else:
+            self.counters['completed'] += 1
+        finally:
+            self.runs.setdefault(name, deque(maxlen=self.history)).append(time.perf_counter() - start)
+            self._release()
+
+    async def run(self, call: Callable[[], Awaitable], priority: int = PRIORITY_INTERACTIVE, key: str = None):
+        """
+        Run call() in a slot; callers passing the same key while it is in flight share its result
+        (the first caller's priority applies, and the call is cancelled only when every caller is gone)
+        """
+        self._bind_loop()
+        if key is None:
+            async with self.slot(priority):
+                return await call()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._run_shared(call, priority))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        else:
+            self.counters['deduplicated'] += 1
+            print("🔁 LLM request already in flight, sharing its result")
+
+        self._joiners[task] = self._joiners.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._joiners[task] -= 1
+            if not self._joiners[task]:
+                del self._joiners[task]
+                if not task.done():
+                    task.cancel()  # Nobody is waiting any more; stop the generation
+
+    async def _run_shared(self, call: Callable[[], Awaitable], priority: int):
+        async with self.slot(priority):
+            return await call()
+
+    def stats(self) -> Dict[str, Any]:
+        queued = self.queued()
+        return {
+            'max_concurrent': self.max_concurrent,
+            'active': self.active,
+            'queue_depth': sum(queued.values()),
+            'queued': queued,
+            'max_queue_depth': self.max_queue_depth,
+            'in_flight_shared': len(self._inflight),
+            **self.counters,
+            'wait_seconds': {name: timing_summary(samples) for name, samples in self.waits.items()},
+            'run_seconds': {name: timing_summary(samples) for name, samples in self.runs.items()}
+        }
+
+def parse_json_object(text: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    (object, repaired) from an LLM response: a strict parse first, then the text between the
+    outermost braces with raw control characters and trailing commas tolerated.
+    Raises ValueError if neither yields a JSON object.
+    """
+    try:
+        value = json.loads(text)
+        repaired = False
+    except ValueError:
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end < start:
+            raise ValueError("No JSON object in the response")
+        candidate = re.sub(r',(\s*[}\]])', r'\1', text[start:end + 1])
+        value = json.JSONDecoder(strict=False).decode(candidate)
+        repaired = True
+    if not isinstance(value, dict):
+        raise ValueError(f"Expected a JSON object, got {type(value).__name__}")
+    return value, repaired
+
+class JsonOutputStats:
+    """How JSON answers parsed, per task and output mode: first try, after repair, after a retry, or not at all"""
+
+    OUTCOMES = ('parsed', 'repaired', 'retried', 'failed')
+
+    def __init__(self):
+        self.counts = defaultdict(lambda: dict.fromkeys(self.OUTCOMES, 0))
+        self.generations = defaultdict(int)
+
+    def record(self, task: str, mode: str, outcome: str, generations: int = 1):
+        self.counts[(task, mode)][outcome] += 1
+        self.generations[(task, mode)] += generations
+
+    def stats(self) -> Dict[str, Any]:
+        summary = {}
+        for (task, mode), counts in sorted(self.counts.items()):
+            total = sum(counts.values())
+            generations = self.generations[(task, mode)]
+            summary[f"{task}/{mode}"] = {
+                **counts,
+                'answers': total,
+                'generations': generations,
+                'repair_rate': round(counts['repaired'] / total, 3),
+                'retry_rate': round(counts['retried'] / total, 3),
+                'failure_rate': round(counts['failed'] / total, 3),
+                'wasted_generations': generations - counts['parsed'] - counts['repaired'] - counts['retried']
+            }
+        return summary
+
+class OllamaClient:
+    """Pooled, non-blocking client for the Ollama HTTP API"""
+
+    def __init__(self, base_url: str = OLLAMA_URL, model: str = OLLAMA_MODEL, timeout: float = OLLAMA_TIMEOUT,
+                 connect_timeout: float = OLLAMA_CONNECT_TIMEOUT, max_connections: int = OLLAMA_MAX_CONNECTIONS,
+                 scheduler: LLMScheduler = None, structured_output: bool = OLLAMA_STRUCTURED_OUTPUT,
+                 json_retries: int = OLLAMA_JSON_RETRIES, keep_alive: str = OLLAMA_KEEP_ALIVE):
+        self.base_url = base_url
+        self.model = model
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.scheduler = scheduler or LLMScheduler()
+        self.structured_output = structured_output
+        self.json_retries = json_retries
+        self.keep_alive = keep_alive  # Sent with every call: a call without it resets Ollama's unload timer to 5 minutes
+        self.json_outputs = JsonOutputStats()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The shared session, created on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(base_url=self.base_url, connector=connector)
+            self._loop = loop
+        return self._session
+
+    def _timeout(self, total: float = None) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=total or self.timeout, connect=self.connect_timeout)
+
+    async def _request(self, method: str, path: str, timeout: float = None, **kwargs) -> Dict[str, Any]:
+        """Send one request and return its JSON body, mapping failures to LLM errors"""
+        session = self._get_session()
+        try:
+            async with session.request(method, path, timeout=self._timeout(timeout), **kwargs) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    raise LLMError(f"Ollama API error {response.status}: {body[:200]}")
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"Ollama did not answer within {timeout or self.timeout:.0f} seconds")
+        except aiohttp.ClientConnectionError as e:
+            raise LLMUnavailableError(f"Ollama is not reachable at {self.base_url}: {e}")
+        except aiohttp.ContentTypeError as e:
+            raise LLMError(f"Invalid Ollama response: {e}")
+
+    async def is_running(self) -> bool:
+        """Whether the Ollama server answers (short timeout)"""
+        try:
+            await self._request('GET', '/api/tags', timeout=self.connect_timeout)
+            return True
+        except LLMError:
+            return False
+
+    async def loaded_models(self) -> Optional[List[str]]:
+        """Names of the models Ollama has in memory (/api/ps), or None if it cannot tell"""
+        try:
+            data = await self._request('GET', '/api/ps', timeout=self.connect_timeout)
+        except LLMError:
+            return None
+        return [model.get('name') or model.get('model', '') for model in data.get('models', [])]
+
+    @staticmethod
+    def _request_key(path: str, payload: Dict[str, Any]) -> str:
+        """Identity of a request for deduplication"""
+        encoded = json.dumps([path, payload], sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    async def _scheduled(self, path: str, payload: Dict[str, Any], timeout: float, priority: int) -> Dict[str, Any]:
+        async def call():
+            start = time.perf_counter()
+            data = await self._request('POST', path, timeout=timeout, json=payload)
+            print(f"🤖 Ollama {path.rsplit('/', 1)[-1]} ({payload['model']}) took {time.perf_counter() - start:.2f}s")
+            return data
+        return await self.scheduler.run(call, priority, key=self._request_key(path, payload))
+
+    async def generate(self, prompt: str, model: str = None, timeout: float = None,
+                       options: Dict[str, Any] = None, format: Union[str, Dict[str, Any]] = None,
+                       priority: int = PRIORITY_INTERACTIVE) -> str:
+        """Single-prompt completion (/api/generate); returns the response text"""
+        payload = {'model': model or self.model, 'prompt': prompt, 'stream': False}
+        if self.keep_alive:
+            payload['keep_alive'] = self.keep_alive
+        if options:
+            payload['options'] = options
+        if format:
+            payload['format'] = format
+
+        data = await self._scheduled('/api/generate', payload, timeout, priority)
+        return data.get('response', '')
+
+    async def generate_stream(self, prompt: str, model: str = None, timeout: float = None,
+                              options: Dict[str, Any] = None, format: Union[str, Dict[str, Any]] = None,
+                              priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[str]:
+        """Single-prompt completion streamed as text chunks as Ollama produces them (holds a slot until done)"""
+        payload = {'model': model or self.model, 'prompt': prompt, 'stream': True}
+        if self.keep_alive:
+            payload['keep_alive'] = self.keep_alive
+        if options:
+            payload['options'] = options
+        if format:
+            payload['format'] = format
+
+        async with self.scheduler.slot(priority):
+            session = self._get_session()
+            start = time.perf_counter()
+            first_chunk = None
+            try:
+                async with session.post('/api/generate', json=payload, timeout=self._timeout(timeout)) as response:
+                    if response.status != 200:
+                        body = await response.text()
+                        raise LLMError(f"Ollama API error {response.status}: {body[:200]}")
+                    # One JSON object per line: {"response": "<chunk>", "done": false}
+                    async for line in response.content:
+                        if not line.strip():
+                            continue
+                        try:
+                            data = json.loads(line)
+                        except ValueError:
+                            raise LLMError(f"Invalid Ollama stream line: {line[:200]!r}")
+                        if data.get('error'):
+                            raise LLMError(f"Ollama error: {data['error']}")
+                        if data.get('response'):
+                            if first_chunk is None:
+                                first_chunk = time.perf_counter() - start
+                            yield data['response']
+                        if data.get('done'):
+                            break
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError(f"Ollama did not answer within {timeout or self.timeout:.0f} seconds")
+            except aiohttp.ClientConnectionError as e:
+                raise LLMUnavailableError(f"Ollama is not reachable at {self.base_url}: {e}")
+            print(f"🤖 Ollama stream ({payload['model']}) took {time.perf_counter() - start:.2f}s, "
+                  f"first chunk after {first_chunk or 0:.2f}s")
+
+    async def chat(self, messages: List[Dict[str, str]], model: str = None, timeout: float = None,
+                   options: Dict[str, Any] = None, format: Union[str, Dict[str, Any]] = None,
+                   priority: int = PRIORITY_INTERACTIVE) -> str:
+        """Chat completion (/api/chat); returns the assistant message content"""
+        payload = {'model': model or self.model, 'messages': messages, 'stream': False}
+        if self.keep_alive:
+            payload['keep_alive'] = self.keep_alive
+        if options:
+            payload['options'] = options
+        if format:
+            payload['format'] = format
+
+        data = await self._scheduled('/api/chat', payload, timeout, priority)
+        return (data.get('message') or {}).get('content', '')
+
+    def output_format(self, schema: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """The format to request for a JSON answer: the schema, unless structured output is switched off"""
+        return schema if self.structured_output and schema else None
+
+    def output_mode(self, schema: Dict[str, Any] = None) -> str:
+        return 'schema' if self.output_format(schema) else 'free'
+
+    async def complete_json(self, prompt: str, schema: Dict[str, Any] = None, task: str = 'json', chat: bool = False,
+                            timeout: float = None, priority: int = PRIORITY_INTERACTIVE) -> Dict[str, Any]:
+        """
+        A JSON object answer to the prompt, constrained to the schema where Ollama supports it;
+        regenerates up to json_retries times if the answer does not parse
+        """
+        format = self.output_format(schema)
+        mode = self.output_mode(schema)
+        error = None
+        for attempt in range(1 + self.json_retries):
+            if chat:
+                text = await self.chat([{'role': 'user', 'content': prompt}], timeout=timeout, format=format, priority=priority)
+            else:
+                text = await self.generate(prompt, timeout=timeout, format=format, priority=priority)
+            try:
+                value, repaired = parse_json_object(text)
+            except ValueError as e:
+                error = e
+                print(f"⚠️ {task}: answer is not valid JSON ({e}), attempt {attempt + 1} of {1 + self.json_retries}")
+                continue
+            outcome = 'retried' if attempt else ('repaired' if repaired else 'parsed')
+            self.json_outputs.record(task, mode, outcome, generations=attempt + 1)
+            return value
+
+        self.json_outputs.record(task, mode, 'failed', generations=1 + self.json_retries)
+        raise LLMError(f"Ollama answer is not valid JSON after {1 + self.json_retries} attempts: {error}")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+class JsonObjectStream:
+    """
+    Incremental parser for the top-level JSON object in an LLM response
+    feed() text chunks as they stream in and get back the (key, value) members
+    completed so far. Text before the opening brace (```json fences, preambles)
+    and after the closing one is ignored, as are trailing commas.
+    """
+
+    WHITESPACE = re.compile(r'\s*')
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder(strict=False)  # LLMs emit raw newlines inside strings
+        self.buffer = ''
+        self.state = 'start'  # start -> key_or_end -> colon -> value -> comma_or_end -> ... -> done
+        self.key = None
+
+    @property
+    def done(self) -> bool:
+        return self.state == 'done'
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Parse whatever is left; raises ValueError if no complete object was seen"""
+        members = self._drain(final=True)
+        if self.state != 'done':
+            raise ValueError("Truncated JSON object")
+        return members
+
+    def _drain(self, final: bool) -> List[Tuple[str, Any]]:
+        members = []
+        buffer = self.buffer
+        pos = 0
+        while self.state != 'done':
+            if self.state == 'start':
+                brace = buffer.find('{', pos)
+                if brace == -1:
+                    pos = len(buffer)
+                    break
+                self.state = 'key_or_end'
+                pos = brace + 1
+                continue
+
+            pos = self.WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+
+            if char == '}' and self.state in ('key_or_end', 'comma_or_end'):
+                self.state = 'done'
+                pos += 1
+            elif self.state == 'comma_or_end':
+                if char != ',':
+                    raise ValueError("Expected ',' or '}' between object members")
+                self.state = 'key_or_end'
+                pos += 1
+            elif self.state == 'colon':
+                if char != ':':
+                    raise ValueError("Expected ':' after object key")
+                self.state = 'value'
+                pos += 1
+            else:
+                try:
+                    item, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Invalid JSON object member")
+                    break  # Member not complete yet
+                if end == len(buffer) and not final:
+                    break  # A number could still continue in the next chunk
+                if self.state == 'key_or_end':
+                    if not isinstance(item, str):
+                        raise ValueError("Expected a string key")
+                    self.key = item
+                    self.state = 'colon'
+                else:
+                    members.append((self.key, item))
+                    self.state = 'comma_or_end'
+                pos = end
+
+        self.buffer = '' if self.state == 'done' else buffer[pos:]
+        return members
+
+async def cancel_on_disconnect(awaitable: Awaitable, is_disconnected: Callable[[], Awaitable[bool]],
+                               poll_interval: float = 1.0):
+    """
+    Await an LLM call but cancel it if the client goes away (pass request.is_disconnected);
+    cancelling closes the connection, which also stops Ollama generating
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await is_disconnected():
+                task.cancel()
+                raise LLMError("Client disconnected, LLM request cancelled")
+    finally:
+        if not task.done():
+            task.cancel()
+
+# Shared by every call site so they use one connection pool
+ollama_client = OllamaClient()
@@ -1,29 +1,42 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Query, File, UploadFile, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional
 import uvicorn
 import os
 import time
 import json
-import subprocess
-import requests
+import re
+from contextlib import aclosing, asynccontextmanager
 from datetime import timedelta
 from pydantic import BaseModel
 
 # Import our modules
 from database import SessionLocal, engine, get_db
-from models import Base, Job, User, Profile
+from models import Base, Job, User, Profile, Application, migrate_schema
 from schemas import JobResult, UserCreate, UserResponse, ProfileResponse
 # from services.job_scraping.scrapers import JobScraper  # TODO: Update when needed
 from agent_orchestrator import AgentOrchestrator
-from company_stats import get_comprehensive_stats, get_simple_job_stats_by_source
+from company_stats import get_comprehensive_stats, get_simple_job_stats_by_source, get_scrape_performance_report
+from standardize_locations import LocationStandardizer, COUNTRY_NAMES
+from link_checker import LinkChecker
+from scrape_jobs import ScrapeJobManager
+from llm_client import (
+    ollama_client, cancel_on_disconnect, JsonObjectStream,
+    LLMError, LLMTimeoutError, LLMUnavailableError
+)
+from job_links import canonical_job_key
+from form_cache import form_cache, form_fingerprint, profile_version
+from answer_memory import answer_memory
+from ollama_lifecycle import ollama_lifecycle
+from prompt_budget import prompt_budget, needed_sections, estimate_tokens
 from automation_service import automator
 from job_automation_service import automation_service
 from auth import (
     authenticate_user, create_access_token, get_password_hash, 
-    get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_current_user, get_optional_user, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
 # Pydantic models for authentication
@@ -40,8 +53,35 @@ class Token(BaseModel):
     token_type: str
     expires_in: int
 
+class FetchJobsRequest(BaseModel):
+    platform: Optional[str] = None
+    platforms: Optional[List[str]] = None
+    companies: Optional[List[str]] = None
+
+class SavedAnswerItem(BaseModel):
+    question: str
+    answer: Any
+    field_type: Optional[str] = None
+
+class SaveAnswersRequest(BaseModel):
+    answers: List[SavedAnswerItem]
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background link checks and the Ollama lifecycle manager; stop them, scrape jobs and the LLM client on shutdown"""
+    if LINK_CHECK_INTERVAL > 0:
+        link_checker.start(LINK_CHECK_INTERVAL)
+    await ollama_lifecycle.start()
+    try:
+        yield
+    finally:
+        await ollama_lifecycle.stop()
+        link_checker.stop()
+        scrape_jobs.shutdown()
+        await ollama_client.close()
+
 # Create FastAPI app
-app = FastAPI(title="AI Job Application Assistant", version="1.0.0")
+app = FastAPI(title="AI Job Application Assistant", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware for frontend
 app.add_middleware(
@@ -52,69 +92,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create all database tables
-Base.metadata.create_all(bind=engine)
+# Create all database tables (and add columns/indexes missing from older databases)
+migrate_schema(engine)
 
-# Ollama management functions
-def check_ollama_running():
-    """Check if Ollama service is running"""
-    try:
-        response = requests.get('http://localhost:11434/api/tags', timeout=5)
-        return response.status_code == 200
-    except requests.exceptions.RequestException:
-        return False
-
-def start_ollama_service():
-    """Start Ollama service if not running"""
-    try:
-        if check_ollama_running():
-            print("🤖 Ollama is already running")
-            return True
-        
-        print("🤖 Starting Ollama service...")
-        
-        # Try different Ollama paths
-        ollama_paths = [
-            "/home/alexxvives/ollama/bin/ollama",  # Custom installation path
-            "/usr/local/bin/ollama",              # Standard Linux path
-            "/opt/homebrew/bin/ollama",           # macOS Homebrew path
-            "ollama"                              # System PATH
-        ]
-        
-        for ollama_path in ollama_paths:
-            try:
-                # Start Ollama service in background
-                print(f"🤖 Trying to start Ollama at: {ollama_path}")
-                subprocess.Popen([ollama_path, "serve"], 
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL,
-                               start_new_session=True)
-                
-                # Wait for service to start (up to 15 seconds)
-                for i in range(15):
-                    time.sleep(1)
-                    if check_ollama_running():
-                        print(f"🤖 ✅ Ollama started successfully at {ollama_path}")
-                        return True
-                
-                print(f"🤖 ❌ Ollama didn't start at {ollama_path}")
-                
-            except FileNotFoundError:
-                print(f"🤖 ❌ Ollama not found at {ollama_path}")
-                continue
-            except Exception as e:
-                print(f"🤖 ❌ Error starting Ollama at {ollama_path}: {e}")
-                continue
-        
-        print("🤖 ❌ Failed to start Ollama service")
-        return False
-        
-    except Exception as e:
-        print(f"🤖 ❌ Error in start_ollama_service: {e}")
-        return False
+async def ensure_ollama_running():
+    """Ollama's health as last seen by the lifecycle manager (no HTTP call or server start on the request path)"""
+    return ollama_lifecycle.available()
 
 # Initialize components
 agent_orchestrator = AgentOrchestrator()
+location_standardizer = LocationStandardizer()
+link_checker = LinkChecker()
+scrape_jobs = ScrapeJobManager()
+
+# Background link liveness checks; LINK_CHECK_INTERVAL=0 disables them
+LINK_CHECK_INTERVAL = float(os.getenv("LINK_CHECK_INTERVAL", "3600"))
 
 @app.get("/")
 def read_root():
@@ -128,7 +120,13 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "ollama": ollama_lifecycle.status()}
+
+@app.get("/ai/llm/stats")
+def llm_stats():
+    """LLM scheduler load (active/queued calls, wait and run times per priority, deduplicated calls)
+    and how JSON answers parsed (first try, repaired, retried, failed) per task and output mode"""
+    return {**ollama_client.scheduler.stats(), "json_outputs": ollama_client.json_outputs.stats()}
 
 # Authentication endpoints
 @app.post("/auth/signup", response_model=Token)
@@ -226,66 +224,40 @@ def search_jobs(
 ):
     """Search for jobs in the database"""
     try:
-        # Build query
-        query = db.query(Job)
+        # Build query (open jobs only; served by the ix_jobs_open_fetched_at partial index)
+        query = db.query(Job).filter(Job.closed_at.is_(None))
         
         # Filter by title if provided
         if title:
             query = query.filter(Job.title.ilike(f"%{title}%"))
         
         # Filter by location/country if provided
+        # SQL narrows candidates by substring; the shared standardizer then confirms the country
+        country_filter = location if location == "Remote" or location_standardizer.is_country(location) else None
         if location:
-            if location == "Remote":
-                # Match actual remote jobs and continent-only locations
-                from sqlalchemy import or_
-                query = query.filter(or_(
-                    Job.location.ilike("%Remote%"),
-                    Job.location.ilike("%Asia%"),
-                    Job.location.ilike("%Europe%"),
-                    Job.location.ilike("%South East Asia%"),
-                    Job.location.ilike("%North America%"),
-                    Job.location.ilike("%South America%"),
-                    Job.location.ilike("%Africa%"),
-                    Job.location.ilike("%Oceania%")
-                ))
-            else:
-                # For specific countries, match both the country name and common city patterns
-                location_patterns = [
-                    f"%{location}%",  # Direct country match
-                    f"%{location.split()[0]}%" if len(location.split()) > 1 else f"%{location}%"  # First word for compound names
-                ]
-                
-                # Add common city patterns for major countries
-                if location == "United States":
-                    location_patterns.extend(["%US%", "%USA%", "%New York%", "%San Francisco%", "%Los Angeles%", "%Chicago%"])
-                elif location == "United Kingdom":
-                    location_patterns.extend(["%UK%", "%London%", "%Manchester%", "%Edinburgh%"])
-                elif location == "France":
-                    location_patterns.extend(["%Paris%", "%Lyon%", "%Marseille%"])
-                elif location == "Germany":
-                    location_patterns.extend(["%Berlin%", "%Munich%", "%Hamburg%"])
-                elif location == "Japan":
-                    location_patterns.extend(["%Tokyo%", "%Osaka%", "%Kyoto%"])
-                elif location == "Canada":
-                    location_patterns.extend(["%Toronto%", "%Vancouver%", "%Montreal%"])
-                elif location == "Australia":
-                    location_patterns.extend(["%Sydney%", "%Melbourne%", "%Brisbane%"])
-                elif location == "United Arab Emirates":
-                    location_patterns.extend(["%UAE%", "%Dubai%", "%Abu Dhabi%"])
-                
-                # Build OR condition for all patterns  
-                from sqlalchemy import or_
-                location_conditions = [Job.location.ilike(pattern) for pattern in location_patterns]
-                query = query.filter(or_(*location_conditions))
+            from sqlalchemy import or_
+            location_patterns = location_standardizer.search_terms(country_filter) if country_filter else [location]
+            location_conditions = [Job.location.ilike(f"%{pattern}%") for pattern in location_patterns]
+            query = query.filter(or_(*location_conditions))
         
         # Order by most recent and limit results
-        final_query = query.order_by(Job.fetched_at.desc()).limit(limit)
+        final_query = query.order_by(Job.fetched_at.desc())
+        if not country_filter:
+            final_query = final_query.limit(limit)
         
         # Debug: Print the SQL query
         print(f"🔍 SQL Query: {final_query}")
         print(f"🔍 Search params: title='{title}', location='{location}', limit={limit}")
         
-        jobs = final_query.all()
+        if country_filter:
+            jobs = []
+            for job in final_query.yield_per(200):
+                if location_standardizer.extract_country(job.location) == country_filter:
+                    jobs.append(job)
+                    if len(jobs) >= limit:
+                        break
+        else:
+            jobs = final_query.all()
         print(f"🔍 Found {len(jobs)} jobs in database")
         
         # Debug: Print first few job types if any internships
@@ -318,21 +290,56 @@ def search_jobs(
         print(f"Error searching jobs: {e}")
         raise HTTPException(status_code=500, detail=f"Job search failed: {str(e)}")
 
-@app.post("/jobs/fetch")
-def fetch_jobs_manual(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    """Manually trigger job fetching from all sources"""
+@app.post("/jobs/fetch", status_code=status.HTTP_202_ACCEPTED)
+def fetch_jobs_manual(
+    request: Optional[FetchJobsRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a background scrape of all platforms, one platform or a list of companies
+    Returns immediately with a job id; poll GET /jobs/fetch/{job_id} for progress
+    """
+    request = request or FetchJobsRequest()
+    platforms = request.platforms or ([request.platform] if request.platform else None)
     try:
-        # For now, return current database stats since scraper is not implemented
-        total_jobs = db.query(Job).count()
-        
-        return {
-            "message": "Job fetching endpoint - scraper not yet implemented",
-            "total_jobs": total_jobs,
-            "sources": {"database": total_jobs},
-            "note": "Currently showing existing jobs from database. Job scraping will be implemented in future version."
-        }
+        job, created = scrape_jobs.submit(platforms, request.companies, requested_by=current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Job fetch check failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Could not start job fetch: {str(e)}")
+    
+    return {
+        "message": "Job fetch started" if created else f"Job fetch already {job.status}",
+        "job_id": job.id,
+        "status": job.status,
+        "progress_url": f"/jobs/fetch/{job.id}",
+        "total_jobs": db.query(Job).filter(Job.closed_at.is_(None)).count()
+    }
+
+@app.get("/jobs/fetch")
+def list_fetch_jobs(current_user: User = Depends(get_current_user)):
+    """Recent background scrapes, newest first"""
+    return [job.to_dict() for job in scrape_jobs.recent()]
+
+@app.get("/jobs/fetch/{job_id}")
+def get_fetch_job_progress(job_id: str, current_user: User = Depends(get_current_user)):
+    """Progress of a background scrape: companies done, jobs found/new and throughput"""
+    job = scrape_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job fetch not found")
+    return job.to_dict()
+
+@app.post("/jobs/check-links")
+def check_job_links(
+    limit: int = Query(200, description="Maximum number of links to check"),
+    current_user: User = Depends(get_current_user)
+):
+    """Run one link liveness pass now (applied-to jobs first, then oldest postings)"""
+    try:
+        return link_checker.run_once(limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Link check failed: {str(e)}")
 
 @app.get("/jobs/test")
 def test_jobs(db: Session = Depends(get_db)):
@@ -360,104 +367,38 @@ def get_job_stats(db: Session = Depends(get_db)):
     """Get comprehensive job and company statistics"""
     return get_comprehensive_stats(db)
 
+@app.get("/jobs/scrape-report")
+def get_scrape_report(
+    platform: Optional[str] = Query(None, description="Only report one platform"),
+    days: int = Query(30, description="Look back this many days"),
+    limit: int = Query(10, description="Targets per section"),
+    db: Session = Depends(get_db)
+):
+    """Slowest, least productive and most failing scrape targets from scrape_runs telemetry"""
+    return get_scrape_performance_report(db, platform, days, limit)
+
 @app.get("/jobs/countries")
 def get_job_countries(db: Session = Depends(get_db)):
     """Get all countries with job counts"""
     try:
         from sqlalchemy import func
         
-        # Complete list of countries (Remote will be added separately at the top)
-        all_countries = [
-            "Afghanistan", "Albania", "Algeria", "Andorra", "Angola", "Argentina", "Armenia", "Australia", 
-            "Austria", "Azerbaijan", "Bahamas", "Bahrain", "Bangladesh", "Barbados", "Belarus", "Belgium", 
-            "Belize", "Benin", "Bhutan", "Bolivia", "Bosnia and Herzegovina", "Botswana", "Brazil", "Brunei", 
-            "Bulgaria", "Burkina Faso", "Burundi", "Cambodia", "Cameroon", "Canada", "Cape Verde", 
-            "Central African Republic", "Chad", "Chile", "China", "Colombia", "Comoros", "Congo", 
-            "Costa Rica", "Croatia", "Cuba", "Cyprus", "Czech Republic", "Denmark", "Djibouti", "Dominica", 
-            "Dominican Republic", "Ecuador", "Egypt", "El Salvador", "Equatorial Guinea", "Eritrea", "Estonia", 
-            "Eswatini", "Ethiopia", "Fiji", "Finland", "France", "Gabon", "Gambia", "Georgia", "Germany", 
-            "Ghana", "Greece", "Grenada", "Guatemala", "Guinea", "Guinea-Bissau", "Guyana", "Haiti", 
-            "Honduras", "Hungary", "Iceland", "India", "Indonesia", "Iran", "Iraq", "Ireland", "Israel", 
-            "Italy", "Jamaica", "Japan", "Jordan", "Kazakhstan", "Kenya", "Kiribati", "Kuwait", "Kyrgyzstan", 
-            "Laos", "Latvia", "Lebanon", "Lesotho", "Liberia", "Libya", "Liechtenstein", "Lithuania", 
-            "Luxembourg", "Madagascar", "Malawi", "Malaysia", "Maldives", "Mali", "Malta", "Marshall Islands", 
-            "Mauritania", "Mauritius", "Mexico", "Micronesia", "Moldova", "Monaco", "Mongolia", "Montenegro", 
-            "Morocco", "Mozambique", "Myanmar", "Namibia", "Nauru", "Nepal", "Netherlands", "New Zealand", 
-            "Nicaragua", "Niger", "Nigeria", "North Korea", "North Macedonia", "Norway", "Oman", "Pakistan", 
-            "Palau", "Palestine", "Panama", "Papua New Guinea", "Paraguay", "Peru", "Philippines", "Poland", 
-            "Portugal", "Qatar", "Romania", "Russia", "Rwanda", "Saint Kitts and Nevis", "Saint Lucia", 
-            "Saint Vincent and the Grenadines", "Samoa", "San Marino", "Sao Tome and Principe", "Saudi Arabia", 
-            "Senegal", "Serbia", "Seychelles", "Sierra Leone", "Singapore", "Slovakia", "Slovenia", 
-            "Solomon Islands", "Somalia", "South Africa", "South Korea", "South Sudan", "Spain", "Sri Lanka", 
-            "Sudan", "Suriname", "Sweden", "Switzerland", "Syria", "Taiwan", "Tajikistan", "Tanzania", 
-            "Thailand", "Timor-Leste", "Togo", "Tonga", "Trinidad and Tobago", "Tunisia", "Turkey", 
-            "Turkmenistan", "Tuvalu", "Uganda", "Ukraine", "United Arab Emirates", "United Kingdom", 
-            "United States", "Uruguay", "Uzbekistan", "Vanuatu", "Vatican City", "Venezuela", "Vietnam", 
-            "Yemen", "Zambia", "Zimbabwe"
-        ]
-        
         # Get job counts by country from database
         location_counts = db.query(
             Job.location,
             func.count(Job.id).label('count')
         ).filter(
+            Job.closed_at.is_(None),
             Job.location.isnot(None),
             Job.location != ''
         ).group_by(Job.location).all()
         
-        # Create country job count mapping
+        # Create country job count mapping (remote and continent-only locations count as Remote)
         country_counts = {}
         for location, count in location_counts:
-            # Extract country from location
-            if 'Remote' in location:
-                country = 'Remote'
-            elif ',' in location:
-                country = location.split(',')[-1].strip()
-            else:
-                country = location.strip()
-            
-            # Map common variations to standard country names
-            # Continents/regions without specific countries are classified as Remote
-            country_mapping = {
-                'US': 'United States',
-                'USA': 'United States',
-                'UK': 'United Kingdom',
-                'UAE': 'United Arab Emirates',
-                'United Arab Emirates': 'United Arab Emirates',
-                'Korea': 'South Korea',
-                'Republic of Korea': 'South Korea',
-                # Continents/regions → Remote
-                'Asia': 'Remote',
-                'South East Asia': 'Remote', 
-                'Europe': 'Remote',
-                'North America': 'Remote',
-                'South America': 'Remote',
-                'Africa': 'Remote',
-                'Oceania': 'Remote',
-                # Cities → Countries
-                'Dubai': 'United Arab Emirates',
-                'Taiwan': 'Taiwan',
-                'Taipei': 'Taiwan',
-                'Paris': 'France',
-                'London': 'United Kingdom',
-                'Singapore': 'Singapore',
-                'Hong Kong': 'China',
-                'Tokyo': 'Japan',
-                'Berlin': 'Germany',
-                'Amsterdam': 'Netherlands',
-                'Sydney': 'Australia',
-                'Toronto': 'Canada',
-                'Vancouver': 'Canada'
-            }
-            
-            country = country_mapping.get(country, country)
-            
-            # Only add if it's a recognized country or Remote
-            if country in all_countries or country == 'Remote':
-                if country in country_counts:
-                    country_counts[country] += count
-                else:
-                    country_counts[country] = count
+            country = location_standardizer.extract_country(location)
+            if country:
+                country_counts[country] = country_counts.get(country, 0) + count
         
         # Create final list with Remote at the top, then alphabetical countries
         countries = []
@@ -471,7 +412,7 @@ def get_job_countries(db: Session = Depends(get_db)):
         })
         
         # Add all other countries alphabetically
-        for country in sorted(all_countries):
+        for country in COUNTRY_NAMES:
             job_count = country_counts.get(country, 0)
             countries.append({
                 "country": country,
@@ -665,7 +606,7 @@ async def start_automation_session(
         
         # Start Ollama service if not running
         print("🤖 Checking Ollama service...")
-        if not start_ollama_service():
+        if not await ensure_ollama_running():
             print("🤖 ⚠️ Warning: Ollama service failed to start - AI form filling may not work")
         
         print(f"DEBUG: Current user: {current_user.email if current_user else 'None'}")
@@ -874,6 +815,18 @@ async def create_automation_session(
             print("❌ Profile not found")
             raise HTTPException(status_code=404, detail="Profile not found")
         
+        # Drop jobs whose posting is gone: already closed, or a dead link on a fresh check.
+        # Only the first few stale links are checked now; the rest are checked in the background
+        # and dropped from the session before it reaches them.
+        selected_ids = [job.get("id") for job in selected_jobs if job.get("id") is not None]
+        dead_job_ids, deferred_job_ids = await run_in_threadpool(link_checker.verify_jobs, db, selected_ids)
+        dead_job_ids = set(dead_job_ids)
+        if dead_job_ids:
+            print(f"🔗 Skipping {len(dead_job_ids)} jobs with dead links: {sorted(dead_job_ids)}")
+            selected_jobs = [job for job in selected_jobs if job.get("id") not in dead_job_ids]
+            if not selected_jobs:
+                raise HTTPException(status_code=400, detail="All selected jobs are no longer available")
+        
         # Create automation session
         print("🔥 Creating automation session...")
         session_id = automation_service.create_session(
@@ -883,7 +836,13 @@ async def create_automation_session(
         )
         
         print(f"✅ Session created: {session_id}")
-        return {"success": True, "sessionId": session_id}
+        if deferred_job_ids:
+            link_checker.verify_in_background(
+                deferred_job_ids,
+                lambda dead: automation_service.skip_pending_jobs(session_id, dead, "Job posting is no longer available")
+            )
+        return {"success": True, "sessionId": session_id, "skippedJobIds": sorted(dead_job_ids),
+                "pendingLinkChecks": len(deferred_job_ids)}
         
     except HTTPException as e:
         print(f"❌ HTTP Exception: {e.detail}")
@@ -1420,53 +1379,98 @@ async def delete_user_profile(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete profile: {str(e)}")
 
+# Answer memory: screening-question answers reused across applications (see answer_memory.py)
+@app.get("/user/answer-memory")
+def get_answer_memory(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Stored answers, most recently used first"""
+    answers = answer_memory.entries(db, current_user.id)
+    return {
+        "answers": answers,
+        "count": len(answers),
+        "max_entries": answer_memory.max_entries,
+        "threshold": answer_memory.threshold
+    }
+
+@app.put("/user/answer-memory")
+def save_answer_memory(
+    request: SaveAnswersRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Save or correct answers; the user's own answers are never overwritten by submitted forms"""
+    stored = answer_memory.remember(db, current_user.id, [item.model_dump() for item in request.answers], source="user")
+    return {"success": True, "stored": stored}
+
+@app.post("/user/answer-memory/accepted")
+def accept_answer_memory(
+    request: SaveAnswersRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Remember the answers of a submitted form (the extension sends the memory_questions fields' final values)"""
+    stored = answer_memory.remember(db, current_user.id, [item.model_dump() for item in request.answers], source="submitted")
+    return {"success": True, "stored": stored}
+
+@app.delete("/user/answer-memory/{answer_id}")
+def delete_answer_memory_entry(
+    answer_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    if not answer_memory.delete(db, current_user.id, answer_id):
+        raise HTTPException(status_code=404, detail="Answer not found")
+    return {"success": True, "deleted_answer_id": answer_id}
+
+@app.delete("/user/answer-memory")
+def clear_answer_memory(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    deleted = answer_memory.clear(db, current_user.id)
+    return {"success": True, "deleted": deleted}
+
 # Chrome Extension API Bridge Endpoints
 @app.post("/api/chrome-extension/analyze-form")
 async def analyze_form_fields(
-    request: Request
+    request: Request,
+    current_user: Optional[User] = Depends(get_optional_user)
 ):
     """
     Analyze form fields extracted by Chrome extension
     Returns AI-generated field mappings
     """
     # Redirect to modern AI endpoint logic - no authentication required for Chrome extension
+    # (a signed-in user also gets answers remembered from earlier applications)
     try:
         request_data = await request.json()
-        
-        # Check if request is in new format (formStructure/userProfile) or old format  
-        if 'formStructure' in request_data and 'userProfile' in request_data:
-            # New format - pass through to modern AI logic
-            return await analyze_form_with_ollama(request_data)
-        else:
-            # Old format - convert and redirect
-            form_fields = request_data.get('form_fields', [])
-            profile_id = request_data.get('profile_id')
-            
-            if not form_fields:
-                raise HTTPException(status_code=400, detail="No form fields provided")
-            
-            # Convert to new format and call modern endpoint
-            converted_request = {
-                'formStructure': {'fields': form_fields},
-                'userProfile': {'id': profile_id},  # Minimal profile for now
-                'jobUrl': request_data.get('jobUrl', '')
-            }
-            
-            # Create new request object
-            from fastapi import Request
-            import json
-            
-            class MockRequest:
-                def __init__(self, data):
-                    self._data = data
-                async def json(self):
-                    return self._data
-            
-            return await analyze_form_with_ollama(converted_request)
+        return await analyze_form_with_ollama(extension_form_request(request_data), request, current_user)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Form analysis failed: {str(e)}")
 
+@app.post("/api/chrome-extension/analyze-form/stream")
+async def analyze_form_fields_stream(request: Request, current_user: Optional[User] = Depends(get_optional_user)):
+    """
+    Streaming variant of analyze-form for the Chrome extension
+    Returns NDJSON events so fields can be filled as each answer arrives
+    """
+    request_data = await request.json()
+    return await analyze_form_stream(extension_form_request(request_data), current_user)
+
+def extension_form_request(request_data: dict) -> dict:
+    """Accept both the new (formStructure/userProfile) and old (form_fields/profile_id) extension formats"""
+    # New format - pass through to modern AI logic
+    if 'formStructure' in request_data and 'userProfile' in request_data:
+        return request_data
+    
+    # Old format - convert
+    form_fields = request_data.get('form_fields', [])
+    if not form_fields:
+        raise HTTPException(status_code=400, detail="No form fields provided")
+    
+    return {
+        'formStructure': {'fields': form_fields},
+        'userProfile': {'id': request_data.get('profile_id')},  # Minimal profile for now
+        'jobUrl': request_data.get('jobUrl', '')
+    }
+
 @app.post("/api/chrome-extension/submit-application")
 async def submit_application_status(
     request: Request,
@@ -1485,8 +1489,10 @@ async def submit_application_status(
         if not job_url:
             raise HTTPException(status_code=400, detail="Job URL is required")
         
-        # Find or create job record
-        job = db.query(Job).filter(Job.link == job_url).first()
+        from sqlalchemy import func
+        
+        # Find or create job record (the extension reports apply-page URLs, so match on the canonical key)
+        job = db.query(Job).filter(Job.link_key == canonical_job_key(job_url)).first()
         if not job:
             # Create basic job record
             job = Job(
@@ -1494,7 +1500,7 @@ async def submit_application_status(
                 company=data.get('company', 'Unknown Company'),
                 location=data.get('location', ''),
                 link=job_url,
-                source='chrome_extension'
+                platform='chrome_extension'
             )
             db.add(job)
             db.flush()
@@ -1615,7 +1621,7 @@ def extract_user_data_from_profile(user_profile: dict) -> dict:
             # === EDUCATION (FULL DETAILS) ===
             "education": education,
             "highest_degree": education[0].get("degree") if education else job_prefs.get("highest_education"),
-            "school": education[0].get("school") or (education[0].get("institution") if education else None),
+            "school": (education[0].get("school") or education[0].get("institution")) if education else None,
             "gpa": education[0].get("gpa") if education else None,
             
             # === SKILLS & CAPABILITIES ===
@@ -1758,7 +1764,7 @@ def generate_semantic_name(question, field_type, counters):
         ("full name", "name"): "full_name",
         ("first name",): "first_name", 
         ("last name",): "last_name",
-        ("email",): "email",
+        ("email", "e-mail", "email address"): "email",
         ("phone", "telephone"): "phone",
         
         # Location/Address
@@ -1794,15 +1800,15 @@ def generate_semantic_name(question, field_type, counters):
         ("additional", "comments", "tell us", "why", "describe", "information"): "additional_info"
     }
     
-    # Find matching semantic name (check longer patterns first for better matching)
+    # Find matching semantic name: the longest keyword found in the question wins, so
+    # "last name" beats "name" and "email address" beats "address"
     semantic_name = None
-    # Sort by longest keyword first to prioritize more specific matches
-    sorted_mappings = sorted(semantic_mappings.items(), key=lambda x: max(len(kw) for kw in x[0]), reverse=True)
-    
-    for keywords, name in sorted_mappings:
-        if any(keyword in question for keyword in keywords):
-            semantic_name = name
-            break
+    best_length = 0
+    for keywords, name in semantic_mappings.items():
+        for keyword in keywords:
+            if keyword in question and len(keyword) > best_length:
+                semantic_name = name
+                best_length = len(keyword)
     
     # Default fallback based on field type
     if not semantic_name:
@@ -1824,78 +1830,261 @@ def generate_semantic_name(question, field_type, counters):
         
     return semantic_name
 
-@app.post("/ai/analyze-form")
-async def analyze_form_with_ollama(request: dict):
+def profile_visa_answer(user_data: dict):
+    """Yes/No from the profile's visa requirement (free text is passed through)"""
+    requirement = str(user_data.get("visa_requirement") or "").strip()
+    if requirement.lower().startswith("no"):
+        return "No"
+    if requirement.lower().startswith("yes"):
+        return "Yes"
+    return requirement or None
+
+# Semantic fields answered straight from the profile, keyed by semantic name (without the duplicate counter)
+PROFILE_FIELD_VALUES = {
+    "full_name": lambda data: data.get("full_name"),
+    "first_name": lambda data: data.get("first_name"),
+    "last_name": lambda data: data.get("last_name"),
+    "email": lambda data: data.get("email"),
+    "phone": lambda data: data.get("phone"),
+    "current_location": lambda data: ", ".join(part for part in (data.get("city"), data.get("state")) if part) or data.get("country"),
+    "address": lambda data: data.get("address"),
+    "city": lambda data: data.get("city"),
+    "state": lambda data: data.get("state"),
+    "zip_code": lambda data: data.get("zip_code"),
+    "nationality": lambda data: data.get("citizenship") or data.get("country"),
+    "current_company": lambda data: data.get("current_company"),
+    "current_title": lambda data: data.get("current_title"),
+    "linkedin_url": lambda data: data.get("linkedin"),
+    "website": lambda data: data.get("portfolio") or data.get("github"),
+    "visa_sponsorship": profile_visa_answer,
+    "resume_file": lambda data: data.get("resume_path")
+}
+
+# generate_semantic_name matches loose keywords ("name", "url", "position", "address" in "email address"),
+# so these names are only resolved when the question itself confirms the meaning
+PROFILE_FIELD_QUESTIONS = {
+    "full_name": re.compile(r'^(?:your |full |legal |candidate )*name$'),
+    "current_location": re.compile(r'current location|where do you live|where are you (?:located|based)|^location$'),
+    "address": re.compile(r'^(?!.*e-?mail).*address'),
+    "state": re.compile(r'^state\b|province'),
+    "nationality": re.compile(r'^(?!.*code).*(?:country|nationality)'),
+    "current_company": re.compile(r'current|recent|employer|^company(?: name)?$'),
+    "current_title": re.compile(r'current|recent|^(?:job )?title$'),
+    "linkedin_url": re.compile(r'linkedin'),
+    "website": re.compile(r'website|portfolio'),
+    # Only "will you require sponsorship?" matches the profile's visa_requirement; "are you authorized
+    # to work without sponsorship?" asks the opposite, so that wording is left for the LLM
+    "visa_sponsorship": re.compile(r'^(?!.*(?:authori[sz]|without|eligib|legal|permit|citizen|green card))'
+                                   r'.*(?:\b(?:requir(?:e|es|ing)|need(?:s|ing)?)\b.*sponsor|sponsor\w* (?:required|needed))')
+}
+
+# Contact and name fields about someone else (emergency contact, referrer, reference, manager...)
+OTHER_PERSON_PATTERN = re.compile(r'emergency|referr(?:er|al|ed|ing)|\breferences?\b|manager|recruiter|supervisor|next of kin')
+
+# Yes/no questions ("Are you willing to relocate to another state?") need judgment, not a profile value
+JUDGMENT_QUESTION_PATTERN = re.compile(r'^(?:are|do|did|will|would|have|has|can|could|is|should)\b')
+
+def match_dropdown_option(field: dict, value, valid_options: list):
+    """The dropdown option for a profile value: exact (case-insensitive) match first, then the usual correction"""
+    value_lower = str(value).strip().lower()
+    for option in valid_options:
+        if option.strip().lower() == value_lower:
+            return option
+    return correct_dropdown_answer(field, value, valid_options)
+
+def resolve_standard_fields(clean_form: list, semantic_mapping: dict, user_data: dict) -> dict:
     """
-    Analyze job application form using Ollama AI
-    Bypasses Chrome extension CORS restrictions
+    Answer the recognizable fields (name, contact, address, links, visa...) straight from the profile
+    Returns {html_field_id: value}; everything else - open questions, judgment calls, values the
+    profile lacks and dropdowns without a matching option - is left for the LLM
     """
-    try:
-        form_structure = request.get('formStructure')
-        user_profile = request.get('userProfile')
-        job_url = request.get('jobUrl', '')  # Optional job URL to lookup job description
-        
-        if not form_structure or not user_profile:
-            raise HTTPException(status_code=400, detail="Missing formStructure or userProfile")
-        
-        print(f"🧠 Backend: Received form analysis request for {len(form_structure.get('fields', []))} fields")
-        
-        # Try to fetch job description from database if URL provided
-        job_description = ""
-        if job_url:
-            try:
-                db_session = SessionLocal()
-                
-                # Clean the job URL to match database format (remove /apply if present)
-                clean_job_url = job_url.replace('/apply', '').rstrip('/')
-                
-                # Try exact match first
-                job = db_session.query(Job).filter(Job.link == clean_job_url).first()
-                
-                # If no exact match, try partial match (for URLs with different query params)
-                if not job:
-                    job = db_session.query(Job).filter(Job.link.like(f'%{clean_job_url.split("/")[-1]}%')).first()
-                
-                if job and job.description:
-                    job_description = job.description
-                    print(f"🧠 ✅ Found job description ({len(job_description)} chars): {job_description[:100]}...")
-                    print(f"🧠 📋 Job title: {job.title}")
-                    print(f"🧠 🏢 Company: {job.company}")
-                else:
-                    print(f"🧠 ❌ No job description found for URL: {job_url}")
-                    print(f"🧠 🔍 Cleaned URL: {clean_job_url}")
-                    # Debug: show some example URLs from database
-                    sample_jobs = db_session.query(Job).limit(3).all()
-                    print(f"🧠 📊 Sample URLs in database:")
-                    for sample in sample_jobs:
-                        print(f"🧠   - {sample.link}")
-                
+    fields_by_id = {field.get("id") or field.get("name"): field for field in clean_form}
+    resolved = {}
+    
+    for semantic_name, html_field_id in semantic_mapping.items():
+        base_name = re.sub(r'_\d+$', '', semantic_name)
+        field = fields_by_id.get(html_field_id, {})
+        field_type = field.get("type")
+        question = field.get("question", "").lower().replace("✱", "").replace("*", "").strip()
+        
+        if base_name not in PROFILE_FIELD_VALUES or field_type == "checkbox":
+            continue
+        if (field_type == "file") != (base_name == "resume_file"):
+            continue
+        if base_name in PROFILE_FIELD_QUESTIONS and not PROFILE_FIELD_QUESTIONS[base_name].search(question):
+            continue
+        if base_name != "resume_file" and OTHER_PERSON_PATTERN.search(question):
+            continue
+        if base_name != "visa_sponsorship" and JUDGMENT_QUESTION_PATTERN.match(question):
+            continue
+        
+        value = PROFILE_FIELD_VALUES[base_name](user_data)
+        if value is None:
+            continue  # Not in the extracted data; the LLM still sees the whole profile
+        if field_type in ["select", "text_from_dropdown"]:
+            valid_options = field.get("all_options") or field.get("options") or field.get("sample_options", [])
+            value = match_dropdown_option(field, value, valid_options) if valid_options else None
+            if value is None:
+                continue  # Let the LLM pick among the options
+        
+        resolved[html_field_id] = value
+    
+    return resolved
+
+def prepare_form_analysis(request: dict, user_id: int = None) -> dict:
+    """
+    Everything before the LLM call: validate the request, look up the job description,
+    answer the standard fields from the profile, the user's answer memory and the cache,
+    and build the prompt for the rest
+    (prompt is None when the profile answers every field)
+    """
+    form_structure = request.get('formStructure')
+    user_profile = request.get('userProfile')
+    job_url = request.get('jobUrl', '')  # Optional job URL to lookup job description
+    
+    if not form_structure or not user_profile:
+        raise HTTPException(status_code=400, detail="Missing formStructure or userProfile")
+    
+    print(f"🧠 Backend: Received form analysis request for {len(form_structure.get('fields', []))} fields")
+    
+    # Try to fetch job description from database if URL provided
+    job_description = ""
+    if job_url:
+        try:
+            db_session = SessionLocal()
+            
+            # Canonical key drops /apply, tracking params and host variants; one indexed lookup
+            job_key = canonical_job_key(job_url)
+            job = db_session.query(Job).filter(Job.link_key == job_key).first()
+            
+            if job and job.description:
+                job_description = job.description
+                print(f"🧠 ✅ Found job description ({len(job_description)} chars): {job_description[:100]}...")
+                print(f"🧠 📋 Job title: {job.title}")
+                print(f"🧠 🏢 Company: {job.company}")
+            else:
+                print(f"🧠 ❌ No job description found for URL: {job_url}")
+                print(f"🧠 🔍 Link key: {job_key}")
+            
+            db_session.close()
+        except Exception as e:
+            print(f"🧠 ❌ Error fetching job description: {e}")
+            if 'db_session' in locals():
                 db_session.close()
+    
+    # Extract clean user data from profile
+    user_data = extract_user_data_from_profile(user_profile)
+    print(f"🧠 DEBUG: Extracted user data: {json.dumps(user_data, indent=2)}")
+    
+    # Clean form structure (remove positioning and unnecessary data)
+    clean_form = clean_form_structure(form_structure)
+    print(f"🧠 DEBUG: Clean form structure: {json.dumps(clean_form, indent=2)}")
+    
+    # Create semantic field mapping for Ollama (to avoid UUID confusion); postings built on
+    # the same ATS form template share it, only the HTML field ids differ
+    fingerprint = form_fingerprint(clean_form)
+    template = form_cache.get_template(fingerprint)
+    if template is None:
+        template = build_form_template(clean_form)
+        form_cache.put_template(fingerprint, template)
+    else:
+        print(f"♻️ Form template {fingerprint[:12]} seen before, reusing its semantic mapping")
+    semantic_mapping = {name: clean_form[position]["id"] for position, name in enumerate(template["semantic_names"])}
+    llm_form = template["llm_form"]
+    
+    # Open-ended answers tailored to this job's description are not reused for other jobs
+    job_specific = {clean_form[position]["id"] for position in template["job_specific"]}
+    uncacheable = job_specific if job_description else set()
+    
+    # Standard fields come straight from the profile, then screening questions the user answered before,
+    # then answers cached for this template and profile; only the rest goes to the LLM. Memory goes first
+    # so the user's corrections win, and the cached answers are versioned by it so deletes take effect too
+    resolved = resolve_standard_fields(clean_form, semantic_mapping, user_data)
+    sources = {html_id: "profile" for html_id in resolved}
+    
+    if user_id is not None:
+        pending = [field for field in clean_form
+                   if field["id"] not in resolved and field["id"] not in job_specific and field.get("type") != "file"]
+        if pending:
+            db_session = SessionLocal()
+            try:
+                for html_id, answer in answer_memory.lookup(db_session, user_id, pending).items():
+                    resolved[html_id] = answer
+                    sources[html_id] = "memory"
             except Exception as e:
-                print(f"🧠 ❌ Error fetching job description: {e}")
-                if 'db_session' in locals():
-                    db_session.close()
-        
-        # Extract clean user data from profile
-        user_data = extract_user_data_from_profile(user_profile)
-        print(f"🧠 DEBUG: Extracted user data: {json.dumps(user_data, indent=2)}")
-        
-        # Clean form structure (remove positioning and unnecessary data)
-        clean_form = clean_form_structure(form_structure)
-        print(f"🧠 DEBUG: Clean form structure: {json.dumps(clean_form, indent=2)}")
-        
-        # Create semantic field mapping for Ollama (to avoid UUID confusion)
-        semantic_mapping, llm_form = create_semantic_field_mapping(clean_form)
-        print("🔄 SEMANTIC FIELD MAPPING:")
-        print("=" * 40)
-        for semantic_name, html_id in semantic_mapping.items():
-            # Find the question for this field
-            question = next((f.get('question', '') for f in clean_form if f.get('id', f.get('name')) == html_id), '')
-            print(f"  {semantic_name} -> {html_id}")
-            print(f"    Question: \"{question}\"")
-        print("=" * 40)
-        
-        prompt = f"""You are filling a job application form using a candidate profile and job description.
+                print(f"🧠 ❌ Answer memory lookup failed: {e}")
+            finally:
+                db_session.close()
+    
+    version = profile_version(user_data)
+    answers_version = version if user_id is None else f"{version}:{user_id}:{answer_memory.revision(user_id)}"
+    cached_answers = form_cache.get_answers(fingerprint, answers_version) or {}
+    for position, answer in cached_answers.items():
+        html_id = clean_form[position]["id"]
+        if html_id not in resolved and html_id not in uncacheable:
+            resolved[html_id] = answer
+            sources[html_id] = "cache"
+    
+    # Screening questions whose submitted answers go into the user's answer memory
+    memory_questions = {
+        field["id"]: field["question"] for field in clean_form
+        if sources.get(field["id"]) != "profile" and field["id"] not in job_specific and field.get("type") != "file"
+    } if user_id is not None else {}
+    
+    reused = {source: list(sources.values()).count(source) for source in ("cache", "memory")}
+    if any(reused.values()):
+        print(f"♻️ Reused {reused['cache']} cached and {reused['memory']} remembered answers for form template {fingerprint[:12]}")
+    semantic_mapping = {name: html_id for name, html_id in semantic_mapping.items() if html_id not in resolved}
+    llm_form = [field for field in llm_form if field["id"] in semantic_mapping]
+    print(f"⚡ Resolved {len(resolved)} of {len(clean_form)} fields without the LLM, {len(llm_form)} left for it")
+    
+    print("🔄 SEMANTIC FIELD MAPPING:")
+    print("=" * 40)
+    for semantic_name, html_id in semantic_mapping.items():
+        # Find the question for this field
+        question = next((f.get('question', '') for f in clean_form if f.get('id', f.get('name')) == html_id), '')
+        print(f"  {semantic_name} -> {html_id}")
+        print(f"    Question: \"{question}\"")
+    print("=" * 40)
+    
+    cache_info = {
+        "fingerprint": fingerprint,
+        "answers_version": answers_version,
+        "uncacheable": uncacheable,
+        "job_specific": job_specific,
+        "sources": sources,
+        "memory_questions": memory_questions,
+        "user_id": user_id
+    }
+    if not llm_form:
+        return {
+            "prompt": None,
+            "clean_form": clean_form,
+            "semantic_mapping": semantic_mapping,
+            "resolved": resolved,
+            **cache_info
+        }
+    
+    # Only the profile sections the remaining questions need, compacted to fit the prompt's token budget
+    open_ended = any(html_id in job_specific for html_id in semantic_mapping.values())
+    sections = needed_sections(llm_form, open_ended)
+    overhead = estimate_tokens(build_form_prompt("", "", llm_form))
+    profile_text, job_text = prompt_budget.fit(user_data, version, sections, job_description, overhead)
+    prompt = build_form_prompt(profile_text, job_text, llm_form)
+    
+    return {
+        "prompt": prompt,
+        "schema": form_answer_schema(llm_form, semantic_mapping, clean_form),
+        "clean_form": clean_form,
+        "semantic_mapping": semantic_mapping,
+        "resolved": resolved,
+        **cache_info
+    }
+
+def build_form_prompt(profile_text: str, job_description: str, llm_form: list) -> str:
+    """The form-analysis prompt around an already compacted profile and job description"""
+    form_text = "[\n" + ",\n".join(json.dumps(field, ensure_ascii=False) for field in llm_form) + "\n]"
+    return f"""You are filling a job application form using a candidate profile and job description.
 
 🎯 GOAL:  
 Answer every form field accurately using the profile and job data.  
@@ -1903,7 +2092,7 @@ Always use real values. Adapt to any form layout or question style.
 
 ===========================
 📄 PROFILE DATA:
-{json.dumps(user_data, indent=2)}
+{profile_text}
 ===========================
 
 ===========================
@@ -1913,7 +2102,7 @@ Always use real values. Adapt to any form layout or question style.
 
 ===========================
 📋 FORM FIELDS:
-{json.dumps(llm_form, indent=2)}
+{form_text}
 ===========================
 
 ===========================
@@ -1985,13 +2174,157 @@ Return ONLY a JSON object mapping field IDs to values:
 
 ONLY return the JSON object - no explanations:"""
 
+def form_answer_schema(llm_form: list, semantic_mapping: dict, clean_form: list) -> dict:
+    """JSON schema for the LLM's answer: one key per semantic field name, dropdowns limited to their options"""
+    fields_by_id = {field.get("id") or field.get("name"): field for field in clean_form}
+    properties = {}
+    for llm_field in llm_form:
+        field = fields_by_id.get(semantic_mapping[llm_field["id"]], {})
+        options = field.get("all_options") or field.get("options")
+        if options:
+            properties[llm_field["id"]] = {"enum": [*dict.fromkeys(options), None]}
+        elif field.get("type") == "checkbox":
+            properties[llm_field["id"]] = {"type": ["boolean", "string", "null"]}
+        else:
+            properties[llm_field["id"]] = {"type": ["string", "null"]}
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+def build_form_template(clean_form: list) -> dict:
+    """The per-template part of an analysis: semantic names by field position, LLM form, job-specific fields"""
+    _, llm_form = create_semantic_field_mapping(clean_form)
+    semantic_names = [field["id"] for field in llm_form]
+    job_specific = [
+        position for position, (name, field) in enumerate(zip(semantic_names, clean_form))
+        if field.get("type") == "textarea" or re.sub(r'_\d+$', '', name) in ("additional_info", "text_area")
+    ]
+    return {"semantic_names": semantic_names, "llm_form": llm_form, "job_specific": job_specific}
+
+def cache_form_answers(prepared: dict, answers: dict):
+    """
+    Cache a finished analysis's answers by field position for the next posting on the same form template
+    (the user's answer memory only takes accepted answers, see /user/answer-memory/accepted)
+    """
+    positions = {field["id"]: position for position, field in enumerate(prepared["clean_form"])}
+    cacheable = {
+        positions[html_id]: answer for html_id, answer in answers.items()
+        if html_id in positions and html_id not in prepared["uncacheable"]
+        and prepared["sources"].get(html_id) != "memory"  # Deleting a remembered answer must take effect
+    }
+    form_cache.put_answers(prepared["fingerprint"], prepared["answers_version"], cacheable)
+
+def correct_dropdown_answer(field: dict, answer, valid_options: list):
+    """Closest valid option for an answer that is not one of a dropdown's options, or None"""
+    # AUTO-CORRECT: Try to find best match
+    print(f"🔧 AUTO-CORRECTING dropdown violation for '{field.get('id') or field.get('name')}':")
+    print(f"   Question: {field.get('question', '')}")
+    print(f"   Bad answer: '{answer}'")
+    print(f"   Using {len(valid_options)} validation options: {valid_options[:10]}{'...' if len(valid_options) > 10 else ''}")
+    
+    # Smart matching based on common patterns
+    corrected_answer = None
+    answer_lower = str(answer).lower()
+    question_lower = field.get('question', '').lower()
+    
+    # Special handling for visa/sponsorship questions
+    if 'visa' in question_lower or 'sponsor' in question_lower:
+        if 'no' in answer_lower or answer_lower == 'usa' or answer_lower == 'us':
+            # User probably doesn't need sponsorship
+            for option in valid_options:
+                if 'no' in option.lower() and ('visa' in option.lower() or 'sponsor' in option.lower()):
+                    corrected_answer = option
+                    break
+        elif 'yes' in answer_lower:
+            # User needs sponsorship
+            for option in valid_options:
+                if 'yes' in option.lower() and 'sponsor' in option.lower():
+                    corrected_answer = option
+                    break
+    
+    # Special handling for country/nationality questions
+    elif 'nationality' in question_lower or 'country' in question_lower:
+        # Map common country codes/names
+        country_mappings = {
+            'usa': ['united states', 'america', 'usa', 'us'],
+            'uk': ['united kingdom', 'britain', 'uk', 'england'],
+            'spain': ['spain', 'spanish'],
+            'france': ['france', 'french'],
+            'germany': ['germany', 'german'],
+            'canada': ['canada', 'canadian'],
+            'australia': ['australia', 'australian']
+        }
+        
+        for country_group in country_mappings.values():
+            if answer_lower in country_group:
+                for option in valid_options:
+                    if any(country in option.lower() for country in country_group):
+                        corrected_answer = option
+                        break
+                if corrected_answer:
+                    break
+    
+    # Special handling for language questions
+    elif 'language' in question_lower:
+        # Map common language names
+        language_mappings = {
+            'english': ['english', 'en'],
+            'spanish': ['spanish', 'español', 'es'],
+            'french': ['french', 'français', 'fr'],
+            'german': ['german', 'deutsch', 'de'],
+            'italian': ['italian', 'italiano', 'it'],
+            'portuguese': ['portuguese', 'português', 'pt'],
+            'chinese': ['chinese', 'mandarin', 'zh'],
+            'japanese': ['japanese', 'ja'],
+            'korean': ['korean', 'ko'],
+            'arabic': ['arabic', 'ar'],
+            'russian': ['russian', 'ru']
+        }
+        
+        for lang_variants in language_mappings.values():
+            if answer_lower in lang_variants:
+                for option in valid_options:
+                    if any(variant in option.lower() for variant in lang_variants):
+                        corrected_answer = option
+                        break
+                if corrected_answer:
+                    break
+    
+    # General partial matching
+    if not corrected_answer:
+        for option in valid_options:
+            if option.lower() != 'select...' and answer_lower in option.lower():
+                corrected_answer = option
+                break
+    
+    if corrected_answer:
+        print(f"   ✅ Corrected to: '{corrected_answer}'")
+    else:
+        print(f"   ❌ No match found, set to null (will be skipped)")
+    return corrected_answer
+
+@app.post("/ai/analyze-form")
+async def analyze_form_with_ollama(request: dict, http_request: Request = None,
+                                   current_user: Optional[User] = Depends(get_optional_user)):
+    """
+    Analyze job application form using Ollama AI
+    Bypasses Chrome extension CORS restrictions
+    """
+    try:
+        # Database lookups and commits; off the event loop so other streams keep flowing
+        prepared = await run_in_threadpool(prepare_form_analysis, request, current_user.id if current_user else None)
+        prompt = prepared["prompt"]
+        clean_form = prepared["clean_form"]
+        semantic_mapping = prepared["semantic_mapping"]
+        
+        if prompt is None:
+            print("⚡ Every field answered from the profile, cache or answer memory - no Ollama call needed")
+            return {"success": True, "answers": prepared["resolved"], "memory_questions": prepared["memory_questions"]}
+        
         # Ensure Ollama is running before calling API
         print("🤖 Ensuring Ollama service is running...")
-        if not start_ollama_service():
+        if not await ensure_ollama_running():
             raise HTTPException(status_code=503, detail="Ollama service is not available. Please ensure Ollama is installed and running.")
 
         # Call Ollama API
-        import requests
         print("🧠 Backend: Calling Ollama API...")
         print("=" * 80)
         print("📋 EXACT PROMPT SENT TO OLLAMA:")
@@ -2003,91 +2336,33 @@ ONLY return the JSON object - no explanations:"""
             print("🧠 Backend: Starting Ollama API call...")
             start_time = time.time()
             
-            ollama_response = requests.post(
-                'http://localhost:11434/api/generate',
-                json={
-                    'model': 'llama3.2',
-                    'prompt': prompt,
-                    'stream': False
-                },
-                timeout=120
-            )
+            # Awaited on the event loop (other requests keep being served); abandoned if the extension disconnects.
+            # The answer is constrained to the form's schema, so it parses without repair
+            generation = ollama_client.complete_json(prompt, prepared["schema"], task="form_analysis")
+            if http_request is not None:
+                answers = await cancel_on_disconnect(generation, http_request.is_disconnected)
+            else:
+                answers = await generation
             
             end_time = time.time()
             print(f"🧠 Backend: Ollama API call completed in {end_time - start_time:.2f} seconds")
             
-        except requests.exceptions.Timeout as e:
-            print(f"🧠 Backend: ❌ Ollama API timeout after 120 seconds")
+        except LLMTimeoutError as e:
+            print(f"🧠 Backend: ❌ {e}")
             raise HTTPException(status_code=500, detail="Ollama AI service timed out. Please try again with a simpler form or check if Ollama is running properly.")
-        except requests.exceptions.RequestException as e:
+        except LLMUnavailableError as e:
             print(f"🧠 Backend: ❌ Ollama API connection error: {e}")
             raise HTTPException(status_code=500, detail=f"Ollama AI service connection error: {str(e)}")
+        except LLMError as e:
+            print(f"🧠 Backend: ❌ {e}")
+            raise HTTPException(status_code=500, detail=str(e))
         
-        if ollama_response.status_code != 200:
-            raise HTTPException(status_code=500, detail=f"Ollama API error: {ollama_response.status_code}")
-        
-        ollama_data = ollama_response.json()
-        raw_response = ollama_data.get('response', '')
         print("=" * 80)
-        print("🤖 EXACT OLLAMA RESPONSE:")
+        print("🤖 OLLAMA ANSWERS:")
         print("=" * 80)
-        print(raw_response)
+        print(json.dumps(answers, indent=2))
         print("=" * 80)
         
-        # Enhanced JSON parsing - properly extract complete JSON objects
-        try:
-            # Try to parse the entire response as JSON first
-            answers = json.loads(raw_response.strip())
-            print(f"🧠 ✅ Direct JSON parse successful: {type(answers)} with {len(answers)} fields")
-        except json.JSONDecodeError:
-            # Fallback: Extract complete JSON object using brace counting
-            import re
-            
-            # Find the start of the JSON object
-            json_start = raw_response.find('{')
-            if json_start == -1:
-                print(f"🧠 ❌ No opening brace found in response: {raw_response[:500]}...")
-                raise HTTPException(status_code=500, detail="No JSON object found in Ollama response")
-            
-            # Count braces to find the complete JSON object
-            brace_count = 0
-            json_end = json_start
-            in_string = False
-            escaped = False
-            
-            for i, char in enumerate(raw_response[json_start:], json_start):
-                if not escaped:
-                    if char == '"' and not in_string:
-                        in_string = True
-                    elif char == '"' and in_string:
-                        in_string = False
-                    elif not in_string:
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                json_end = i + 1
-                                break
-                
-                escaped = (char == '\\' and not escaped)
-            
-            if brace_count != 0:
-                print(f"🧠 ❌ Unmatched braces in JSON response: {raw_response[:500]}...")
-                raise HTTPException(status_code=500, detail="Malformed JSON in Ollama response")
-            
-            # Extract and parse the complete JSON
-            json_text = raw_response[json_start:json_end]
-            try:
-                answers = json.loads(json_text)
-                print(f"🧠 ✅ Brace-counted JSON parse successful: {type(answers)} with {len(answers)} fields")
-                print(f"🧠 📄 Extracted JSON length: {len(json_text)} characters")
-            except json.JSONDecodeError as e:
-                print(f"🧠 ❌ JSON parse failed: {e}")
-                print(f"🧠 Attempted to parse {len(json_text)} chars: {json_text[:500]}...")
-                print(f"🧠 Full JSON text: {json_text}")
-                raise HTTPException(status_code=500, detail=f"Failed to parse JSON: {str(e)}")
-        
         # Map semantic field names back to HTML field IDs
         html_answers = {}
         for semantic_name, answer in answers.items():
@@ -2097,8 +2372,8 @@ ONLY return the JSON object - no explanations:"""
             else:
                 print(f"⚠️ Semantic field '{semantic_name}' not found in mapping")
         
-        # Replace answers with mapped HTML field IDs
-        answers = html_answers
+        # Replace answers with mapped HTML field IDs, plus the fields resolved from the profile
+        answers = {**prepared["resolved"], **html_answers}
         
         # Validate that we got answers for expected fields
         expected_fields = [field.get("id") or field.get("name") for field in clean_form]
@@ -2138,94 +2413,7 @@ ONLY return the JSON object - no explanations:"""
                         "question": field.get("question", "")
                     })
                     
-                    # AUTO-CORRECT: Try to find best match
-                    print(f"🔧 AUTO-CORRECTING dropdown violation for '{field_id}':")
-                    print(f"   Question: {field.get('question', '')}")
-                    print(f"   Bad answer: '{answer}'")
-                    print(f"   Using {len(valid_options)} validation options: {valid_options[:10]}{'...' if len(valid_options) > 10 else ''}")
-                    
-                    # Smart matching based on common patterns
-                    corrected_answer = None
-                    answer_lower = str(answer).lower()
-                    question_lower = field.get('question', '').lower()
-                    
-                    # Special handling for visa/sponsorship questions
-                    if 'visa' in question_lower or 'sponsor' in question_lower:
-                        if 'no' in answer_lower or answer_lower == 'usa' or answer_lower == 'us':
-                            # User probably doesn't need sponsorship
-                            for option in valid_options:
-                                if 'no' in option.lower() and ('visa' in option.lower() or 'sponsor' in option.lower()):
-                                    corrected_answer = option
-                                    break
-                        elif 'yes' in answer_lower:
-                            # User needs sponsorship
-                            for option in valid_options:
-                                if 'yes' in option.lower() and 'sponsor' in option.lower():
-                                    corrected_answer = option
-                                    break
-                    
-                    # Special handling for country/nationality questions
-                    elif 'nationality' in question_lower or 'country' in question_lower:
-                        # Map common country codes/names
-                        country_mappings = {
-                            'usa': ['united states', 'america', 'usa', 'us'],
-                            'uk': ['united kingdom', 'britain', 'uk', 'england'],
-                            'spain': ['spain', 'spanish'],
-                            'france': ['france', 'french'],
-                            'germany': ['germany', 'german'],
-                            'canada': ['canada', 'canadian'],
-                            'australia': ['australia', 'australian']
-                        }
-                        
-                        for country_group in country_mappings.values():
-                            if answer_lower in country_group:
-                                for option in valid_options:
-                                    if any(country in option.lower() for country in country_group):
-                                        corrected_answer = option
-                                        break
-                                if corrected_answer:
-                                    break
-                    
-                    # Special handling for language questions
-                    elif 'language' in question_lower:
-                        # Map common language names
-                        language_mappings = {
-                            'english': ['english', 'en'],
-                            'spanish': ['spanish', 'español', 'es'],
-                            'french': ['french', 'français', 'fr'],
-                            'german': ['german', 'deutsch', 'de'],
-                            'italian': ['italian', 'italiano', 'it'],
-                            'portuguese': ['portuguese', 'português', 'pt'],
-                            'chinese': ['chinese', 'mandarin', 'zh'],
-                            'japanese': ['japanese', 'ja'],
-                            'korean': ['korean', 'ko'],
-                            'arabic': ['arabic', 'ar'],
-                            'russian': ['russian', 'ru']
-                        }
-                        
-                        for lang_variants in language_mappings.values():
-                            if answer_lower in lang_variants:
-                                for option in valid_options:
-                                    if any(variant in option.lower() for variant in lang_variants):
-                                        corrected_answer = option
-                                        break
-                                if corrected_answer:
-                                    break
-                    
-                    # General partial matching
-                    if not corrected_answer:
-                        for option in valid_options:
-                            if option.lower() != 'select...' and answer_lower in option.lower():
-                                corrected_answer = option
-                                break
-                    
-                    # If still no match, set to null
-                    if corrected_answer:
-                        answers[field_id] = corrected_answer
-                        print(f"   ✅ Corrected to: '{corrected_answer}'")
-                    else:
-                        answers[field_id] = None
-                        print(f"   ❌ No match found, set to null (will be skipped)")
+                    answers[field_id] = correct_dropdown_answer(field, answer, valid_options)
         
         if dropdown_violations:
             print("❌ DROPDOWN VIOLATIONS:")
@@ -2238,11 +2426,101 @@ ONLY return the JSON object - no explanations:"""
         print(json.dumps(answers, indent=2))
         print("=" * 80)
         
-        return {"success": True, "answers": answers}
+        cache_form_answers(prepared, answers)
+        return {"success": True, "answers": answers, "memory_questions": prepared["memory_questions"]}
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Backend: Ollama analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.post("/ai/analyze-form/stream")
+async def analyze_form_stream(request: dict, current_user: Optional[User] = Depends(get_optional_user)):
+    """
+    Streaming variant of /ai/analyze-form (NDJSON, one event per line):
+      {"type": "start", "fields": N, "memory_questions": {"<html id>": "question", ...}}
+      {"type": "answer", "field_id": "<html id>", "source": "profile|cache|memory", "value": ...}  for fields answered without the LLM
+      {"type": "answer", "field_id": "<html id>", "semantic_name": "...", "source": "llm", "value": ...}  as soon as each LLM answer is complete
+      {"type": "done", "answers": {...}, "missing_fields": [...], "elapsed_seconds": ...}  or {"type": "error", ...}
+    """
+    # Database lookups and commits; off the event loop so other streams keep flowing
+    prepared = await run_in_threadpool(prepare_form_analysis, request, current_user.id if current_user else None)
+    
+    if prepared["prompt"] is not None and not await ensure_ollama_running():
+        raise HTTPException(status_code=503, detail="Ollama service is not available. Please ensure Ollama is installed and running.")
+    
+    return StreamingResponse(stream_form_answers(prepared), media_type="application/x-ndjson")
+
+async def stream_form_answers(prepared: dict):
+    """Parse Ollama's streamed output incrementally and emit each field answer once it is complete"""
+    clean_form = prepared["clean_form"]
+    semantic_mapping = prepared["semantic_mapping"]
+    fields_by_id = {field.get("id") or field.get("name"): field for field in clean_form}
+    start_time = time.time()
+    
+    def event(payload: dict) -> str:
+        return json.dumps(payload) + "\n"
+    
+    yield event({"type": "start", "fields": len(clean_form), "resolved": len(prepared["resolved"]),
+                 "memory_questions": prepared["memory_questions"]})
+    
+    # Answers from the profile, cache and answer memory are known before the LLM starts
+    answers = dict(prepared["resolved"])
+    for html_field_id, answer in answers.items():
+        yield event({"type": "answer", "field_id": html_field_id, "source": prepared["sources"][html_field_id], "value": answer})
+    
+    if prepared["prompt"] is not None:
+        parser = JsonObjectStream()
+        output_mode = ollama_client.output_mode(prepared["schema"])
+        try:
+            # The client disconnecting cancels this generator, which closes the Ollama stream
+            stream = ollama_client.generate_stream(prepared["prompt"], format=ollama_client.output_format(prepared["schema"]))
+            async with aclosing(stream) as chunks:
+                async for chunk in chunks:
+                    for semantic_name, answer in parser.feed(chunk):
+                        html_field_id = semantic_mapping.get(semantic_name)
+                        if html_field_id is None:
+                            print(f"⚠️ Semantic field '{semantic_name}' not found in mapping")
+                            continue
+                    
+                        # Same dropdown auto-correction as the non-streaming endpoint
+                        field = fields_by_id.get(html_field_id, {})
+                        if field.get("type") in ["select", "text_from_dropdown"]:
+                            valid_options = field.get("all_options") or field.get("options") or field.get("sample_options", [])
+                            if answer is not None and valid_options and answer not in valid_options:
+                                answer = correct_dropdown_answer(field, answer, valid_options)
+                    
+                        answers[html_field_id] = answer
+                        if len(answers) == len(prepared["resolved"]) + 1:
+                            print(f"🧠 Backend: First streamed answer after {time.time() - start_time:.2f} seconds")
+                        yield event({"type": "answer", "field_id": html_field_id, "semantic_name": semantic_name,
+                                     "source": "llm", "value": answer})
+                
+                    if parser.done:
+                        break  # Ignore any explanation the model adds after the object
+            
+                if not parser.done:
+                    parser.close()
+            ollama_client.json_outputs.record("form_analysis_stream", output_mode, "parsed")
+        except (LLMError, ValueError) as e:
+            if isinstance(e, ValueError):
+                ollama_client.json_outputs.record("form_analysis_stream", output_mode, "failed")
+            print(f"🧠 Backend: ❌ Streaming analysis failed: {e}")
+            yield event({"type": "error", "detail": str(e), "answers": answers})
+            return
+    
+    missing_fields = [field_id for field_id in fields_by_id if field_id not in answers]
+    if missing_fields:
+        print(f"⚠️ MISSING FIELDS: {missing_fields}")
+    print(f"🧠 Backend: Streamed {len(answers)} answers in {time.time() - start_time:.2f} seconds")
+    cache_form_answers(prepared, answers)
+    yield event({
+        "type": "done",
+        "answers": answers,
+        "missing_fields": missing_fields,
+        "elapsed_seconds": round(time.time() - start_time, 2)
+    })
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,7 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean
-from sqlalchemy.orm import relationship
+import hashlib
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float, UniqueConstraint, Index, inspect, text
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from database import Base
+from job_links import canonical_job_key, LINK_KEY_VERSION
+
+# Scraped fields that make up a job's content hash (link identifies the job, timestamps change every scrape)
+JOB_CONTENT_FIELDS = ('title', 'company', 'location', 'description', 'platform',
+                      'job_type', 'work_type', 'experience_level', 'salary_range')
+
+def job_content_hash(job: dict) -> str:
+    """Stable hash of a scraped job's content, used to skip rewriting unchanged rows"""
+    content = '\x1f'.join(str(job.get(field) or '').strip() for field in JOB_CONTENT_FIELDS)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
 
 class User(Base):
     __tablename__ = "users"
@@ -63,6 +74,7 @@ class Job(Base):
     location = Column(String)
     description = Column(Text)
     link = Column(String, unique=True, nullable=False)
+    link_key = Column(String, unique=True, index=True)  # canonical_job_key(link); use this for lookups
     platform = Column(String, index=True)  # "Ashby", "Greenhouse", "Lever", etc.
     
     # Additional metadata
@@ -74,8 +86,26 @@ class Job(Base):
     fetched_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Change detection and expiry
+    content_hash = Column(String)  # job_content_hash() of the last scraped version
+    closed_at = Column(DateTime(timezone=True))  # Set when the posting disappears from its company's feed
+    
+    # Link liveness (see link_checker.py); dead links also get closed_at
+    link_status = Column(String)  # "alive", "dead" or None if never checked
+    link_checked_at = Column(DateTime(timezone=True))
+    
     # Relationships
     applications = relationship("Application", back_populates="job")
+    
+    @validates('link')
+    def _set_link_key(self, key, link):
+        self.link_key = canonical_job_key(link)
+        return link
+    
+    __table_args__ = (
+        # Search only ever looks at open jobs, newest first
+        Index('ix_jobs_open_fetched_at', 'fetched_at', sqlite_where=text('closed_at IS NULL')),
+    )
 
 class Application(Base):
     __tablename__ = "applications"
@@ -104,6 +134,22 @@ class Application(Base):
     job = relationship("Job", back_populates="applications")
     profile = relationship("Profile")
 
+class SavedAnswer(Base):
+    __tablename__ = "saved_answers"
+    __table_args__ = (UniqueConstraint("user_id", "question_key"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    question_key = Column(String, nullable=False)  # answer_memory.question_key(question)
+    question = Column(Text, nullable=False)  # As last asked
+    answer = Column(JSON)
+    field_type = Column(String)
+    source = Column(String)  # "submitted" (from a form the user submitted) or "user" (saved or corrected by the user)
+    
+    hits = Column(Integer, default=0)  # Questions answered from this entry
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Eviction order
+
 class Company(Base):
     __tablename__ = "companies"
     
@@ -112,4 +158,135 @@ class Company(Base):
     url = Column(String)
     job_count = Column(Integer, default=0)
     last_scraped = Column(DateTime(timezone=True), server_default=func.now())
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ScrapeRun(Base):
+    __tablename__ = "scrape_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(String, nullable=False, index=True)  # Groups the companies of one scraper run
+    platform = Column(String, index=True)
+    company = Column(String, nullable=False, index=True)
+    url = Column(String)
+    status = Column(String)  # "success_with_jobs", "success_no_jobs", "error_http_404", ...
+    method = Column(String)  # "api", "ajax", "html", ...
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    
+    # Timing
+    wall_seconds = Column(Float, default=0.0)
+    parse_seconds = Column(Float, default=0.0)
+    
+    # HTTP
+    requests = Column(Integer, default=0)
+    request_errors = Column(Integer, default=0)  # Connection errors and timeouts
+    bytes_received = Column(Integer, default=0)
+    status_codes = Column(JSON, default=dict)  # {"200": 3, "429": 1}
+    
+    # Jobs
+    jobs_found = Column(Integer, default=0)
+    jobs_new = Column(Integer, default=0)
+    jobs_updated = Column(Integer, default=0)
+    jobs_duplicate = Column(Integer, default=0)
+    
+    error = Column(Text)
+
+class ScrapeStrategy(Base):
+    __tablename__ = "scrape_strategies"
+    __table_args__ = (UniqueConstraint("platform", "company", "strategy"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    platform = Column(String, nullable=False, index=True)
+    company = Column(String, nullable=False)
+    strategy = Column(String, nullable=False)  # "direct_career_page", "adp_variants", ...
+    url = Column(String)  # URL that last worked for this strategy
+    
+    succeeded = Column(Boolean, default=False)
+    job_count = Column(Integer, default=0)
+    failures = Column(Integer, default=0)  # Consecutive failures; drives the recheck backoff
+    last_checked = Column(DateTime(timezone=True))
+    next_check_at = Column(DateTime(timezone=True))  # Skip this strategy until then
+
+class SchemaMeta(Base):
+    __tablename__ = "schema_meta"
+    
+    key = Column(String, primary_key=True)  # e.g. "link_key_version"
+    value = Column(String)
+
+def get_meta(conn, key: str):
+    row = conn.execute(text('SELECT value FROM schema_meta WHERE key = :key'), {'key': key}).first()
+    return row[0] if row else None
+
+def set_meta(conn, key: str, value):
+    conn.execute(text('DELETE FROM schema_meta WHERE key = :key'), {'key': key})
+    conn.execute(text('INSERT INTO schema_meta (key, value) VALUES (:key, :value)'), {'key': key, 'value': str(value)})
+
+def migrate_schema(engine):
+    """
+    Create missing tables, then add the columns and indexes that databases
+    created by older versions of these models are missing
+    """
+    Base.metadata.create_all(bind=engine)
+    
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+        
+        backfill_link_keys(conn)
+    
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def backfill_link_keys(conn):
+    """
+    Fill jobs.link_key for rows stored without one; later duplicates of a key stay NULL.
+    When LINK_KEY_VERSION changed since the last run, every row is re-keyed once instead
+    """
+    if get_meta(conn, 'link_key_version') != str(LINK_KEY_VERSION):
+        rekey_links(conn)
+        set_meta(conn, 'link_key_version', LINK_KEY_VERSION)
+        return
+    
+    missing = conn.execute(text('SELECT id, link FROM jobs WHERE link_key IS NULL ORDER BY id')).fetchall()
+    candidates = {}
+    for job_id, link in missing:
+        link_key = canonical_job_key(link)
+        if link_key:
+            candidates.setdefault(link_key, job_id)
+    if not candidates:
+        return
+    
+    keys = list(candidates)
+    taken = set()
+    for start in range(0, len(keys), 500):
+        chunk = {f'k{i}': key for i, key in enumerate(keys[start:start + 500])}
+        placeholders = ', '.join(f':{name}' for name in chunk)
+        taken.update(row[0] for row in conn.execute(text(f'SELECT link_key FROM jobs WHERE link_key IN ({placeholders})'), chunk))
+    updates = [{'id': job_id, 'link_key': link_key} for link_key, job_id in candidates.items() if link_key not in taken]
+    if updates:
+        conn.execute(text('UPDATE jobs SET link_key = :link_key WHERE id = :id'), updates)
+
+def rekey_links(conn):
+    """Recompute every job's link_key with the current canonical_job_key(); later duplicates of a key become NULL"""
+    rows = conn.execute(text('SELECT id, link, link_key FROM jobs ORDER BY id')).fetchall()
+    changed = [(job_id, link) for job_id, link, link_key in rows if link_key is None or link_key != canonical_job_key(link)]
+    if not changed:
+        return
+    
+    changed_ids = {job_id for job_id, _ in changed}
+    taken = {link_key for job_id, _, link_key in rows if link_key is not None and job_id not in changed_ids}
+    updates = []
+    for job_id, link in changed:
+        link_key = canonical_job_key(link)
+        if link_key and link_key not in taken:
+            taken.add(link_key)
+            updates.append({'id': job_id, 'link_key': link_key})
+    # Clear first so a key can move between rows without tripping the unique index
+    conn.execute(text('UPDATE jobs SET link_key = NULL WHERE id = :id'), [{'id': job_id} for job_id in changed_ids])
+    if updates:
+        conn.execute(text('UPDATE jobs SET link_key = :link_key WHERE id = :id'), updates)
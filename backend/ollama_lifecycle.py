@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Ollama lifecycle manager
+Request handlers used to health-check Ollama over HTTP on every form analysis
+and, when it was down, spawn `ollama serve` and sleep-poll up to 15 seconds per
+candidate binary inside the request. The first request after boot then also
+paid for loading the model. The manager now runs from the application lifespan:
+- at boot it verifies Ollama (starting it if needed) and warms the model
+  with a one-token generation, in the background so the API is up meanwhile
+- every OLLAMA_HEALTH_INTERVAL seconds it re-checks the server, restarts it
+  (with backoff) if it went away and re-warms the model if it was unloaded
+- request paths only read the cached status (available()); an unhealthy
+  status wakes the health check early so a recovered server is noticed at once
+Every call also sends keep_alive (OLLAMA_KEEP_ALIVE), so the model stays loaded
+between requests.
+
+Configuration (environment):
+    OLLAMA_AUTOSTART        start `ollama serve` when it is not running (1/0), default 1
+    OLLAMA_BINARY           ollama executable to try first (then the usual install paths)
+    OLLAMA_START_TIMEOUT    seconds to wait for a started server, default 15
+    OLLAMA_HEALTH_INTERVAL  seconds between background health checks, default 30
+    OLLAMA_WARMUP           load and warm the model at boot and after unloads (1/0), default 1
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from llm_client import ollama_client, OllamaClient, LLMError, PRIORITY_PREGENERATION
+
+def _flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() not in ("0", "false", "no")
+
+OLLAMA_AUTOSTART = _flag("OLLAMA_AUTOSTART", "1")
+OLLAMA_START_TIMEOUT = float(os.getenv("OLLAMA_START_TIMEOUT", "15"))
+OLLAMA_HEALTH_INTERVAL = float(os.getenv("OLLAMA_HEALTH_INTERVAL", "30"))
+OLLAMA_WARMUP = _flag("OLLAMA_WARMUP", "1")
+
+# Where `ollama` is usually installed, tried in order
+OLLAMA_BINARIES = [
+    path for path in (
+        os.getenv("OLLAMA_BINARY"),
+        "/home/alexxvives/ollama/bin/ollama",  # Custom installation path
+        "/usr/local/bin/ollama",              # Standard Linux path
+        "/opt/homebrew/bin/ollama",           # macOS Homebrew path
+        "ollama"                              # System PATH
+    ) if path
+]
+
+def model_matches(name: str, model: str) -> bool:
+    """'llama3.2:latest' is the model configured as 'llama3.2'"""
+    return name == model or (':' not in model and name == f"{model}:latest")
+
+class OllamaLifecycle:
+    """Starts, warms and health-checks Ollama in the background; request paths read its cached status"""
+
+    def __init__(self, client: OllamaClient = ollama_client, autostart: bool = OLLAMA_AUTOSTART,
+                 warmup: bool = OLLAMA_WARMUP, health_interval: float = OLLAMA_HEALTH_INTERVAL,
+                 start_timeout: float = OLLAMA_START_TIMEOUT, binaries: List[str] = None):
+        self.client = client
+        self.autostart = autostart
+        self.warmup = warmup
+        self.health_interval = health_interval
+        self.start_timeout = start_timeout
+        self.binaries = binaries if binaries is not None else OLLAMA_BINARIES
+        self.state = 'not_started'  # not_started -> starting -> warming -> ready / unavailable -> stopped
+        self.healthy = False
+        self.model_loaded: Optional[bool] = None
+        self.failures = 0
+        self.last_check: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.warmup_seconds: Optional[float] = None
+        self.process: Optional[subprocess.Popen] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    async def start(self):
+        """Begin the boot sequence and background health checks (returns immediately)"""
+        if self._task is not None:
+            return
+        self._wake = asyncio.Event()
+        self.state = 'starting'
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop health-checking; a server started here keeps running (it is detached, as before)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.state = 'stopped'
+
+    def available(self) -> bool:
+        """
+        Cached health for request paths; an unhealthy status triggers an early re-check.
+        Before start() (no lifespan, e.g. scripts) nothing is known and calls are let through;
+        they fail fast with LLMUnavailableError if Ollama is down.
+        """
+        if self._task is None:
+            return True
+        if not self.healthy:
+            self._wake.set()
+        return self.healthy
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'healthy': self.healthy,
+            'model': self.client.model,
+            'model_loaded': self.model_loaded,
+            'keep_alive': self.client.keep_alive,
+            'started_pid': self.process.pid if self.process is not None and self.process.poll() is None else None,
+            'consecutive_failures': self.failures,
+            'last_check': self.last_check.isoformat() if self.last_check else None,
+            'last_error': self.last_error,
+            'warmup_seconds': self.warmup_seconds
+        }
+
+    async def _run(self):
+        boot = True
+        while True:
+            try:
+                await self.check(boot=boot)
+            except Exception as e:  # Keep checking whatever one pass ran into
+                self.last_error = str(e)
+                print(f"🤖 ❌ Ollama health check failed: {e}")
+            boot = False
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def check(self, boot: bool = False):
+        """One health pass: (re)start the server if it is down, (re)warm the model if it is not loaded"""
+        self.last_check = datetime.now()
+        running = await self.client.is_running()
+        if not running:
+            self.failures += 1
+            if self.healthy or boot:
+                print(f"🤖 ⚠️ Ollama is not reachable at {self.client.base_url}")
+            self.healthy = False
+            self.state = 'unavailable'
+            # Restart attempts back off: 1st, 2nd, 4th, 8th... failed check
+            if self.autostart and self.failures & (self.failures - 1) == 0:
+                running = await self.start_server()
+            if not running:
+                return
+
+        if not self.healthy and not boot:
+            print(f"🤖 ✅ Ollama is reachable again at {self.client.base_url}")
+        self.healthy = True
+        self.failures = 0
+        self.last_error = None
+
+        loaded_models = await self.client.loaded_models()
+        self.model_loaded = None if loaded_models is None else any(model_matches(name, self.client.model) for name in loaded_models)
+        if self.warmup and (boot or self.model_loaded is False):
+            await self.warm_up()
+        else:
+            self.state = 'ready'
+
+    async def start_server(self) -> bool:
+        """Spawn `ollama serve` from the first binary that exists and wait for it to answer"""
+        for binary in self.binaries:
+            executable = shutil.which(binary)
+            if executable is None:
+                continue
+            print(f"🤖 Starting Ollama: {executable} serve")
+            try:
+                # Popen returns at once; detached so the server outlives this app, as before
+                self.process = subprocess.Popen([executable, "serve"], stdout=subprocess.DEVNULL,
+                                                stderr=subprocess.DEVNULL, start_new_session=True)
+            except OSError as e:
+                print(f"🤖 ❌ Could not start {executable}: {e}")
+                continue
+
+            deadline = time.monotonic() + self.start_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.5)
+                if await self.client.is_running():
+                    print(f"🤖 ✅ Ollama started ({executable}, pid {self.process.pid})")
+                    return True
+                if self.process.poll() is not None:
+                    break  # Exited (e.g. the port is taken by something else); try the next binary
+            print(f"🤖 ❌ Ollama did not start from {executable}")
+
+        self.last_error = "Ollama is not running and could not be started"
+        return False
+
+    async def warm_up(self):
+        """Load the model and run a one-token generation so the first real request starts generating at once"""
+        self.state = 'warming'
+        start = time.perf_counter()
+        try:
+            await self.client.generate("Hi", options={'num_predict': 1}, priority=PRIORITY_PREGENERATION)
+        except LLMError as e:
+            self.last_error = f"Warm-up failed: {e}"
+            self.state = 'ready'  # The server answers; the first request will load the model itself
+            print(f"🤖 ⚠️ Ollama warm-up of {self.client.model} failed: {e}")
+            return
+        self.warmup_seconds = round(time.perf_counter() - start, 2)
+        self.model_loaded = True
+        self.state = 'ready'
+        print(f"🤖 🔥 {self.client.model} loaded and warmed in {self.warmup_seconds:.2f}s (keep_alive {self.client.keep_alive})")
+
+# Started and stopped by the application lifespan
+ollama_lifecycle = OllamaLifecycle()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted form prompts
+Prompt evaluation dominates form-analysis latency on CPU-only Ollama hosts, and
+the prompt used to embed the whole profile (indented JSON with every role
+description, skill and achievement) plus the full job description. Prompts are
+now fitted to FORM_PROMPT_TOKEN_BUDGET:
+- only the profile sections the remaining questions need are included
+  (contact and location always; work history, education, skills, languages,
+  preferences and links when a question asks about them or is open-ended)
+- compact JSON without indentation
+- recent roles keep a shortened description, older roles become one line
+- detail is dropped level by level until the profile fits its share; the job
+  description gets what is left, cut at a sentence boundary
+Compacted profiles are cached per (profile version, sections), so repeated
+forms skip the work.
+
+Tokens are estimated at ~4 characters each (no tokenizer dependency); the
+budget is a target, not an exact limit.
+
+Configuration (environment):
+    FORM_PROMPT_TOKEN_BUDGET  estimated tokens for the whole prompt, default 3000
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Tuple
+
+FORM_PROMPT_TOKEN_BUDGET = int(os.getenv("FORM_PROMPT_TOKEN_BUDGET", "3000"))
+CHARS_PER_TOKEN = 4
+COMPACT_CACHE_SIZE = 256
+MIN_JOB_DESCRIPTION_TOKENS = 150  # Below this a truncated description is more noise than context
+
+# Profile keys (from extract_user_data_from_profile) grouped into sections
+PROFILE_SECTIONS = {
+    "contact": ["first_name", "last_name", "full_name", "email", "phone", "gender"],
+    "location": ["address", "city", "state", "zip_code", "country", "citizenship"],
+    "work": ["current_company", "current_title", "years_of_experience", "total_work_experience", "work_experience"],
+    "education": ["highest_degree", "school", "gpa", "education"],
+    "skills": ["skills", "certificates", "achievements"],
+    "languages": ["languages"],
+    "preferences": ["preferred_location", "willing_to_relocate", "remote_preference", "current_salary",
+                    "expected_salary", "notice_period", "visa_requirement", "driving_license"],
+    "links": ["linkedin", "github", "portfolio"],
+    "resume": ["resume_path"]
+}
+ALWAYS_INCLUDED = ("contact", "location")
+
+# Question keywords that need a section
+SECTION_QUESTIONS = {
+    "work": re.compile(r'experien|employ|compan|worked|work history|job title|current title|role|position|years of|manag|industr', re.I),
+    "education": re.compile(r'degree|school|universit|college|educat|gpa|graduat|major|stud', re.I),
+    "skills": re.compile(r'skill|certif|licen|technolog|tool|proficien|framework|programming|achiev|accomplish|award', re.I),
+    "languages": re.compile(r'language|speak|fluen|bilingual', re.I),
+    "preferences": re.compile(r'salary|compensation|pay|notice|start|availab|relocat|remote|hybrid|office|'
+                              r'visa|sponsor|authori|citizen|driv|licen|travel', re.I),
+    "links": re.compile(r'linkedin|github|portfolio|website|url|link|profile', re.I)
+}
+OPEN_ENDED_SECTIONS = ("work", "education", "skills")
+
+# Detail levels, most to least detailed: (full roles, role description chars, skills, achievements, certificates)
+DETAIL_LEVELS = [
+    (3, 600, 40, 5, 10),
+    (2, 300, 25, 3, 5),
+    (1, 150, 15, 0, 3),
+    (0, 0, 10, 0, 0)
+]
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def compact_json(data) -> str:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def shorten(text: str, limit: int) -> str:
+    """Cut text to about limit characters at a word boundary"""
+    text = re.sub(r'\s+', ' ', str(text or '')).strip()
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(' ', 1)[0] + '…'
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Cut text to about tokens at a sentence boundary (word boundary if no sentence ends in range)"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    sentence_end = max(cut.rfind('. '), cut.rfind('.\n'), cut.rfind('\n\n'))
+    if sentence_end > limit // 2:
+        return cut[:sentence_end + 1].rstrip() + ' […]'
+    return cut.rsplit(' ', 1)[0] + ' […]'
+
+def needed_sections(llm_form: List[Dict[str, Any]], open_ended: bool) -> Tuple[str, ...]:
+    """Profile sections the form's questions (the ones left for the LLM) refer to"""
+    sections = set(ALWAYS_INCLUDED)
+    if open_ended:
+        sections.update(OPEN_ENDED_SECTIONS)
+    for field in llm_form:
+        text = f"{field.get('question', '')} {field.get('id', '')}"
+        sections.update(name for name, pattern in SECTION_QUESTIONS.items() if pattern.search(text))
+        if field.get("type") == "file":
+            sections.add("resume")
+    return tuple(name for name in PROFILE_SECTIONS if name in sections)
+
+def date_range(entry: Dict[str, Any]) -> str:
+    start, end = entry.get("start_date"), entry.get("end_date")
+    if not start and not end:
+        return ""
+    return f"{start or '?'}–{end or 'present'}"
+
+def role_line(role: Dict[str, Any]) -> str:
+    """An older role as one line: "Title at Company (2018-01–2020-06)\""""
+    line = " at ".join(part for part in (role.get("title"), role.get("company")) if part)
+    dates = date_range(role)
+    return f"{line} ({dates})" if dates else line
+
+def item_name(item) -> str:
+    if isinstance(item, dict):
+        return item.get("name") or item.get("title") or ""
+    return str(item or "")
+
+def compact_profile(user_data: Dict[str, Any], sections: Tuple[str, ...], level: int) -> Dict[str, Any]:
+    """The profile reduced to the given sections at one detail level"""
+    full_roles, description_chars, max_skills, max_achievements, max_certificates = DETAIL_LEVELS[level]
+    keys = [key for section in sections for key in PROFILE_SECTIONS[section]]
+    profile = {key: user_data[key] for key in keys if user_data.get(key) not in (None, "", [], {})}
+
+    roles = profile.pop("work_experience", None)
+    if roles:
+        recent = []
+        for role in roles[:full_roles]:
+            entry = {key: role.get(key) for key in ("title", "company", "location") if role.get(key)}
+            if date_range(role):
+                entry["dates"] = date_range(role)
+            if description_chars and role.get("description"):
+                entry["description"] = shorten(role["description"], description_chars)
+            recent.append(entry)
+        if recent:
+            profile["recent_roles"] = recent
+        earlier = [role_line(role) for role in roles[full_roles:]]
+        if earlier:
+            profile["earlier_roles"] = earlier[:8]
+        # current_job_description duplicates the first role's description; never included
+
+    schools = profile.pop("education", None)
+    if schools:
+        profile["education"] = [
+            ", ".join(part for part in (school.get("degree"), school.get("school") or school.get("institution"),
+                                        date_range(school), f"GPA {school['gpa']}" if school.get("gpa") else None) if part)
+            for school in schools
+        ]
+
+    if profile.get("skills"):
+        profile["skills"] = [name for name in map(item_name, profile["skills"]) if name][:max_skills]
+    for key, limit in (("achievements", max_achievements), ("certificates", max_certificates)):
+        items = [name for name in map(item_name, profile.pop(key, None) or []) if name][:limit]
+        if items:
+            profile[key] = items
+    return profile
+
+class PromptBudget:
+    """Fits profile and job description into the form prompt's token budget, caching compacted profiles"""
+
+    def __init__(self, budget: int = FORM_PROMPT_TOKEN_BUDGET, max_cached: int = COMPACT_CACHE_SIZE):
+        self.budget = budget
+        self.max_cached = max_cached
+        self.compacted: 'OrderedDict[tuple, List[str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def profile_levels(self, user_data: Dict[str, Any], version: str, sections: Tuple[str, ...]) -> List[str]:
+        """The compacted profile JSON at every detail level, cached per (profile version, sections)"""
+        key = (version, sections)
+        with self._lock:
+            levels = self.compacted.get(key)
+            if levels is not None:
+                self.compacted.move_to_end(key)
+                return levels
+        levels = [compact_json(compact_profile(user_data, sections, level)) for level in range(len(DETAIL_LEVELS))]
+        with self._lock:
+            self.compacted[key] = levels
+            while len(self.compacted) > self.max_cached:
+                self.compacted.popitem(last=False)
+        return levels
+
+    def fit(self, user_data: Dict[str, Any], version: str, sections: Tuple[str, ...],
+            job_description: str, overhead: int) -> Tuple[str, str]:
+        """
+        (profile text, job description text) sharing the budget left after the prompt's fixed part
+        (overhead tokens). The job description is guaranteed up to half of it, the profile takes the most
+        detailed level that fits the rest, and the job description then gets whatever is left.
+        """
+        available = max(self.budget - overhead, 0)
+        job_tokens = estimate_tokens(job_description)
+        profile_share = available - min(job_tokens, available // 2)
+
+        levels = self.profile_levels(user_data, version, sections)
+        level = next((index for index, text in enumerate(levels) if estimate_tokens(text) <= profile_share), len(levels) - 1)
+        profile_text = levels[level]
+
+        job_share = available - estimate_tokens(profile_text)
+        if job_tokens > job_share:
+            job_description = truncate_to_tokens(job_description, job_share) if job_share >= MIN_JOB_DESCRIPTION_TOKENS else ""
+        print(f"✂️ Prompt budget {self.budget}: fixed {overhead}, profile {estimate_tokens(profile_text)} "
+              f"(level {level}, sections {', '.join(sections)}), job description {estimate_tokens(job_description)} of {job_tokens}")
+        return profile_text, job_description
+
+# Shared by the form-analysis endpoints
+prompt_budget = PromptBudget()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Content-addressed resume parse cache
+Uploading the same resume again (or re-parsing a saved one) used to re-extract
+the PDF/DOCX text and re-run the full LLM parse. Both results are now stored on
+disk, addressed by content:
+    text/<sha256 of the file bytes>.txt
+    parsed/<sha256 of (file hash, prompt version, model)>.json
+so an unchanged file skips both steps, while editing the parse prompt or
+switching models parses again.
+
+Configuration (environment):
+    RESUME_CACHE_DIR  default storage/resume_cache (next to storage/resumes)
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Optional
+
+RESUME_CACHE_DIR = os.getenv("RESUME_CACHE_DIR", os.path.join(os.getcwd(), "storage", "resume_cache"))
+
+def file_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+def prompt_version(prompt_template: str) -> str:
+    """Short digest of a prompt template; part of the parse key so prompt edits invalidate old parses"""
+    return hashlib.sha256(prompt_template.encode('utf-8')).hexdigest()[:16]
+
+class ResumeCache:
+    """Extracted text and parsed profiles on disk, keyed by content hashes"""
+
+    def __init__(self, directory: str = RESUME_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, kind: str, name: str) -> str:
+        return os.path.join(self.directory, kind, name)
+
+    def _read(self, path: str) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"⚠️ Resume cache: could not read {path}: {e}")
+            return None
+
+    def _write(self, path: str, data: str):
+        """Write through a temporary file so a crash never leaves a truncated entry"""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"⚠️ Resume cache: could not write {path}: {e}")
+
+    @staticmethod
+    def parse_key(content_hash: str, prompt: str, model: str) -> str:
+        return hashlib.sha256(f"{content_hash}\x1f{prompt}\x1f{model}".encode('utf-8')).hexdigest()
+
+    def get_text(self, content_hash: str) -> Optional[str]:
+        return self._read(self._path('text', f"{content_hash}.txt"))
+
+    def put_text(self, content_hash: str, text: str):
+        self._write(self._path('text', f"{content_hash}.txt"), text)
+
+    def get_profile(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self._read(self._path('parsed', f"{key}.json"))
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def put_profile(self, key: str, profile: Dict[str, Any]):
+        self._write(self._path('parsed', f"{key}.json"), json.dumps(profile, ensure_ascii=False))
+
+# Shared by every resume parse
+resume_cache = ResumeCache()
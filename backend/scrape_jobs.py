@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Background scrape jobs
+POST /jobs/fetch enqueues a scrape here instead of running it on the request
+path. Jobs run one at a time on a background thread (they share the database
+writer and per-host rate limits), and their live progress comes from the
+ScrapeOrchestrator that runs them.
+"""
+
+import queue
+import sys
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+# Reuse the scrapers' orchestrator and platform registry
+sys.path.append(str(Path(__file__).parent / "scrapers"))
+from shared_utils import load_platform_modules
+from scrape_all import ScrapeOrchestrator
+
+class ScrapeJob:
+    """One requested scrape: its scope, state and the orchestrator running it"""
+
+    def __init__(self, platforms: Optional[List[str]], companies: Optional[List[str]], requested_by: Optional[int]):
+        self.id = uuid.uuid4().hex[:12]
+        self.platforms = platforms
+        self.companies = companies
+        self.requested_by = requested_by
+        self.status = 'queued'
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.orchestrator = None
+        self.summary = None
+
+    @property
+    def scope(self) -> tuple:
+        return (tuple(sorted(self.platforms or ())), tuple(sorted(name.lower() for name in self.companies or ())))
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = self.orchestrator.progress() if self.orchestrator else None
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'platforms': self.platforms or 'all',
+            'companies': self.companies,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'progress': progress,
+            'errors': self.summary['errors'] if self.summary else {},
+            'error': self.error
+        }
+
+class ScrapeJobManager:
+    """Queue of background scrapes with progress lookups by job id"""
+
+    def __init__(self, max_history: int = 20, progress_interval: float = 30):
+        self.max_history = max_history
+        self.progress_interval = progress_interval
+        self.jobs: 'OrderedDict[str, ScrapeJob]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def platforms(self) -> List[str]:
+        """Registered platform names"""
+        return sorted(load_platform_modules())
+
+    def submit(self, platforms: List[str] = None, companies: List[str] = None,
+               requested_by: int = None) -> Tuple[ScrapeJob, bool]:
+        """
+        Enqueue a scrape of the given platforms (default all) and companies (default all); returns
+        (job, created) - an identical scrape that is still queued or running is returned instead of a duplicate
+        """
+        unknown = sorted(set(platforms or ()) - set(self.platforms()))
+        if unknown:
+            raise ValueError(f"Unknown platforms: {unknown} (registered: {self.platforms()})")
+
+        job = ScrapeJob(platforms or None, companies or None, requested_by)
+        with self._lock:
+            for existing in self.jobs.values():
+                if existing.active and existing.scope == job.scope:
+                    return existing, False
+            self.jobs[job.id] = job
+            self._trim_history()
+            self._ensure_worker()
+        self._queue.put(job)
+        print(f"📥 Scrape job {job.id} queued: platforms={job.platforms or 'all'}, companies={job.companies or 'all'}")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def recent(self) -> List[ScrapeJob]:
+        with self._lock:
+            return list(reversed(self.jobs.values()))
+
+    def _ensure_worker(self):
+        """Start the daemon worker on first use (call under the lock)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._work, name='scrape-jobs', daemon=True)
+            self._worker.start()
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.status == 'queued':
+                self._run(job)
+
+    def _run(self, job: ScrapeJob):
+        job.orchestrator = ScrapeOrchestrator(job.platforms, progress_interval=self.progress_interval,
+                                              company_names=job.companies)
+        job.status = 'running'
+        job.started_at = datetime.now()
+        try:
+            job.summary = job.orchestrator.run()
+            job.status = 'completed'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = str(e)
+            print(f"❌ Scrape job {job.id} failed: {e}")
+        finally:
+            job.finished_at = datetime.now()
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond max_history (call under the lock)"""
+        finished = [job_id for job_id, job in self.jobs.items() if not job.active]
+        for job_id in finished[:max(len(self.jobs) - self.max_history, 0)]:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker after the running scrape (if any)"""
+        with self._lock:
+            for job in self.jobs.values():
+                if job.status == 'queued':
+                    job.status = 'cancelled'
+        self._queue.put(None)
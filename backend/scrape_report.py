@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Scrape performance report
+Reads the per-company telemetry written to the scrape_runs table by every scraper run
+and lists the slowest, least productive and most failing targets
+
+Usage:
+    python scrape_report.py [--platform lever] [--days 30] [--limit 10]
+"""
+
+import argparse
+
+from database import SessionLocal, engine
+from models import migrate_schema
+from company_stats import get_scrape_performance_report
+
+def print_targets(title: str, targets: list):
+    print(f"\n{title}")
+    if not targets:
+        print("  (none)")
+        return
+    print(f"  {'Company':<28} {'Platform':<10} {'Runs':>4} {'Avg s':>7} {'Max s':>7} {'Parse s':>8} "
+          f"{'Reqs':>5} {'Errs':>4} {'KB':>8} {'Jobs':>5} {'New':>4} {'Jobs/req':>8} {'Fails':>5}")
+    for t in targets:
+        print(f"  {t['company'][:28]:<28} {(t['platform'] or '')[:10]:<10} {t['runs']:>4} "
+              f"{t['avg_wall_seconds']:>7.2f} {t['max_wall_seconds']:>7.2f} {t['avg_parse_seconds']:>8.3f} "
+              f"{t['requests']:>5} {t['request_errors']:>4} {t['bytes_received'] / 1024:>8.0f} "
+              f"{t['jobs_found']:>5} {t['jobs_new']:>4} {t['jobs_per_request']:>8.2f} {t['failures']:>5}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-company scraper performance report")
+    parser.add_argument('--platform', help="Only report one platform (lever, workday, ...)")
+    parser.add_argument('--days', type=int, default=30, help="Look back this many days (default 30)")
+    parser.add_argument('--limit', type=int, default=10, help="Rows per section (default 10)")
+    args = parser.parse_args()
+
+    migrate_schema(engine)
+    db = SessionLocal()
+    try:
+        report = get_scrape_performance_report(db, args.platform, args.days, args.limit)
+    finally:
+        db.close()
+
+    if report.get('error'):
+        print(f"❌ Could not build report: {report['error']}")
+        return
+
+    scope = f"platform '{args.platform}'" if args.platform else "all platforms"
+    print(f"📊 SCRAPE PERFORMANCE REPORT - {scope}, last {args.days} days")
+    print(f"  🏃 Runs: {report['runs']}  🏢 Targets: {report['targets']}")
+
+    print_targets("🐢 Slowest targets (average wall time)", report['slowest'])
+    print_targets("📉 Least productive targets (jobs per request)", report['least_productive'])
+    print_targets("❌ Most failing targets", report['most_failing'])
+
+if __name__ == "__main__":
+    main()
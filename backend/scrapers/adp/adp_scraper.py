@@ -26,15 +26,23 @@ However, companies' direct career pages (company.com/careers) work perfectly!
 - Byrider: 1 job from https://byrider.com/careers
 
 📝 FUTURE SESSIONS: Use this exact pattern for any new platforms!
+
+🧠 LEARNED STRATEGIES:
+The strategy and URL that worked for each company are stored in the
+scrape_strategies table and tried first on the next run. Strategies that
+failed are skipped until their recheck time (1, 2, 4 ... days, max 30).
 """
 
 import sys
 import os
+import re
 from typing import Dict, List, Any
+from urllib.parse import urlparse
 
 # Add core scraping utilities to path
-sys.path.append(os.path.dirname(__file__))
-from shared_utils import BaseScraper, ScrapingResult, JobParser
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from shared_utils import BaseScraper, ScrapingResult, JobParser, StrategyCache, register_platform
+from structured_jobs import JsonLdJobParser, SitemapJobFinder
 
 # Try to import Selenium (headless browser support)
 try:
@@ -49,13 +57,69 @@ except ImportError:
     SELENIUM_AVAILABLE = False
 
 
+@register_platform('adp')
 class ADPScraper(BaseScraper):
     """Specialized scraper for ADP platform"""
     
-    def __init__(self, db_file: str = None):
-        super().__init__("adp", db_file)
-        self.rate_limiter.default_delay = 1.5  # ADP-specific rate limiting
+    link_patterns = ('myjobs.adp.com', 'workforcenow.adp.com')
+    default_delay = 1.5  # ADP-specific rate limiting
+    max_workers = 1      # One shared Selenium driver
+    
+    # Strategy name -> method, in default order (see WORKING PATTERN above)
+    strategy_methods = {
+        'direct_career_page': 'try_direct_career_page',
+        'adp_page': 'try_adp_page',
+        'adp_variants': 'try_adp_variants',
+        'search_fallback': 'try_search_fallback'
+    }
+    
+    def __init__(self, db_file: str = None, **kwargs):
+        super().__init__("adp", db_file, **kwargs)
         self.driver = None
+        self.strategies = StrategyCache(self.db, self.platform_name)
+        self.sitemap_finder = SitemapJobFinder(self.http_client)
+    
+    # Hosted job boards; their hostnames are not the company's own site
+    ATS_HOST_SUFFIXES = ('adp.com', 'lever.co', 'greenhouse.io', 'myworkdayjobs.com', 'myworkdaysite.com',
+                         'ashbyhq.com', 'smartrecruiters.com', 'icims.com', 'jobvite.com', 'bamboohr.com', 'taleo.net')
+    
+    def load_companies(self) -> List[Dict[str, Any]]:
+        """Load ADP companies from tracker, deriving company_id and domain"""
+        companies = super().load_companies()
+        for company in companies:
+            path_parts = [part for part in urlparse(company['urls'][0]).path.split('/') if part]
+            company.setdefault('company_id', path_parts[0] if path_parts else company['name'].lower().replace(' ', ''))
+            company['domain'] = self.company_domain(company)
+        return companies
+    
+    @classmethod
+    def company_domain(cls, company: Dict[str, Any]) -> str:
+        """
+        The company's own domain (needed by the direct career page strategy): an explicit
+        domain or website, otherwise the first tracker link that is not on a hosted job board.
+        Empty when the tracker only lists ADP and other ATS links
+        """
+        links = [company.get('domain'), company.get('website')] + list(company.get('job_links') or [])
+        for link in filter(None, links):
+            host = urlparse(link if '//' in link else f"//{link}").netloc.lower().split(':')[0]
+            host = re.sub(r'^(?:www|careers|jobs)\.', '', host)
+            if host and '.' in host and not any(host == suffix or host.endswith(f".{suffix}") for suffix in cls.ATS_HOST_SUFFIXES):
+                return host
+        return ''
+    
+    def save_result(self, company: Dict[str, Any], result: Dict[str, Any], status: str) -> ScrapingResult:
+        """Save a successful strategy's jobs and build the ScrapingResult"""
+        records = [
+            JobParser.to_job_record(job, company['name'], self.platform_name, result['url'])
+            for job in result['jobs']
+        ]
+        new_jobs, updated_jobs, duplicate_jobs = self.save_company_jobs(company['name'], result['url'], records)
+        
+        return ScrapingResult(
+            company, self.platform_name, result['url'],
+            status, len(records), result['method'],
+            new_jobs=new_jobs, duplicate_jobs=duplicate_jobs, updated_jobs=updated_jobs
+        )
     
     def get_platform_config(self) -> Dict[str, Any]:
         """ADP platform configuration"""
@@ -130,6 +194,11 @@ class ADPScraper(BaseScraper):
             self.driver = None
     
     def parse_jobs(self, content: str, is_api: bool = False) -> List[Dict[str, Any]]:
+        """Parse job data from ADP HTML, timed as parse time for the current company"""
+        with self.metrics.parse_timer():
+            return self.parse_adp_html(content, is_api)
+    
+    def parse_adp_html(self, content: str, is_api: bool = False) -> List[Dict[str, Any]]:
         """Parse job data from ADP HTML"""
         if is_api:
             return []  # ADP doesn't have API
@@ -196,6 +265,10 @@ class ADPScraper(BaseScraper):
         
         This pattern works for 5/97 ADP companies tested.
         Same pattern used successfully for Workday (182 jobs) and Lever (33 jobs).
+        
+        Structured data is tried first: schema.org JobPosting JSON-LD on the career
+        pages and job pages listed in the site's sitemap. The HTML heuristics only
+        run on the already fetched career pages when no structured jobs are found.
         """
         domain = company.get('domain', '')
         
@@ -213,10 +286,42 @@ class ADPScraper(BaseScraper):
             f"https://www.{domain}/jobs"        # With www and jobs
         ]
         
-        for page_url in career_urls:
-            print(f"    Trying direct career page: {page_url}")
+        sitemap_urls = SitemapJobFinder.candidate_urls(domain)
+        pages = {}
+        
+        def structured_probe(url):
+            if url in sitemap_urls:
+                print(f"    Trying job sitemap: {url}")
+                jobs = self.sitemap_finder.find_jobs(url)
+                method = 'direct_career_page_sitemap'
+            else:
+                print(f"    Trying direct career page: {url}")
+                pages[url] = self.http_client.get(url)
+                with self.metrics.parse_timer():
+                    jobs = JsonLdJobParser.parse(pages[url] or '')
+                method = 'direct_career_page_jsonld'
             
-            content = self.http_client.get(page_url)
+            if jobs:
+                return {
+                    'success': True,
+                    'jobs': jobs,
+                    'url': url,
+                    'method': method,
+                    'job_count': len(jobs)
+                }
+            return None
+        
+        # Probe sitemaps and career pages concurrently; the first structured hit wins
+        candidates = self.strategies.prefer_learned(
+            company['name'], 'direct_career_page', career_urls + sitemap_urls
+        )
+        result = self.probe_first(candidates, structured_probe)
+        if result:
+            return result
+        
+        # No structured data anywhere: fall back to HTML heuristics on the fetched pages
+        for page_url in career_urls:
+            content = pages.get(page_url)
             status_code = 200 if content else 404
             
             if status_code == 200 and content and len(content) > 5000:
@@ -231,9 +336,9 @@ class ADPScraper(BaseScraper):
                         'job_count': len(jobs)
                     }
                 else:
-                    print(f"      No jobs found on career page")
+                    print(f"      No jobs found on {page_url}")
             else:
-                print(f"      Career page failed: {status_code}")
+                print(f"      Career page failed: {status_code} ({page_url})")
         
         return {'success': False}
     
@@ -308,7 +413,7 @@ class ADPScraper(BaseScraper):
             f"https://{company_id}.adp.com/careers"
         ]
         
-        for url in variant_urls:
+        def probe(url):
             print(f"    Trying ADP variant: {url}")
             
             content = self.http_client.get(url)
@@ -325,11 +430,13 @@ class ADPScraper(BaseScraper):
                         'method': 'adp_variant'
                     }
                 else:
-                    print(f"      No jobs found")
+                    print(f"      No jobs found on {url}")
             else:
-                print(f"      Error {status_code}")
+                print(f"      Error {status_code} ({url})")
+            return None
         
-        return {'success': False}
+        candidates = self.strategies.prefer_learned(company['name'], 'adp_variants', variant_urls)
+        return self.probe_first(candidates, probe) or {'success': False}
     
     def try_search_fallback(self, company: Dict[str, Any]) -> Dict[str, Any]:
         """Try search fallback for ADP"""
@@ -374,98 +481,46 @@ class ADPScraper(BaseScraper):
         return {'success': False}
     
     def scrape_company(self, company: Dict[str, Any]) -> ScrapingResult:
-        """Scrape jobs for a single company on ADP"""
+        """Scrape jobs for a single company on ADP, trying its learned strategy first"""
         print(f"  Scraping {company['name']}...")
         
-        # Apply rate limiting
-        self.rate_limiter.wait()
-        
-        # Step 1: Try direct career pages first (like Workday success pattern)
-        result = self.try_direct_career_page(company)
-        
-        if result['success']:
-            jobs = result['jobs']
-            job_count = len(jobs)
-            
-            company_id = self.db.save_company_result(
-                company, result['url'], job_count
-            )
-            self.db.save_jobs(company_id, self.platform_name, jobs)
-            
+        strategies = self.strategies.order(company['name'], list(self.strategy_methods))
+        if not strategies:
+            next_check = self.strategies.next_check(company['name'])
+            print(f"    ⏭️  All strategies failed recently, next check {next_check:%Y-%m-%d %H:%M}")
             return ScrapingResult(
-                company, self.platform_name, result['url'],
-                "success_with_jobs", job_count, result['method']
+                company, self.platform_name, 'N/A',
+                "skipped_cached_failure", 0, 'none'
             )
         
-        # Step 2: Try primary ADP page
-        result = self.try_adp_page(company)
+        # Apply rate limiting
+        self.rate_limiter.wait(delay=self.default_delay)
         
-        if result['success']:
-            jobs = result['jobs']
-            job_count = len(jobs)
+        for strategy in strategies:
+            if strategy == 'search_fallback':
+                print(f"  Primary URLs failed, trying search fallback...")
             
-            if job_count > 0:
-                company_id = self.db.save_company_result(
-                    company, self.platform_name, result['url'], 
-                    "success_with_jobs", job_count
-                )
-                self.db.save_jobs(company_id, self.platform_name, jobs)
-                
-                return ScrapingResult(
-                    company, self.platform_name, result['url'],
-                    "success_with_jobs", job_count, result['method']
-                )
-            else:
-                self.db.save_company_result(
-                    company, result['url'], 0
-                )
-                
+            result = getattr(self, self.strategy_methods[strategy])(company)
+            
+            if result['success'] and result['jobs']:
+                self.strategies.record_success(company['name'], strategy, result['url'], len(result['jobs']))
+                status = "success_with_jobs_search" if strategy == 'search_fallback' else "success_with_jobs"
+                return self.save_result(company, result, status)
+            
+            # Nothing to learn from a page without jobs: back off like any other failure
+            self.strategies.record_failure(company['name'], strategy)
+            
+            if result['success']:
+                # ADP page loaded but lists no jobs
+                self.db.upsert_company(company['name'], result['url'], 0)
                 return ScrapingResult(
                     company, self.platform_name, result['url'],
                     "success_no_jobs", 0, result['method']
                 )
         
-        # Step 2: Try ADP URL variants
-        result = self.try_adp_variants(company)
-        
-        if result['success']:
-            jobs = result['jobs']
-            job_count = len(jobs)
-            
-            company_id = self.db.save_company_result(
-                company, result['url'], job_count
-            )
-            self.db.save_jobs(company_id, self.platform_name, jobs)
-            
-            return ScrapingResult(
-                company, self.platform_name, result['url'],
-                "success_with_jobs", job_count, result['method']
-            )
-        
-        # Step 3: Try search fallback
-        print(f"  Primary URLs failed, trying search fallback...")
-        
-        result = self.try_search_fallback(company)
-        
-        if result['success']:
-            jobs = result['jobs']
-            job_count = len(jobs)
-            
-            company_id = self.db.save_company_result(
-                company, result['url'], job_count
-            )
-            self.db.save_jobs(company_id, self.platform_name, jobs)
-            
-            return ScrapingResult(
-                company, self.platform_name, result['url'],
-                "success_with_jobs_search", job_count, result['method']
-            )
-        
         # All methods failed
         error_status = "error_no_jobs"
-        self.db.save_company_result(
-            company, None, 0
-        )
+        self.db.upsert_company(company['name'], None, 0)
         
         # Clean up driver
         self.close_driver()
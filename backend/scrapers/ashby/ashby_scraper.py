@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Ashby Platform Scraper
+Scrapes jobs from companies using the Ashby ATS via its public Posting API
+One request per company returns the full board with descriptions and compensation:
+https://api.ashbyhq.com/posting-api/job-board/{board_name}?includeCompensation=true
+"""
+
+import re
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import sys
+from pathlib import Path
+
+# Add scrapers and backend directories to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from shared_utils import BoardApiScraper, JobParser, register_platform
+from standardize_locations import LocationStandardizer
+from job_classifier import JobClassifier
+
+BOARD_NAME_PATTERN = re.compile(r'ashbyhq\.com/(?:posting-api/job-board/)?([^/?#]+)')
+
+EMPLOYMENT_TYPES = {
+    'fulltime': 'Full-time',
+    'parttime': 'Part-time',
+    'intern': 'Internship',
+    'contract': 'Contract',
+    'temporary': 'Contract'
+}
+
+WORKPLACE_TYPES = {
+    'remote': 'Remote',
+    'hybrid': 'Hybrid',
+    'onsite': 'On-site'
+}
+
+@register_platform('ashby')
+class AshbyScraper(BoardApiScraper):
+    link_patterns = ('ashbyhq.com',)
+    default_delay = 0.2  # All companies share api.ashbyhq.com
+    max_workers = 8
+
+    def __init__(self, db_file: str = None, **kwargs):
+        super().__init__('ashby', db_file, **kwargs)
+        self.location_standardizer = LocationStandardizer()
+        self.classifier = JobClassifier()
+
+    def api_url(self, company: Dict[str, Any]) -> Optional[str]:
+        """Build the Posting API URL from the board name in any Ashby link"""
+        for link in company['urls']:
+            match = BOARD_NAME_PATTERN.search(link)
+            if match:
+                return f"https://api.ashbyhq.com/posting-api/job-board/{match.group(1)}?includeCompensation=true"
+        return None
+
+    def extract_postings(self, data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Ashby wraps postings in {"jobs": [...], "apiVersion": ...}; unlisted postings are skipped"""
+        if isinstance(data, dict) and isinstance(data.get('jobs'), list):
+            return [job for job in data['jobs'] if job.get('isListed', True)]
+        return None
+
+    def process_posting(self, posting: Dict[str, Any], company_name: str) -> Optional[Dict[str, Any]]:
+        """Convert an Ashby posting into a jobs-table row"""
+        title = (posting.get('title') or '').strip()
+        job_type = self.extract_job_type(posting)
+        work_type = self.extract_work_type(posting)
+        now = datetime.now()
+
+        description = posting.get('descriptionPlain') or JobParser.html_to_text(posting.get('descriptionHtml', ''))
+
+        return {
+            'title': title,
+            'company': company_name,
+            'location': 'No location' if work_type == 'Remote' else self.extract_location(posting),
+            'description': description.strip(),
+            'link': (posting.get('jobUrl') or '').strip(),
+            'platform': 'ashby',
+            'job_type': job_type,
+            'work_type': work_type,
+            'experience_level': self.classifier.experience_level(title, job_type),
+            'salary_range': self.extract_salary_range(posting),
+            'fetched_at': now,
+            'updated_at': now
+        }
+
+    def extract_location(self, posting: Dict[str, Any]) -> str:
+        """Prefer the structured postal address, falling back to the location label"""
+        postal = ((posting.get('address') or {}).get('postalAddress') or {})
+        parts = [postal.get(key, '').strip() for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+        raw_location = ', '.join(part for part in parts if part) or (posting.get('location') or '').strip()
+
+        if not raw_location:
+            return 'No location'
+        return self.location_standardizer.standardize_location(raw_location)
+
+    def extract_job_type(self, posting: Dict[str, Any]) -> str:
+        """Map Ashby's employmentType enum to standard job types"""
+        employment_type = (posting.get('employmentType') or '').lower()
+        if employment_type in EMPLOYMENT_TYPES:
+            return EMPLOYMENT_TYPES[employment_type]
+        return self.classifier.job_type(posting.get('title') or '')
+
+    def extract_work_type(self, posting: Dict[str, Any]) -> str:
+        """Map Ashby's workplaceType / isRemote to standard work types"""
+        workplace_type = (posting.get('workplaceType') or '').lower().replace('-', '')
+        if workplace_type in WORKPLACE_TYPES:
+            return WORKPLACE_TYPES[workplace_type]
+        if posting.get('isRemote'):
+            return 'Remote'
+        return self.classifier.work_type(posting.get('location') or '', posting.get('title') or '')
+
+    def extract_salary_range(self, posting: Dict[str, Any]) -> str:
+        """Use Ashby's pre-formatted compensation summary when published"""
+        compensation = posting.get('compensation') or {}
+        summary = (compensation.get('scrapeableCompensationSalarySummary')
+                   or compensation.get('compensationTierSummary'))
+        return summary.strip() if summary else 'Salary not specified'
+
+def main():
+    """Run Ashby scraper over every tracker company with an Ashby link"""
+    print("🚀 Ashby Scraper - Posting API")
+    print()
+
+    scraper = AshbyScraper()
+    try:
+        scraper.run()
+    finally:
+        scraper.close()
+
+if __name__ == "__main__":
+    main()
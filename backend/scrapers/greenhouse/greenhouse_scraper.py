@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Greenhouse Platform Scraper
+Scrapes jobs from companies using the Greenhouse ATS via its public Job Board API
+One request per company returns the full board with descriptions:
+https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs?content=true
+"""
+
+import re
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+import sys
+from pathlib import Path
+
+# Add scrapers and backend directories to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from shared_utils import BoardApiScraper, JobParser, register_platform
+from standardize_locations import LocationStandardizer
+from job_classifier import JobClassifier
+
+BOARD_TOKEN_PATTERN = re.compile(
+    r'greenhouse\.io/(?:v1/boards/|embed/job_board\?for=)?([A-Za-z0-9_-]+)'
+)
+
+@register_platform('greenhouse')
+class GreenhouseScraper(BoardApiScraper):
+    link_patterns = ('greenhouse.io',)
+    default_delay = 0.2  # All companies share boards-api.greenhouse.io
+    max_workers = 8
+
+    def __init__(self, db_file: str = None, **kwargs):
+        super().__init__('greenhouse', db_file, **kwargs)
+        self.location_standardizer = LocationStandardizer()
+        self.classifier = JobClassifier()
+
+    def api_url(self, company: Dict[str, Any]) -> Optional[str]:
+        """Build the Job Board API URL from the board token in any Greenhouse link"""
+        for link in company['urls']:
+            match = BOARD_TOKEN_PATTERN.search(link)
+            if match and match.group(1) not in ('embed', 'v1'):
+                return f"https://boards-api.greenhouse.io/v1/boards/{match.group(1)}/jobs?content=true"
+        return None
+
+    def extract_postings(self, data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Greenhouse wraps postings in {"jobs": [...], "meta": {...}}"""
+        if isinstance(data, dict) and isinstance(data.get('jobs'), list):
+            return data['jobs']
+        return None
+
+    def process_posting(self, posting: Dict[str, Any], company_name: str) -> Optional[Dict[str, Any]]:
+        """Convert a Greenhouse posting into a jobs-table row"""
+        title = (posting.get('title') or '').strip()
+        raw_location = ((posting.get('location') or {}).get('name') or '').strip()
+        metadata = self.extract_metadata(posting)
+        labels = self.classifier.classify({
+            'title': title,
+            'job_type': metadata.get('employment_type', ''),
+            'work_type': raw_location
+        })
+        now = datetime.now()
+
+        return {
+            'title': title,
+            'company': company_name,
+            'location': self.extract_location(raw_location, labels['work_type'] == 'Remote'),
+            'description': JobParser.html_to_text(posting.get('content', '')),
+            'link': (posting.get('absolute_url') or '').strip(),
+            'platform': 'greenhouse',
+            'job_type': labels['job_type'],
+            'work_type': labels['work_type'],
+            'experience_level': labels['experience_level'],
+            'salary_range': metadata.get('salary') or 'Salary not specified',
+            'fetched_at': now,
+            'updated_at': now
+        }
+
+    def extract_metadata(self, posting: Dict[str, Any]) -> Dict[str, str]:
+        """Flatten custom metadata fields (employment type, salary) into lowercase keys"""
+        values = {}
+        for item in posting.get('metadata') or []:
+            name = (item.get('name') or '').lower()
+            value = item.get('value')
+            if isinstance(value, list):
+                value = ', '.join(str(v) for v in value)
+            if not value:
+                continue
+            if 'employment' in name or 'job type' in name or 'time type' in name:
+                values['employment_type'] = str(value)
+            elif 'salary' in name or 'compensation' in name or 'pay' in name:
+                values['salary'] = str(value)
+        return values
+
+    def extract_location(self, raw_location: str, is_remote: bool) -> str:
+        """Standardize location, using "No location" for remote jobs like the Lever scraper"""
+        if is_remote or not raw_location:
+            return 'No location'
+        return self.location_standardizer.standardize_location(raw_location)
+
+def main():
+    """Run Greenhouse scraper over every tracker company with a Greenhouse link"""
+    print("🚀 Greenhouse Scraper - Job Board API")
+    print()
+
+    scraper = GreenhouseScraper()
+    try:
+        scraper.run()
+    finally:
+        scraper.close()
+
+if __name__ == "__main__":
+    main()
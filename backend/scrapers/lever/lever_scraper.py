@@ -3,165 +3,170 @@
 Lever Platform Scraper
 Scrapes jobs from companies using Lever ATS platform
 Always maintains both jobs and companies tables in sync
+
+Postings are fetched in skip/limit pages and each page is parsed incrementally
+as it streams in, so a large employer's multi-megabyte board never sits in
+memory as one document (pass stream=False for the old single-request mode)
 """
 
+import codecs
 import sqlite3
-import requests
-import json
-import time
 import re
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Any, Tuple
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 import sys
-import os
 from pathlib import Path
-from db_config import get_db_path, get_tracker_path
 
-# Import location standardizer
+# Add scrapers and backend directories to path
+sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent.parent))
+from shared_utils import BaseScraper, ScrapingResult, JsonArrayStream, register_platform
 from standardize_locations import LocationStandardizer
+from job_classifier import JobClassifier
+
+@register_platform('lever')
+class LeverScraper(BaseScraper):
+    link_patterns = ('api.lever.co',)
+    default_delay = 0.2  # All companies share api.lever.co
+    max_workers = 8
+    page_size = 100          # Postings per skip/limit page in streaming mode
+    chunk_size = 64 * 1024   # Bytes read from the response at a time
 
-class LeverScraper:
-    def __init__(self):
-        self.db_path = get_db_path()
-        self.tracker_path = get_tracker_path()
+    def __init__(self, db_file: str = None, stream: bool = True, **kwargs):
+        super().__init__('lever', db_file, **kwargs)
         self.location_standardizer = LocationStandardizer()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.classifier = JobClassifier()
+        self.stream = stream
     
-    def upsert_company(self, company_name: str, job_link: str = None, job_count: int = 0):
-        """Insert or update company in companies table"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def scrape_company(self, company: Dict[str, Any]) -> ScrapingResult:
+        """Scrape a single company and update BOTH tables"""
+        if self.stream:
+            return self.scrape_company_streaming(company)
         
-        try:
-            # Check if company exists
-            cursor.execute("SELECT id, job_count FROM companies WHERE name = ?", (company_name,))
-            existing = cursor.fetchone()
-            
-            if existing:
-                # Update existing company
-                company_id, current_count = existing
-                cursor.execute("""
-                    UPDATE companies 
-                    SET job_count = ?, url = COALESCE(?, url), last_scraped = ?
-                    WHERE id = ?
-                """, (job_count, job_link, datetime.now(), company_id))
-                print(f"    🔄 Updated {company_name}: {current_count} → {job_count} jobs")
-            else:
-                # Insert new company
-                cursor.execute("""
-                    INSERT INTO companies (name, url, job_count, last_scraped, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (company_name, job_link, job_count, datetime.now(), datetime.now()))
-                print(f"    ✅ Added {company_name}: {job_count} jobs")
-            
-            conn.commit()
-            
-        except Exception as e:
-            print(f"    ❌ Error upserting company {company_name}: {e}")
-        finally:
-            conn.close()
-    
-    def save_jobs_and_update_company(self, jobs: List[Dict], company_name: str, job_link: str = None):
-        """Save jobs to jobs table AND update companies table"""
-        if not jobs:
-            # Even if no jobs, still update the company record
-            self.upsert_company(company_name, job_link, 0)
-            return 0
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        company_name = company['name']
+        lever_link = company['urls'][0]
         
-        saved_jobs = 0
-        duplicate_jobs = 0
+        response = self.http_client.request('GET', lever_link)
+        if response is None:
+            self.db.upsert_company(company_name, lever_link, 0)
+            return ScrapingResult(company, self.platform_name, lever_link, 'error_request_failed')
         
-        try:
-            for job in jobs:
-                # Check if job already exists
-                cursor.execute("SELECT id FROM jobs WHERE link = ?", (job['link'],))
-                if cursor.fetchone():
-                    duplicate_jobs += 1
-                    continue
-                
-                # Insert new job
-                cursor.execute("""
-                    INSERT INTO jobs (
-                        title, company, location, description, link, platform,
-                        job_type, work_type, experience_level, salary_range,
-                        fetched_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    job['title'], job['company'], job['location'], job['description'],
-                    job['link'], job['platform'], job['job_type'], job['work_type'],
-                    job['experience_level'], job['salary_range'],
-                    job['fetched_at'], job['updated_at']
-                ))
-                saved_jobs += 1
-            
-            conn.commit()
-            
-            # Now update the companies table with the correct job count
-            self.upsert_company(company_name, job_link, saved_jobs + duplicate_jobs)
-            
-            if duplicate_jobs > 0:
-                print(f"    💾 Jobs: {saved_jobs} new, {duplicate_jobs} duplicates")
-            else:
-                print(f"    💾 Jobs: {saved_jobs} new")
-                
-        except Exception as e:
-            print(f"    ❌ Error saving jobs: {e}")
-        finally:
-            conn.close()
+        if response.status_code != 200:
+            self.db.upsert_company(company_name, lever_link, 0)
+            return ScrapingResult(company, self.platform_name, lever_link, f'error_http_{response.status_code}')
         
-        return saved_jobs
-    
-    def scrape_lever_company(self, company_entry: Dict) -> Tuple[int, int]:
-        """Scrape a single company and update BOTH tables"""
-        company_name = company_entry.get('company')
-        job_links = company_entry.get('job_links', [])
+        with self.metrics.parse_timer():
+            try:
+                jobs_data = response.json()
+            except ValueError:
+                jobs_data = None
+            
+            jobs = self.process_lever_jobs(jobs_data, company_name) if isinstance(jobs_data, list) else []
         
-        if not company_name or not job_links:
-            return 0, 0
+        if not isinstance(jobs_data, list):
+            self.db.upsert_company(company_name, lever_link, 0)
+            return ScrapingResult(company, self.platform_name, lever_link, 'error_invalid_json')
         
-        print(f"  🔄 Scraping {company_name}...")
+        new_jobs, updated_jobs, duplicate_jobs = self.save_company_jobs(company_name, lever_link, jobs, close_missing=True)
         
-        # Find Lever API link from job_links array
-        lever_link = None
-        for link in job_links:
-            if 'api.lever.co' in link:
-                lever_link = link
+        status = 'success_with_jobs' if jobs else 'success_no_jobs'
+        return ScrapingResult(
+            company, self.platform_name, lever_link, status, len(jobs), 'api',
+            new_jobs=new_jobs, duplicate_jobs=duplicate_jobs, updated_jobs=updated_jobs
+        )
+    
+    def scrape_company_streaming(self, company: Dict[str, Any]) -> ScrapingResult:
+        """Page through the board with skip/limit, saving each page as soon as it is parsed"""
+        company_name = company['name']
+        lever_link = company['urls'][0]
+        seen_links = set()
+        job_count = new_jobs = updated_jobs = duplicate_jobs = 0
+        complete = True
+        skip = 0
+        
+        while True:
+            response = self.http_client.request('GET', self.page_url(lever_link, skip), stream=True)
+            if response is None or response.status_code != 200:
+                error = 'error_request_failed' if response is None else f'error_http_{response.status_code}'
+                if response is not None:
+                    response.close()
+                if skip == 0:
+                    self.db.upsert_company(company_name, lever_link, 0)
+                    return ScrapingResult(company, self.platform_name, lever_link, error)
+                print(f"    ⚠️  {company_name}: page at skip={skip} failed ({error}), keeping earlier pages")
+                complete = False
                 break
-        
-        if not lever_link:
-            print(f"    ⚠️  No Lever API link found")
-            self.upsert_company(company_name, None, 0)
-            return 0, 0
+            
+            try:
+                jobs, posting_count = self.stream_lever_jobs(response, company_name)
+            except ValueError:
+                if skip == 0:
+                    self.db.upsert_company(company_name, lever_link, 0)
+                    return ScrapingResult(company, self.platform_name, lever_link, 'error_invalid_json')
+                print(f"    ⚠️  {company_name}: invalid JSON at skip={skip}, keeping earlier pages")
+                complete = False
+                break
+            finally:
+                response.close()
+            
+            page_jobs = [job for job in jobs if job['link'] not in seen_links]
+            if jobs and not page_jobs:
+                break  # Server ignored skip and repeated a page
+            seen_links.update(job['link'] for job in page_jobs)
+            
+            new, updated, unchanged = self.db.save_jobs(page_jobs)
+            job_count += len(page_jobs)
+            new_jobs += new
+            updated_jobs += updated
+            duplicate_jobs += unchanged
+            
+            if posting_count < self.page_size:
+                break
+            skip += posting_count
+        
+        self.db.upsert_company(company_name, lever_link, job_count)
+        if complete:
+            # Only a full walk of the board proves a posting was taken down
+            self.close_missing_jobs(company_name, seen_links)
+        
+        status = 'success_with_jobs' if job_count else 'success_no_jobs'
+        return ScrapingResult(
+            company, self.platform_name, lever_link, status, job_count, 'api_stream',
+            new_jobs=new_jobs, duplicate_jobs=duplicate_jobs, updated_jobs=updated_jobs
+        )
+    
+    def page_url(self, lever_link: str, skip: int) -> str:
+        """Tracker link with skip/limit paging parameters set"""
+        parts = urlparse(lever_link)
+        query = dict(parse_qsl(parts.query))
+        query.update(skip=str(skip), limit=str(self.page_size))
+        return urlunparse(parts._replace(query=urlencode(query)))
+    
+    def stream_lever_jobs(self, response, company_name: str) -> Tuple[List[Dict], int]:
+        """Parse postings one at a time from a streamed response; returns (jobs, postings seen)"""
+        parser = JsonArrayStream()
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        jobs = []
+        posting_count = 0
+        num_bytes = 0
         
         try:
-            response = self.session.get(lever_link, timeout=10)
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                num_bytes += len(chunk)
+                with self.metrics.parse_timer():
+                    postings = parser.feed(decoder.decode(chunk))
+                    posting_count += len(postings)
+                    jobs.extend(self.process_lever_jobs(postings, company_name))
             
-            if response.status_code == 200:
-                jobs_data = response.json()
-                if isinstance(jobs_data, list):
-                    jobs = self.process_lever_jobs(jobs_data, company_name)
-                    saved_jobs = self.save_jobs_and_update_company(jobs, company_name, lever_link)
-                    return len(jobs), saved_jobs
-                else:
-                    print(f"    ❌ Invalid JSON format")
-                    self.upsert_company(company_name, lever_link, 0)
-                    return 0, 0
-            else:
-                print(f"    ❌ API error ({response.status_code})")
-                self.upsert_company(company_name, lever_link, 0)
-                return 0, 0
-                
-        except Exception as e:
-            print(f"    ❌ Scraping failed: {e}")
-            self.upsert_company(company_name, lever_link, 0)
-            return 0, 0
+            with self.metrics.parse_timer():
+                postings = parser.feed(decoder.decode(b'', final=True)) + parser.close()
+                posting_count += len(postings)
+                jobs.extend(self.process_lever_jobs(postings, company_name))
+        finally:
+            self.metrics.record_bytes(num_bytes)
+        
+        return jobs, posting_count
     
     def process_lever_jobs(self, jobs_data: List[Dict], company_name: str) -> List[Dict]:
         """Process Lever API jobs data with comprehensive field extraction"""
@@ -176,20 +181,23 @@ class LeverScraper:
                     'description': self.extract_description(job_data),
                     'link': job_data.get('hostedUrl', '').strip(),
                     'platform': 'lever',
-                    'job_type': self.extract_job_type(job_data),
-                    'work_type': self.extract_work_type(job_data),
-                    'experience_level': self.extract_experience_level(job_data),
                     'salary_range': self.extract_salary_range(job_data),
                     'fetched_at': datetime.now(),
                     'updated_at': datetime.now()
                 }
                 
                 if job['title'] and job['link']:
+                    job['_hints'] = self.classification_hints(job_data)
                     jobs.append(job)
                     
             except Exception as e:
                 continue
         
+        # Classify the whole board in one call (job_type, work_type, experience_level)
+        labels = self.classifier.classify_batch([job.pop('_hints') for job in jobs])
+        for job, label in zip(jobs, labels):
+            job.update(label)
+        
         return jobs
     
     def extract_location(self, job_data: Dict) -> str:
@@ -224,92 +232,16 @@ class LeverScraper:
         else:
             return 'No location'
     
-    def extract_job_type(self, job_data: Dict) -> str:
-        """Extract and normalize job type to standard categories"""
+    def classification_hints(self, job_data: Dict) -> Dict[str, str]:
+        """Fields the shared classifier reads: commitment for job type, workplaceType before title/description for work type"""
         categories = job_data.get('categories', {})
-        raw_commitment = categories.get('commitment', '').strip().lower()
-        
-        # Normalize to standard job types with precise internship detection
-        if self._is_internship_job(raw_commitment):
-            return 'Internship'
-        elif 'part' in raw_commitment and 'time' in raw_commitment:
-            return 'Part-time'
-        elif any(word in raw_commitment for word in ['contract', 'contractor', 'consultant', 'freelance', 'temporary', 'fixed', 'clt']):
-            return 'Contract'
-        elif any(word in raw_commitment for word in ['full', 'permanent', 'employee']) or raw_commitment == '':
-            return 'Full-time'
-        else:
-            # Default to Full-time for unclear cases
-            return 'Full-time'
-    
-    def _is_internship_job(self, raw_commitment: str) -> bool:
-        """Check if job is an internship with precise word boundary detection"""
-        internship_indicators = [
-            'intern ',      # intern followed by space
-            'internship',   # full word internship
-            'estágio',      # Portuguese internship
-            ' intern',      # intern preceded by space
-            'co-op',        # co-op programs
-            'coop'          # coop without hyphen
-        ]
-        
-        # Check if any indicator matches (avoiding words like 'internal', 'international')
-        for indicator in internship_indicators:
-            if indicator in raw_commitment:
-                return True
-                
-        # Check if the entire string is just 'intern'
-        if raw_commitment.strip() == 'intern':
-            return True
-            
-        return False
-    
-    def extract_work_type(self, job_data: Dict) -> str:
-        """Extract work type from workplaceType field"""
-        workplace_type = job_data.get('workplaceType', '').strip().lower()
-        
-        if workplace_type == 'remote':
-            return 'Remote'
-        elif workplace_type == 'hybrid':
-            return 'Hybrid'
-        elif workplace_type == 'onsite':
-            return 'On-site'
-        else:
-            # Fallback to text analysis if workplaceType not available
-            title = job_data.get('text', '').lower()
-            description = job_data.get('description', '').lower()
-            
-            if 'remote' in title or 'remote' in description:
-                return 'Remote'
-            elif 'hybrid' in title or 'hybrid' in description:
-                return 'Hybrid'
-            else:
-                return 'On-site'
-    
-    def extract_experience_level(self, job_data: Dict) -> str:
-        """Extract standardized experience level (Entry Level, Mid, Senior, Lead)"""
-        # First check if this is an internship job type
-        job_type = self.extract_job_type(job_data)
-        if job_type == 'Internship':
-            return 'Entry Level'
-        
-        title = job_data.get('text', '').lower()
-        
-        # Senior level indicators
-        if any(indicator in title for indicator in ['senior', 'sr.', 'sr ']):
-            return 'Senior'
-        # Leadership level indicators  
-        elif any(indicator in title for indicator in ['lead', 'principal', 'staff', 'head of', 'director', 'vp', 'vice president']):
-            return 'Lead'
-        # Entry level indicators
-        elif any(indicator in title for indicator in ['junior', 'jr.', 'jr ', 'entry', 'graduate', 'new grad']):
-            return 'Entry Level'
-        # Check title for internship indicators (should be Entry Level)
-        elif self._is_internship_job(title):
-            return 'Entry Level'
-        else:
-            # Default to Mid level
-            return 'Mid'
+        workplace_type = job_data.get('workplaceType', '').strip()
+        return {
+            'title': job_data.get('text', '').strip(),
+            'job_type': categories.get('commitment', '').strip(),
+            'work_type': '' if workplace_type.lower() == 'unspecified' else workplace_type,
+            'text': job_data.get('descriptionPlain') or job_data.get('description', '')
+        }
     
     def extract_description(self, job_data: Dict) -> str:
         """Extract comprehensive description from descriptionPlain + additionalPlain + all lists"""
@@ -336,7 +268,6 @@ class LeverScraper:
             
             if list_content:
                 # Remove HTML tags from list content for clean text
-                import re
                 clean_content = re.sub(r'<[^>]+>', '', list_content)
                 # Convert HTML entities
                 clean_content = clean_content.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
@@ -368,49 +299,17 @@ class LeverScraper:
     
     
     def scrape_all_companies(self):
-        """Scrape all companies and maintain both jobs and companies tables"""
-        # Load companies from tracker
-        with open(self.tracker_path, 'r') as f:
-            tracker_data = json.load(f)
-        
-        companies = tracker_data.get('companies', [])
-        
-        print(f"🚀 Lever scraping: {len(companies)} companies")
+        """Scrape all companies concurrently and maintain both jobs and companies tables"""
         print("📊 Will update BOTH jobs and companies tables")
-        print("=" * 60)
-        
-        total_jobs_found = 0
-        total_jobs_saved = 0
-        companies_scraped = 0
-        
-        for i, company_entry in enumerate(companies, 1):
-            company_name = company_entry.get('company', f'Company_{i}')
-            print(f"\n{i:2d}/{len(companies)} {company_name}")
-            
-            jobs_found, jobs_saved = self.scrape_lever_company(company_entry)
-            
-            if jobs_found > 0:
-                total_jobs_found += jobs_found
-                total_jobs_saved += jobs_saved
-                companies_scraped += 1
-            
-            # Rate limiting
-            time.sleep(0.5)
-        
-        print(f"\n" + "=" * 60)
-        print(f"🎉 LEVER SCRAPING COMPLETED")
-        print(f"=" * 60)
-        print(f"🏢 Companies processed: {len(companies)}")
-        print(f"✅ Companies with jobs: {companies_scraped}")
-        print(f"📄 Jobs found: {total_jobs_found}")
-        print(f"💾 Jobs saved: {total_jobs_saved}")
+        results = self.run()
         
         # Verify both tables are updated
         self.verify_tables_sync()
+        return results
     
     def verify_tables_sync(self):
         """Verify both tables are properly populated"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db.db_path)
         cursor = conn.cursor()
         
         cursor.execute("SELECT COUNT(*) FROM jobs")
@@ -444,7 +343,10 @@ def main():
     print()
     
     scraper = LeverScraper()
-    scraper.scrape_all_companies()
+    try:
+        scraper.scrape_all_companies()
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
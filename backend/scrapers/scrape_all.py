@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Multi-platform scraping orchestrator
+Runs every registered platform scraper at the same time instead of one script
+after another, so a full refresh takes about as long as the slowest platform.
+All platforms share one per-host RateLimiter and one BatchJobWriter (and its
+known-jobs index); each keeps its own worker pool and per-host delay.
+
+Usage:
+    python scrape_all.py [--platforms lever greenhouse] [--companies Stripe Notion] [--workers 3] [--limit 50]
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any
+
+from shared_utils import (
+    BaseScraper, BatchJobWriter, RateLimiter, ScrapingResult,
+    load_platform_modules, get_scraper
+)
+
+
+class ScrapeOrchestrator:
+    """Run several platform scrapers concurrently with shared rate limiting and saving"""
+
+    def __init__(self, platforms: List[str] = None, workers: int = None, db_file: str = None,
+                 progress_interval: float = 10, company_limit: int = None, company_names: List[str] = None):
+        self.platforms = platforms
+        self.workers = workers
+        self.db_file = db_file
+        self.progress_interval = progress_interval
+        self.company_limit = company_limit
+        self.company_names = {name.lower() for name in company_names} if company_names else None
+        self.scrapers: Dict[str, BaseScraper] = {}
+        self.companies: Dict[str, List[Dict[str, Any]]] = {}
+        self.errors: Dict[str, str] = {}
+        self.finished: Dict[str, Dict[str, Any]] = {}  # Metrics frozen when each platform finishes
+        self.started_at = self.finished_at = None
+        self._done = threading.Event()
+
+    def setup(self):
+        """Instantiate the selected scrapers around a shared rate limiter and writer"""
+        registered = load_platform_modules()
+        platforms = self.platforms or sorted(registered)
+        unknown = [name for name in platforms if name not in registered]
+        if unknown:
+            raise ValueError(f"Unknown platforms: {unknown} (registered: {sorted(registered)})")
+
+        self.rate_limiter = RateLimiter()
+        self.writer = BatchJobWriter(self.db_file)
+        for name in platforms:
+            try:
+                scraper = get_scraper(name, rate_limiter=self.rate_limiter, writer=self.writer)
+            except Exception as e:
+                self.errors[name] = f"setup failed: {e}"
+                print(f"❌ {name}: could not start scraper: {e}")
+                continue
+            companies = scraper.load_companies()
+            if self.company_names:
+                companies = [company for company in companies if company['name'].lower() in self.company_names]
+            if self.company_limit:
+                companies = companies[:self.company_limit]
+            self.scrapers[name] = scraper
+            self.companies[name] = companies
+
+    def run_platform(self, name: str) -> List[ScrapingResult]:
+        scraper = self.scrapers[name]
+        try:
+            return scraper.run(self.companies[name])
+        finally:
+            self.finished[name] = scraper.metrics.snapshot()
+
+    def run(self) -> Dict[str, Any]:
+        """Scrape all selected platforms in parallel; returns the combined summary"""
+        self.setup()
+        names = [name for name in self.scrapers if self.companies[name]]
+        for name in self.scrapers:
+            if not self.companies[name]:
+                print(f"⚠️  {name}: no tracker companies, skipping")
+        if not names:
+            print("❌ Nothing to scrape")
+            self.close()
+            return self.summary(0.0)
+
+        workers = self.workers or len(names)
+        total_companies = sum(len(self.companies[name]) for name in names)
+        print(f"🚀 Scraping {len(names)} platforms in parallel ({workers} at a time): "
+              f"{', '.join(f'{name} ({len(self.companies[name])})' for name in names)} - {total_companies} companies")
+        print("=" * 60)
+
+        start = self.started_at = time.perf_counter()
+        self._done.clear()
+        progress = threading.Thread(target=self.report_progress, name='scrape-progress', daemon=True)
+        progress.start()
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='platform') as executor:
+                futures = {executor.submit(self.run_platform, name): name for name in names}
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.errors[name] = str(e)
+                        print(f"❌ {name}: run failed: {e}")
+                    else:
+                        print(f"🏁 {name} finished after {time.perf_counter() - start:.1f}s")
+        finally:
+            self.finished_at = time.perf_counter()
+            self._done.set()
+            progress.join()
+            self.close()
+
+        summary = self.summary(self.finished_at - start)
+        self.print_summary(summary)
+        return summary
+
+    def progress(self) -> Dict[str, Any]:
+        """Live per-platform and combined progress (safe to call from other threads)"""
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at if self.started_at else 0.0
+        platforms = {}
+        for name, scraper in list(self.scrapers.items()):
+            count = len(self.companies.get(name, []))
+            if not count:
+                continue
+            stats = self.finished.get(name) or scraper.metrics.snapshot()
+            platforms[name] = {
+                'companies_done': min(stats['companies_processed'], count),
+                'companies_total': count,
+                'jobs_found': stats['jobs_found'],
+                'jobs_new': stats['jobs_new'],
+                'jobs_updated': stats['jobs_updated'],
+                'finished': name in self.finished
+            }
+
+        totals = {
+            key: sum(platform[key] for platform in platforms.values())
+            for key in ('companies_done', 'companies_total', 'jobs_found', 'jobs_new', 'jobs_updated')
+        }
+        return {
+            'platforms': platforms,
+            **totals,
+            'elapsed_seconds': round(elapsed, 2),
+            'companies_per_second': round(totals['companies_done'] / elapsed, 2) if elapsed else 0.0,
+            'jobs_per_second': round(totals['jobs_found'] / elapsed, 2) if elapsed else 0.0
+        }
+
+    def progress_line(self) -> str:
+        """One line with every platform's progress and the combined throughput"""
+        progress = self.progress()
+        parts = [f"{name} {platform['companies_done']}/{platform['companies_total']} ({platform['jobs_found']} jobs)"
+                 for name, platform in progress['platforms'].items()]
+        return (f"📈 [{progress['elapsed_seconds']:6.1f}s] {' | '.join(parts)} || "
+                f"{progress['companies_done']}/{progress['companies_total']} companies, "
+                f"{progress['jobs_found']} jobs, {progress['jobs_per_second']:.1f} jobs/s")
+
+    def report_progress(self):
+        while not self._done.wait(self.progress_interval):
+            print(self.progress_line())
+
+    def summary(self, wall_seconds: float) -> Dict[str, Any]:
+        """Per-platform counters plus totals; sequential_seconds is what one-after-another would have taken"""
+        platforms = {name: self.finished.get(name) or scraper.metrics.snapshot()
+                     for name, scraper in self.scrapers.items() if self.companies.get(name)}
+        totals = {
+            key: sum(stats[key] for stats in platforms.values())
+            for key in ('companies_processed', 'companies_with_jobs', 'companies_failed', 'companies_skipped',
+                        'jobs_found', 'jobs_new', 'jobs_updated', 'jobs_duplicate', 'requests', 'bytes_received')
+        }
+        return {
+            'platforms': platforms,
+            'errors': dict(self.errors),
+            'totals': totals,
+            'wall_seconds': round(wall_seconds, 2),
+            'sequential_seconds': round(sum(stats['elapsed_seconds'] for stats in platforms.values()), 2),
+            'jobs_per_second': round(totals['jobs_found'] / wall_seconds, 2) if wall_seconds else 0.0
+        }
+
+    def print_summary(self, summary: Dict[str, Any]):
+        print(f"\n" + "=" * 60)
+        print(f"🎉 ALL PLATFORMS COMPLETED")
+        print(f"=" * 60)
+        print(f"  {'Platform':<12} {'Companies':>9} {'w/ jobs':>7} {'Failed':>6} {'Jobs':>6} "
+              f"{'New':>5} {'Upd':>5} {'Reqs':>6} {'Time s':>7} {'Jobs/s':>7}")
+        for name, stats in summary['platforms'].items():
+            print(f"  {name:<12} {stats['companies_processed']:>9} {stats['companies_with_jobs']:>7} "
+                  f"{stats['companies_failed']:>6} {stats['jobs_found']:>6} {stats['jobs_new']:>5} "
+                  f"{stats['jobs_updated']:>5} {stats['requests']:>6} {stats['elapsed_seconds']:>7.1f} "
+                  f"{stats['jobs_per_second']:>7.1f}")
+        for name, error in summary['errors'].items():
+            print(f"  ❌ {name}: {error}")
+
+        totals = summary['totals']
+        print(f"\n📄 Jobs found: {totals['jobs_found']} ({totals['jobs_new']} new, {totals['jobs_updated']} updated, "
+              f"{totals['jobs_duplicate']} unchanged)")
+        print(f"🌐 Requests: {totals['requests']} ({totals['bytes_received'] / 1024:.0f} KB)")
+        print(f"⏱️  {summary['wall_seconds']}s wall time vs {summary['sequential_seconds']}s one platform after another, "
+              f"{summary['jobs_per_second']} jobs/s")
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            scraper.close()
+        if hasattr(self, 'writer'):
+            self.writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run all platform scrapers in parallel")
+    parser.add_argument('--platforms', nargs='+', help="Platforms to run (default: every registered platform)")
+    parser.add_argument('--workers', type=int, help="Platforms scraped at the same time (default: all of them)")
+    parser.add_argument('--companies', nargs='+', help="Only scrape these tracker companies (by name)")
+    parser.add_argument('--limit', type=int, help="Only scrape the first N companies of each platform")
+    parser.add_argument('--progress-interval', type=float, default=10, help="Seconds between progress lines (default 10)")
+    parser.add_argument('--db', help="SQLite database path (default: the backend database)")
+    args = parser.parse_args()
+
+    orchestrator = ScrapeOrchestrator(args.platforms, args.workers, args.db, args.progress_interval,
+                                      args.limit, args.companies)
+    try:
+        summary = orchestrator.run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0 if summary['platforms'] and not summary['errors'] else 1
+
+if __name__ == "__main__":
+    exit(main())
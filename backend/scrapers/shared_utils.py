@@ -0,0 +1,1110 @@
+#!/usr/bin/env python3
+"""
+Shared Scraping Utilities
+Common framework for every platform scraper:
+- BaseScraper with a concurrent per-company runner
+- BoardApiScraper for platforms that serve a whole job board as one JSON document
+- Pooled HTTP client with retries and per-host rate limiting
+- Batched, thread-safe writer for the jobs and companies tables
+- Run metrics (recorded per company in the scrape_runs table) and a platform registry
+  so new platforms plug into the same runner
+"""
+
+import html
+import importlib.util
+import json
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Tuple, Type, Iterable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Add backend to path for database imports
+SCRAPERS_DIR = Path(__file__).parent
+sys.path.append(str(SCRAPERS_DIR.parent))
+from db_config import get_db_path, get_tracker_path
+from models import job_content_hash
+from known_jobs import KnownJobIndex
+from job_links import canonical_job_key
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/json,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+JOB_COLUMNS = (
+    'title', 'company', 'location', 'description', 'link', 'link_key', 'platform',
+    'job_type', 'work_type', 'experience_level', 'salary_range',
+    'fetched_at', 'updated_at', 'content_hash'
+)
+
+# Columns rewritten when a posting's content changes (link, its key and fetched_at stay)
+UPDATE_COLUMNS = tuple(column for column in JOB_COLUMNS if column not in ('link', 'link_key', 'fetched_at'))
+
+
+class RateLimiter:
+    """Thread-safe per-host rate limiter shared by all workers of a run"""
+
+    def __init__(self, default_delay: float = 0.5):
+        self.default_delay = default_delay
+        self.host_delays: Dict[str, float] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def set_delay(self, host: str, delay: float):
+        """Override the minimum interval between requests to one host"""
+        self.host_delays[host] = delay
+
+    def wait(self, url: str = None, delay: float = None):
+        """Block until this host's next request slot is free (delay overrides the default for this caller)"""
+        host = urlparse(url).netloc if url else '*'
+        delay = self.host_delays.get(host, self.default_delay if delay is None else delay)
+
+        # Reserve a slot under the lock, sleep outside it so other hosts are not blocked
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + delay
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class CompanyMetrics:
+    """Counters for one company, collected by the worker thread that scrapes it"""
+    requests: int = 0
+    request_errors: int = 0
+    bytes_received: int = 0
+    status_codes: Counter = field(default_factory=Counter)
+    parse_seconds: float = 0.0
+
+
+class ScrapeMetrics:
+    """Thread-safe counters for one scraping run, plus per-company counters for the current thread"""
+
+    def __init__(self, platform_name: str):
+        self.platform_name = platform_name
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Zero all counters and restart the clock"""
+        self.started_at = time.perf_counter()
+        self.requests = 0
+        self.request_errors = 0
+        self.bytes_received = 0
+        self.status_codes: Counter = Counter()
+        self.companies_processed = 0
+        self.companies_with_jobs = 0
+        self.companies_failed = 0
+        self.companies_skipped = 0
+        self.jobs_found = 0
+        self.jobs_new = 0
+        self.jobs_updated = 0
+        self.jobs_duplicate = 0
+        self.parse_seconds = 0.0
+
+    def begin_company(self) -> CompanyMetrics:
+        """Start attributing this thread's requests and parse time to a new company"""
+        self._local.company = CompanyMetrics()
+        return self._local.company
+
+    def end_company(self):
+        self._local.company = None
+
+    def attach_company(self, company: Optional[CompanyMetrics]):
+        """Charge this thread's work to another thread's company (used by helper threads)"""
+        self._local.company = company
+
+    @property
+    def current_company(self) -> Optional[CompanyMetrics]:
+        return getattr(self._local, 'company', None)
+
+    def record_request(self, status_code: Optional[int], num_bytes: int = 0):
+        """Record one HTTP request (status_code None means a connection error)"""
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += num_bytes
+            if status_code is None:
+                self.request_errors += 1
+            else:
+                self.status_codes[status_code] += 1
+
+            company = self.current_company
+            if company is not None:
+                company.requests += 1
+                company.bytes_received += num_bytes
+                if status_code is None:
+                    company.request_errors += 1
+                else:
+                    company.status_codes[status_code] += 1
+
+    def record_bytes(self, num_bytes: int):
+        """Add the size of a streamed body, which request() cannot know up front"""
+        with self._lock:
+            self.bytes_received += num_bytes
+            company = self.current_company
+            if company is not None:
+                company.bytes_received += num_bytes
+
+    @contextmanager
+    def parse_timer(self):
+        """Time a parsing step and charge it to the current company"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.parse_seconds += elapsed
+                company = self.current_company
+                if company is not None:
+                    company.parse_seconds += elapsed
+
+    def record_company(self, result: 'ScrapingResult'):
+        """Record the outcome of one company"""
+        with self._lock:
+            self.companies_processed += 1
+            self.jobs_found += result.job_count
+            self.jobs_new += result.new_jobs
+            self.jobs_updated += result.updated_jobs
+            self.jobs_duplicate += result.duplicate_jobs
+            if result.job_count > 0:
+                self.companies_with_jobs += 1
+            elif result.skipped:
+                self.companies_skipped += 1
+            elif not result.success:
+                self.companies_failed += 1
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the counters plus derived throughput"""
+        with self._lock:
+            elapsed = self.elapsed
+            return {
+                'platform': self.platform_name,
+                'elapsed_seconds': round(elapsed, 2),
+                'requests': self.requests,
+                'request_errors': self.request_errors,
+                'bytes_received': self.bytes_received,
+                'status_codes': dict(self.status_codes),
+                'companies_processed': self.companies_processed,
+                'companies_with_jobs': self.companies_with_jobs,
+                'companies_failed': self.companies_failed,
+                'companies_skipped': self.companies_skipped,
+                'jobs_found': self.jobs_found,
+                'jobs_new': self.jobs_new,
+                'jobs_updated': self.jobs_updated,
+                'jobs_duplicate': self.jobs_duplicate,
+                'parse_seconds': round(self.parse_seconds, 2),
+                'companies_per_second': round(self.companies_processed / elapsed, 2) if elapsed else 0.0,
+                'jobs_per_second': round(self.jobs_found / elapsed, 2) if elapsed else 0.0
+            }
+
+    def print_summary(self):
+        """Print the end-of-run summary"""
+        stats = self.snapshot()
+        print(f"\n" + "=" * 60)
+        print(f"🎉 {self.platform_name.upper()} SCRAPING COMPLETED")
+        print(f"=" * 60)
+        print(f"🏢 Companies processed: {stats['companies_processed']}")
+        print(f"✅ Companies with jobs: {stats['companies_with_jobs']}")
+        print(f"❌ Companies failed: {stats['companies_failed']}")
+        if stats['companies_skipped']:
+            print(f"⏭️  Companies skipped (cached failures): {stats['companies_skipped']}")
+        print(f"📄 Jobs found: {stats['jobs_found']}")
+        print(f"💾 Jobs saved: {stats['jobs_new']} new, {stats['jobs_updated']} updated, {stats['jobs_duplicate']} unchanged")
+        print(f"🌐 Requests: {stats['requests']} ({stats['bytes_received'] / 1024:.0f} KB, {stats['request_errors']} errors)")
+        print(f"⏱️  {stats['elapsed_seconds']}s total ({stats['parse_seconds']}s parsing), {stats['companies_per_second']} companies/s, {stats['jobs_per_second']} jobs/s")
+
+
+@dataclass
+class ScrapingResult:
+    """Outcome of scraping a single company"""
+    company: Any
+    platform: str
+    url: Optional[str]
+    status: str
+    job_count: int = 0
+    method: str = ''
+    new_jobs: int = 0
+    duplicate_jobs: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    updated_jobs: int = 0
+    metrics: Optional[CompanyMetrics] = None
+
+    @property
+    def company_name(self) -> str:
+        if isinstance(self.company, dict):
+            return self.company.get('name') or self.company.get('company', '')
+        return str(self.company)
+
+    @property
+    def success(self) -> bool:
+        return self.status.startswith('success')
+
+    @property
+    def skipped(self) -> bool:
+        return self.status.startswith('skipped')
+
+
+class HttpClient:
+    """Pooled HTTP client with retries, per-host rate limiting and request metrics"""
+
+    def __init__(self, rate_limiter: RateLimiter, metrics: ScrapeMetrics,
+                 pool_size: int = 20, timeout: float = 15, max_retries: int = 2,
+                 headers: Dict[str, str] = None, delay: float = None):
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.timeout = timeout
+        self.delay = delay  # Per-host interval for this client when the limiter is shared
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET', 'HEAD')
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+
+    def request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """Send a rate-limited request; returns None on connection errors"""
+        self.rate_limiter.wait(url, self.delay)
+        kwargs.setdefault('timeout', self.timeout)
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            self.metrics.record_request(None)
+            print(f"      ❌ Request failed for {url}: {e}")
+            return None
+
+        num_bytes = 0 if kwargs.get('stream') else len(response.content)
+        self.metrics.record_request(response.status_code, num_bytes)
+        return response
+
+    def get(self, url: str, **kwargs) -> Optional[str]:
+        """Fetch a page and return its text, or None unless the response is 200"""
+        response = self.request('GET', url, **kwargs)
+        if response is None or response.status_code != 200:
+            return None
+        return response.text
+
+    def get_json(self, url: str, **kwargs) -> Optional[Any]:
+        """Fetch a JSON document, or None on error / non-200 / invalid JSON"""
+        response = self.request('GET', url, **kwargs)
+        if response is None or response.status_code != 200:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+class BatchJobWriter:
+    """
+    Batched, thread-safe writer for the jobs and companies tables
+    Each company's jobs are written in one transaction; a KnownJobIndex loaded on
+    first use settles most jobs as new or unchanged, and only the rest share one
+    duplicate lookup
+    """
+
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, db_path: str = None):
+        self.db_path = db_path or get_db_path()
+        self.ensure_schema()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        self._known_jobs = None
+
+    def known_jobs(self) -> KnownJobIndex:
+        """Index of stored link keys and open job versions, loaded on first use (call under the lock)"""
+        if self._known_jobs is None:
+            start = time.perf_counter()
+            total = self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            cursor = self.conn.execute("SELECT link_key, content_hash, closed_at FROM jobs WHERE link_key IS NOT NULL")
+            self._known_jobs = KnownJobIndex.from_rows(cursor, total)
+            print(f"🧮 Loaded {total} known job links in {time.perf_counter() - start:.2f}s")
+        return self._known_jobs
+
+    def ensure_schema(self):
+        """Create the SQLAlchemy tables (and any newer columns/indexes) in the target database"""
+        from sqlalchemy import create_engine
+        from models import migrate_schema
+
+        engine = create_engine(f"sqlite:///{self.db_path}")
+        migrate_schema(engine)
+        engine.dispose()
+
+    def existing_jobs(self, link_keys: Iterable[str]) -> Dict[str, Tuple[int, Optional[str], Optional[str]]]:
+        """Map each stored link key to its (id, content_hash, closed_at)"""
+        link_keys = list(link_keys)
+        found = {}
+        for i in range(0, len(link_keys), self.LOOKUP_CHUNK):
+            chunk = link_keys[i:i + self.LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT link_key, id, content_hash, closed_at FROM jobs WHERE link_key IN ({placeholders})", chunk
+            )
+            found.update((row[0], row[1:]) for row in cursor)
+        return found
+
+    def save_jobs(self, jobs: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """
+        Insert new jobs and rewrite changed ones in one transaction
+        A job is changed when its content hash differs or it had been closed;
+        returns (new, updated, unchanged)
+        """
+        if not jobs:
+            return 0, 0, 0
+
+        now = datetime.now().isoformat(sep=' ')
+        with self._lock:
+            known = self.known_jobs()
+            rows, to_check = [], []
+            seen = set()
+            for job in jobs:
+                # Tracking parameters, /apply suffixes etc. don't make a different job
+                link_key = canonical_job_key(job['link'])
+                if link_key in seen:
+                    continue
+                seen.add(link_key)
+
+                row = {column: self._format_value(job.get(column)) for column in JOB_COLUMNS}
+                row['link_key'] = link_key
+                row['content_hash'] = job_content_hash(job)
+                state = known.classify(link_key, row['content_hash'])
+                if state == KnownJobIndex.UNCHANGED:
+                    continue
+                row['fetched_at'] = row['fetched_at'] or now
+                row['updated_at'] = row['updated_at'] or now
+                rows.append(row)
+                if state == KnownJobIndex.CHECK:
+                    to_check.append(link_key)
+
+            # Only links the index has seen before need the database (edited, closed or false positive)
+            existing = self.existing_jobs(to_check)
+            inserts, updates = [], []
+            for row in rows:
+                stored = existing.get(row['link_key'])
+                if stored is None:
+                    inserts.append(row)
+                elif stored[1] != row['content_hash'] or stored[2] is not None:
+                    updates.append((row, stored))
+
+            try:
+                self.conn.executemany(f"""
+                    INSERT OR IGNORE INTO jobs ({', '.join(JOB_COLUMNS)})
+                    VALUES ({', '.join('?' * len(JOB_COLUMNS))})
+                """, [tuple(row[column] for column in JOB_COLUMNS) for row in inserts])
+                self.conn.executemany(f"""
+                    UPDATE jobs SET {', '.join(f'{column} = ?' for column in UPDATE_COLUMNS)}, closed_at = NULL
+                    WHERE id = ?
+                """, [tuple(row[column] for column in UPDATE_COLUMNS) + (stored[0],) for row, stored in updates])
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"    ❌ Error saving jobs: {e}")
+                return 0, 0, 0
+
+            for row in inserts:
+                known.add(row['link_key'], row['content_hash'])
+            for row, stored in updates:
+                known.add(row['link_key'], row['content_hash'], previous_hash=stored[1])
+
+        return len(inserts), len(updates), len(jobs) - len(inserts) - len(updates)
+
+    def close_missing_jobs(self, company_name: str, platform: str, live_links: Iterable[str]) -> int:
+        """Mark a company's open jobs that are no longer in its feed as closed; returns how many"""
+        live_keys = {canonical_job_key(link) for link in live_links}
+        now = datetime.now().isoformat(sep=' ')
+        with self._lock:
+            try:
+                cursor = self.conn.execute(
+                    "SELECT id, link_key, content_hash FROM jobs WHERE company = ? AND platform = ? AND closed_at IS NULL",
+                    (company_name, platform)
+                )
+                closed = [row for row in cursor if row[1] not in live_keys]
+                self.conn.executemany("UPDATE jobs SET closed_at = ? WHERE id = ?",
+                                      [(now, job_id) for job_id, _, _ in closed])
+                self.conn.commit()
+                if self._known_jobs is not None:
+                    for _, link_key, content_hash in closed:
+                        self._known_jobs.close(link_key, content_hash)
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"    ❌ Error closing jobs for {company_name}: {e}")
+                return 0
+        return len(closed)
+
+    def upsert_company(self, company_name: str, url: str = None, job_count: int = 0) -> Optional[int]:
+        """Insert or update a company row; returns its id"""
+        now = datetime.now().isoformat(sep=' ')
+        with self._lock:
+            try:
+                cursor = self.conn.execute("""
+                    UPDATE companies
+                    SET job_count = ?, url = COALESCE(?, url), last_scraped = ?
+                    WHERE name = ?
+                """, (job_count, url, now, company_name))
+                if cursor.rowcount == 0:
+                    self.conn.execute("""
+                        INSERT INTO companies (name, url, job_count, last_scraped, created_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (company_name, url, job_count, now, now))
+                self.conn.commit()
+                row = self.conn.execute("SELECT id FROM companies WHERE name = ?", (company_name,)).fetchone()
+                return row[0] if row else None
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"    ❌ Error upserting company {company_name}: {e}")
+                return None
+
+    def save_company_result(self, company_name: str, url: str = None, job_count: int = 0) -> Optional[int]:
+        """Alias matching UnifiedDatabaseService.save_company_result"""
+        return self.upsert_company(company_name, url, job_count)
+
+    def record_scrape_run(self, run_id: str, result: 'ScrapingResult', started_at: datetime):
+        """Store one company's telemetry row in the scrape_runs table"""
+        company_metrics = result.metrics or CompanyMetrics()
+        row = (
+            run_id, result.platform, result.company_name, result.url, result.status, result.method,
+            started_at.isoformat(sep=' '), round(result.elapsed, 3), round(company_metrics.parse_seconds, 3),
+            company_metrics.requests, company_metrics.request_errors, company_metrics.bytes_received,
+            json.dumps({str(code): count for code, count in company_metrics.status_codes.items()}),
+            result.job_count, result.new_jobs, result.updated_jobs, result.duplicate_jobs, result.error
+        )
+        with self._lock:
+            try:
+                self.conn.execute("""
+                    INSERT INTO scrape_runs (
+                        run_id, platform, company, url, status, method, started_at, wall_seconds,
+                        parse_seconds, requests, request_errors, bytes_received, status_codes,
+                        jobs_found, jobs_new, jobs_updated, jobs_duplicate, error
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, row)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"    ⚠️  Could not record scrape run for {result.company_name}: {e}")
+
+    def load_strategies(self, platform: str) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Learned strategy state for a platform, keyed by (company, strategy)"""
+        with self._lock:
+            cursor = self.conn.execute("""
+                SELECT company, strategy, url, succeeded, job_count, failures, last_checked, next_check_at
+                FROM scrape_strategies WHERE platform = ?
+            """, (platform,))
+            columns = [description[0] for description in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor]
+
+        state = {}
+        for row in rows:
+            for key in ('last_checked', 'next_check_at'):
+                row[key] = datetime.fromisoformat(row[key]) if row[key] else None
+            row['succeeded'] = bool(row['succeeded'])
+            state[(row['company'], row['strategy'])] = row
+        return state
+
+    def save_strategy(self, platform: str, entry: Dict[str, Any]):
+        """Insert or update one (company, strategy) row of scrape_strategies"""
+        values = (
+            platform, entry['company'], entry['strategy'], entry.get('url'), int(entry['succeeded']),
+            entry.get('job_count', 0), entry.get('failures', 0),
+            self._format_value(entry.get('last_checked')), self._format_value(entry.get('next_check_at'))
+        )
+        with self._lock:
+            try:
+                self.conn.execute("""
+                    INSERT INTO scrape_strategies
+                        (platform, company, strategy, url, succeeded, job_count, failures, last_checked, next_check_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (platform, company, strategy) DO UPDATE SET
+                        url = COALESCE(excluded.url, url), succeeded = excluded.succeeded,
+                        job_count = excluded.job_count, failures = excluded.failures,
+                        last_checked = excluded.last_checked, next_check_at = excluded.next_check_at
+                """, values)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                print(f"    ⚠️  Could not save strategy state for {entry['company']}: {e}")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    @staticmethod
+    def _format_value(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.isoformat(sep=' ')
+        return value
+
+
+class StrategyCache:
+    """
+    Persisted per-company memory of which scraping strategy and URL worked
+    Winning strategies are tried first; failed ones are skipped until an
+    exponentially growing recheck interval has passed
+    """
+
+    def __init__(self, writer: BatchJobWriter, platform_name: str,
+                 base_interval: timedelta = timedelta(days=1), max_interval: timedelta = timedelta(days=30)):
+        self.writer = writer
+        self.platform_name = platform_name
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.state = writer.load_strategies(platform_name)
+        self._lock = threading.Lock()
+
+    def order(self, company_name: str, strategies: List[str]) -> List[str]:
+        """Strategies that are due, most recent winner first, otherwise in default order"""
+        now = datetime.now()
+        due = []
+        for strategy in strategies:
+            entry = self.state.get((company_name, strategy))
+            if entry and not entry['succeeded'] and entry['next_check_at'] and entry['next_check_at'] > now:
+                continue
+            due.append(strategy)
+
+        def rank(strategy):
+            entry = self.state.get((company_name, strategy))
+            if entry and entry['succeeded']:
+                return (0, -(entry['last_checked'] or datetime.min).timestamp())
+            return (1, strategies.index(strategy))
+
+        return sorted(due, key=rank)
+
+    def learned_url(self, company_name: str, strategy: str) -> Optional[str]:
+        entry = self.state.get((company_name, strategy))
+        return entry['url'] if entry and entry['succeeded'] else None
+
+    def prefer_learned(self, company_name: str, strategy: str, urls: List[str]) -> List[str]:
+        """Move the URL that last worked for this strategy to the front"""
+        learned = self.learned_url(company_name, strategy)
+        if learned in urls:
+            return [learned] + [url for url in urls if url != learned]
+        return urls
+
+    def next_check(self, company_name: str) -> Optional[datetime]:
+        """Earliest recheck time across a company's cached failures"""
+        times = [entry['next_check_at'] for (company, _), entry in self.state.items()
+                 if company == company_name and entry['next_check_at']]
+        return min(times) if times else None
+
+    def record_success(self, company_name: str, strategy: str, url: str, job_count: int):
+        self._save({
+            'company': company_name, 'strategy': strategy, 'url': url, 'succeeded': True,
+            'job_count': job_count, 'failures': 0, 'last_checked': datetime.now(), 'next_check_at': None
+        })
+
+    def record_failure(self, company_name: str, strategy: str):
+        """Back off exponentially: 1x, 2x, 4x ... the base interval, capped at max_interval"""
+        previous = self.state.get((company_name, strategy)) or {}
+        failures = previous.get('failures', 0) + 1
+        interval = min(self.base_interval * (2 ** (failures - 1)), self.max_interval)
+        now = datetime.now()
+        self._save({
+            'company': company_name, 'strategy': strategy, 'url': previous.get('url'), 'succeeded': False,
+            'job_count': 0, 'failures': failures, 'last_checked': now, 'next_check_at': now + interval
+        })
+
+    def _save(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.state[(entry['company'], entry['strategy'])] = entry
+        self.writer.save_strategy(self.platform_name, entry)
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for a top-level JSON array
+    feed() text chunks as they arrive and get back the elements completed so far,
+    so a large response never has to be held or decoded as one document
+    """
+
+    WHITESPACE = re.compile(r'\s*')
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.state = 'start'  # start -> value_or_end / value / comma_or_end -> done
+
+    def feed(self, text: str) -> List[Any]:
+        self.buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> List[Any]:
+        """Parse whatever is left; raises ValueError if the array is invalid or truncated"""
+        items = self._drain(final=True)
+        if self.state != 'done':
+            raise ValueError("Truncated JSON array")
+        return items
+
+    def _drain(self, final: bool) -> List[Any]:
+        items = []
+        buffer = self.buffer
+        pos = 0
+        while True:
+            pos = self.WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+
+            if self.state == 'start':
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                self.state = 'value_or_end'
+                pos += 1
+            elif self.state == 'done':
+                raise ValueError("Extra data after JSON array")
+            elif char == ']' and self.state in ('value_or_end', 'comma_or_end'):
+                self.state = 'done'
+                pos += 1
+            elif self.state == 'comma_or_end':
+                if char != ',':
+                    raise ValueError("Expected ',' or ']' between array elements")
+                self.state = 'value'
+                pos += 1
+            else:
+                try:
+                    item, end = self.decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise ValueError("Invalid JSON array element")
+                    break  # Element not complete yet
+                if end == len(buffer) and not final:
+                    break  # A number could still continue in the next chunk
+                items.append(item)
+                self.state = 'comma_or_end'
+                pos = end
+
+        self.buffer = buffer[pos:]
+        return items
+
+
+class JobParser:
+    """Helpers for turning loosely-structured pages into job dicts"""
+
+    GENERIC_PATTERNS = [
+        r'<a[^>]*href="([^"]*(?:job|career|position|opening)[^"]*)"[^>]*>\s*([^<]{6,150}?)\s*</a>',
+        r'<h[2-4][^>]*class="[^"]*(?:job|position|opening)[^"]*"[^>]*>\s*([^<]{6,150}?)\s*</h[2-4]>'
+    ]
+
+    # Link text that is never a job title, matched as whole words ("back to" rejects "Back to jobs", not "Backend")
+    NAVIGATION_PHRASE_PATTERN = re.compile(
+        r'\b(?:newsletter|subscribe|sort by|apply now|cookies?|sign up|sign in|log ?in|about us|contact us|'
+        r'learn more|view all|see all|all jobs|back to|privacy policy|terms of (?:use|service))\b',
+        re.IGNORECASE
+    )
+    # Navigation words that are also part of real titles ("Help Desk Technician", "Career Coach"):
+    # rejected only when they are the whole text
+    NAVIGATION_TITLES = frozenset((
+        'search', 'filter', 'submit', 'back', 'next', 'previous', 'help', 'home', 'contact', 'privacy', 'terms',
+        'career', 'careers', 'benefits', 'our team', 'jobs', 'open positions', 'current openings'
+    ))
+
+    EMPTY_JOB = {
+        'title': '',
+        'department': '',
+        'location': '',
+        'job_type': '',
+        'employment_type': '',
+        'description': '',
+        'job_url': '',
+        'job_id': '',
+        'posted_date': '',
+        'salary_range': ''
+    }
+
+    @classmethod
+    def parse_generic_jobs(cls, content: str) -> List[Dict[str, Any]]:
+        """Extract job-looking links and headings from arbitrary career page HTML"""
+        jobs = []
+        seen_titles = set()
+
+        for pattern in cls.GENERIC_PATTERNS:
+            for match in re.findall(pattern, content, re.IGNORECASE | re.DOTALL):
+                job_url, title = match if isinstance(match, tuple) else ('', match)
+                title = html.unescape(title).strip()
+                if not cls.is_valid_title(title) or title.lower() in seen_titles:
+                    continue
+                seen_titles.add(title.lower())
+                jobs.append({**cls.EMPTY_JOB, 'title': title, 'job_url': html.unescape(job_url)})
+
+            if jobs:
+                break
+
+        return jobs
+
+    @classmethod
+    def is_valid_title(cls, title: str) -> bool:
+        """Check if text looks like a job title rather than navigation"""
+        if not title or len(title) < 5 or len(title) > 150:
+            return False
+        words = ' '.join(re.findall(r'[a-z]+', title.lower()))
+        return words not in cls.NAVIGATION_TITLES and not cls.NAVIGATION_PHRASE_PATTERN.search(title)
+
+    @classmethod
+    def clean_job_data(cls, job: Dict[str, Any], structured: bool = False) -> Dict[str, Any]:
+        """
+        Unescape, trim and fill missing keys of a parsed job. Titles scraped from HTML must pass
+        the navigation filter; structured titles (JSON-LD) are only length-checked
+        """
+        cleaned = dict(cls.EMPTY_JOB)
+        for key, value in job.items():
+            if isinstance(value, str):
+                value = re.sub(r'\s+', ' ', html.unescape(value)).strip()
+            cleaned[key] = value
+
+        title = cleaned['title']
+        valid = 2 <= len(title) <= 150 if structured else cls.is_valid_title(title)
+        if not valid:
+            cleaned['title'] = ''
+        return cleaned
+
+    @staticmethod
+    def html_to_text(content: str) -> str:
+        """Convert (possibly entity-escaped) description HTML into plain text"""
+        if not content:
+            return ''
+        text = html.unescape(content)
+        text = re.sub(r'<\s*(br|/p|/li|/h[1-6]|/div)[^>]*>', '\n', text, flags=re.IGNORECASE)
+        text = re.sub(r'<\s*li[^>]*>', '• ', text, flags=re.IGNORECASE)
+        text = html.unescape(re.sub(r'<[^>]+>', '', text))
+        text = re.sub(r'[ \t\xa0]+', ' ', text)
+        return re.sub(r'\n\s*\n+', '\n\n', text).strip()
+
+    @staticmethod
+    def to_job_record(job: Dict[str, Any], company_name: str, platform: str, page_url: str) -> Dict[str, Any]:
+        """Convert a parsed job into a jobs-table row"""
+        from urllib.parse import urljoin
+
+        link = urljoin(page_url, job['job_url']) if job.get('job_url') else ''
+        if not link:
+            # Pages without per-job links still need a unique, stable link
+            slug = re.sub(r'[^a-z0-9]+', '-', job['title'].lower()).strip('-')
+            link = f"{page_url}#{slug}"
+
+        now = datetime.now()
+        return {
+            'title': job['title'],
+            'company': company_name,
+            'location': job.get('location') or 'No location',
+            'description': job.get('description', ''),
+            'link': link,
+            'platform': platform,
+            'job_type': job.get('employment_type') or job.get('job_type') or '',
+            'work_type': '',
+            'experience_level': '',
+            'salary_range': job.get('salary_range') or 'Salary not specified',
+            'fetched_at': now,
+            'updated_at': now
+        }
+
+
+# Platform registry: platform name -> scraper class
+PLATFORM_REGISTRY: Dict[str, Type['BaseScraper']] = {}
+
+
+def register_platform(name: str):
+    """Class decorator that registers a BaseScraper subclass under a platform name"""
+    def decorator(cls):
+        cls.platform_name = name
+        PLATFORM_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def load_platform_modules() -> Dict[str, Type['BaseScraper']]:
+    """Import every scrapers/<platform>/<platform>_scraper.py so each one registers itself"""
+    for path in sorted(SCRAPERS_DIR.glob('*/*_scraper.py')):
+        module_name = path.stem
+        if module_name in sys.modules:
+            continue
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        except Exception as e:
+            sys.modules.pop(module_name, None)
+            print(f"⚠️  Could not load scraper {path.name}: {e}")
+    return dict(PLATFORM_REGISTRY)
+
+
+def get_scraper(platform_name: str, **kwargs) -> 'BaseScraper':
+    """Instantiate the registered scraper for a platform"""
+    if platform_name not in PLATFORM_REGISTRY:
+        load_platform_modules()
+    if platform_name not in PLATFORM_REGISTRY:
+        raise ValueError(f"Unknown platform: {platform_name} (registered: {sorted(PLATFORM_REGISTRY)})")
+    return PLATFORM_REGISTRY[platform_name](**kwargs)
+
+
+class BaseScraper:
+    """
+    Base class for platform scrapers
+    Subclasses implement scrape_company(); everything performance-critical
+    (pooled HTTP, rate limiting, batched saving, metrics, concurrency) lives here
+    """
+
+    platform_name: str = ''
+    link_patterns: Tuple[str, ...] = ()  # Substrings identifying this platform's tracker links
+    default_delay: float = 0.5           # Seconds between requests to the same host
+    max_workers: int = 4                 # Companies scraped concurrently
+    probe_workers: int = 4               # Candidate URLs probed concurrently per company
+
+    def __init__(self, platform_name: str = None, db_file: str = None,
+                 rate_limiter: RateLimiter = None, writer: BatchJobWriter = None):
+        self.platform_name = platform_name or self.platform_name
+        self.metrics = ScrapeMetrics(self.platform_name)
+        self.rate_limiter = rate_limiter or RateLimiter(self.default_delay)
+        self.http_client = HttpClient(self.rate_limiter, self.metrics, pool_size=max(self.max_workers * 2, 10),
+                                      delay=self.default_delay)
+        self.db = writer or BatchJobWriter(db_file)
+        self._owns_writer = writer is None  # A writer shared by several scrapers is closed by its owner
+        self.tracker_path = Path(get_tracker_path())
+        self.run_id = uuid.uuid4().hex[:12]
+        self._print_lock = threading.Lock()
+
+    # ---- Platform hooks -------------------------------------------------
+
+    def get_platform_config(self) -> Dict[str, Any]:
+        """Platform-specific configuration (URL patterns, API usage)"""
+        return {}
+
+    def matches_link(self, link: str) -> bool:
+        """Check whether a tracker link belongs to this platform"""
+        return any(pattern in link for pattern in self.link_patterns)
+
+    def generate_urls(self, company: Dict[str, Any]) -> List[str]:
+        """URLs to scrape for a company (defaults to its tracker links)"""
+        return company.get('urls', [])
+
+    def parse_jobs(self, content: str, is_api: bool = False) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def scrape_company(self, company: Dict[str, Any]) -> ScrapingResult:
+        raise NotImplementedError
+
+    # ---- Shared helpers -------------------------------------------------
+
+    def load_companies(self) -> List[Dict[str, Any]]:
+        """Load tracker companies that have at least one link for this platform"""
+        if not self.tracker_path.exists():
+            print(f"❌ Company tracker not found: {self.tracker_path}")
+            return []
+
+        with open(self.tracker_path, 'r') as f:
+            data = json.load(f)
+
+        companies = []
+        for entry in data.get('companies', []):
+            job_links = entry.get('job_links') or ([entry['job_link']] if entry.get('job_link') else [])
+            urls = [link for link in job_links if self.matches_link(link)]
+            if urls and entry.get('company'):
+                companies.append({**entry, 'name': entry['company'], 'urls': urls})
+        return companies
+
+    def save_company_jobs(self, company_name: str, url: Optional[str], jobs: List[Dict[str, Any]],
+                          close_missing: bool = False) -> Tuple[int, int, int]:
+        """
+        Save a company's jobs in one batch and refresh its companies row; returns (new, updated, unchanged)
+        close_missing=True means jobs is the company's complete feed, so stored jobs absent from it are closed
+        """
+        new_jobs, updated_jobs, unchanged_jobs = self.db.save_jobs(jobs)
+        self.db.upsert_company(company_name, url, len(jobs))
+        if close_missing:
+            self.close_missing_jobs(company_name, (job['link'] for job in jobs))
+        return new_jobs, updated_jobs, unchanged_jobs
+
+    def close_missing_jobs(self, company_name: str, live_links: Iterable[str]):
+        closed = self.db.close_missing_jobs(company_name, self.platform_name, live_links)
+        if closed:
+            self.log(f"    🔒 {company_name}: closed {closed} jobs no longer listed")
+
+    def probe_first(self, candidates: List[str], probe: Callable[[str], Optional[Any]]) -> Optional[Any]:
+        """
+        Run probe() on up to probe_workers candidates at a time and return the first
+        non-None result; probes not yet started are cancelled, so a company with N dead
+        URLs costs about one timeout instead of N
+        """
+        if not candidates:
+            return None
+
+        company = self.metrics.current_company
+        found = threading.Event()
+
+        def run_probe(candidate):
+            if found.is_set():
+                return None
+            self.metrics.attach_company(company)
+            try:
+                return probe(candidate)
+            finally:
+                self.metrics.end_company()
+
+        executor = ThreadPoolExecutor(max_workers=min(self.probe_workers, len(candidates)))
+        try:
+            futures = [executor.submit(run_probe, candidate) for candidate in candidates]
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"      ⚠️  Probe failed: {e}")
+                    continue
+                if result is not None:
+                    found.set()
+                    return result
+            return None
+        finally:
+            # Don't wait for in-flight probes; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def log(self, message: str):
+        """Print without interleaving lines from concurrent workers"""
+        with self._print_lock:
+            print(message)
+
+    # ---- Concurrent runner ----------------------------------------------
+
+    def _scrape_one(self, company: Dict[str, Any]) -> ScrapingResult:
+        started_at = datetime.now()
+        start = time.perf_counter()
+        company_metrics = self.metrics.begin_company()
+        try:
+            result = self.scrape_company(company)
+        except Exception as e:
+            result = ScrapingResult(company, self.platform_name, None, 'error', error=str(e))
+        finally:
+            self.metrics.end_company()
+        result.elapsed = time.perf_counter() - start
+        result.metrics = company_metrics
+        self.metrics.record_company(result)
+        self.db.record_scrape_run(self.run_id, result, started_at)
+        return result
+
+    def run(self, companies: List[Dict[str, Any]] = None, max_workers: int = None) -> List[ScrapingResult]:
+        """Scrape companies concurrently and print live progress"""
+        if companies is None:
+            companies = self.load_companies()
+        max_workers = max_workers or self.max_workers
+        self.metrics.reset()
+        self.run_id = uuid.uuid4().hex[:12]
+
+        print(f"🚀 {self.platform_name.capitalize()} scraping: {len(companies)} companies, {max_workers} workers (run {self.run_id})")
+        print("=" * 60)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.platform_name) as executor:
+            futures = [executor.submit(self._scrape_one, company) for company in companies]
+            for i, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results.append(result)
+                icon = '✅' if result.job_count else ('⚠️ ' if result.success else ('⏭️ ' if result.skipped else '❌'))
+                detail = f"{result.job_count} jobs ({result.new_jobs} new)" if result.success else (result.error or result.status)
+                self.log(f"{i:3d}/{len(companies)} {icon} {result.company_name}: {detail} [{result.elapsed:.1f}s]")
+
+        self.metrics.print_summary()
+        return results
+
+    def close(self):
+        self.http_client.close()
+        if self._owns_writer:
+            self.db.close()
+
+
+class BoardApiScraper(BaseScraper):
+    """
+    Base for platforms whose public job-board API returns a company's
+    full board (with descriptions) in a single JSON response
+    Subclasses only map URLs and postings; fetching, saving and metrics are shared
+    """
+
+    def api_url(self, company: Dict[str, Any]) -> Optional[str]:
+        """Board API URL for a company, or None if its tracker links have no board token"""
+        raise NotImplementedError
+
+    def extract_postings(self, data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Pull the postings list out of the API payload"""
+        return data if isinstance(data, list) else None
+
+    def process_posting(self, posting: Dict[str, Any], company_name: str) -> Optional[Dict[str, Any]]:
+        """Convert one API posting into a jobs-table row"""
+        raise NotImplementedError
+
+    def scrape_company(self, company: Dict[str, Any]) -> ScrapingResult:
+        """Fetch a company's whole board in one request and save it in one batch"""
+        company_name = company['name']
+        api_url = self.api_url(company)
+        if not api_url:
+            return ScrapingResult(company, self.platform_name, None, 'error_no_board_token')
+
+        response = self.http_client.request('GET', api_url)
+        if response is None:
+            self.db.upsert_company(company_name, api_url, 0)
+            return ScrapingResult(company, self.platform_name, api_url, 'error_request_failed')
+
+        if response.status_code != 200:
+            self.db.upsert_company(company_name, api_url, 0)
+            return ScrapingResult(company, self.platform_name, api_url, f'error_http_{response.status_code}')
+
+        with self.metrics.parse_timer():
+            try:
+                postings = self.extract_postings(response.json())
+            except ValueError:
+                postings = None
+
+            jobs = []
+            for posting in postings or []:
+                try:
+                    job = self.process_posting(posting, company_name)
+                except Exception as e:
+                    self.log(f"    ⚠️  Skipping malformed {self.platform_name} posting for {company_name}: {e}")
+                    continue
+                if job and job['title'] and job['link']:
+                    jobs.append(job)
+
+        if postings is None:
+            self.db.upsert_company(company_name, api_url, 0)
+            return ScrapingResult(company, self.platform_name, api_url, 'error_invalid_json')
+
+        # The API returns the whole board, so anything missing from it has been taken down
+        new_jobs, updated_jobs, duplicate_jobs = self.save_company_jobs(company_name, api_url, jobs, close_missing=True)
+        status = 'success_with_jobs' if jobs else 'success_no_jobs'
+        return ScrapingResult(
+            company, self.platform_name, api_url, status, len(jobs), 'api',
+            new_jobs=new_jobs, duplicate_jobs=duplicate_jobs, updated_jobs=updated_jobs
+        )
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Structured job data extraction
+Fast path for direct career pages: many sites embed schema.org JobPosting blocks
+(<script type="application/ld+json">) or list their postings in a sitemap. Both give
+title, location, employment type, salary and description without any CSS/regex
+guessing, so scrapers try them before falling back to HTML heuristics.
+"""
+
+import json
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from shared_utils import HttpClient, JobParser
+
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+SITEMAP_LINE_PATTERN = re.compile(r'^\s*sitemap\s*:\s*(\S+)', re.IGNORECASE | re.MULTILINE)
+LOC_PATTERN = re.compile(r'<loc>\s*(?:<!\[CDATA\[)?\s*(.*?)\s*(?:\]\]>)?\s*</loc>', re.IGNORECASE | re.DOTALL)
+JOB_URL_PATTERN = re.compile(r'/(?:jobs?|careers?|positions?|openings?|vacanc(?:y|ies)|postings?)/[^/?#]+', re.IGNORECASE)
+JOB_SITEMAP_PATTERN = re.compile(r'job|career|position|opening|vacanc|posting', re.IGNORECASE)
+
+EMPLOYMENT_TYPES = {
+    'FULL_TIME': 'Full-time',
+    'PART_TIME': 'Part-time',
+    'CONTRACTOR': 'Contract',
+    'TEMPORARY': 'Contract',
+    'INTERN': 'Internship',
+    'PER_DIEM': 'Part-time'
+}
+
+SALARY_UNITS = {
+    'HOUR': 'hour',
+    'DAY': 'day',
+    'WEEK': 'week',
+    'MONTH': 'month',
+    'YEAR': 'year'
+}
+
+
+class JsonLdJobParser:
+    """Parse schema.org JobPosting objects out of JSON-LD script blocks"""
+
+    @classmethod
+    def parse(cls, content: str) -> List[Dict[str, Any]]:
+        """All JobPostings on a page as JobParser-style job dicts"""
+        if not content or 'ld+json' not in content:
+            return []
+
+        jobs = []
+        for block in JSON_LD_PATTERN.findall(content):
+            data = cls.load_block(block)
+            if data is None:
+                continue
+            for node in cls.iter_nodes(data):
+                job = cls.to_job(node)
+                if job['title']:
+                    jobs.append(job)
+        return jobs
+
+    @staticmethod
+    def load_block(block: str) -> Optional[Any]:
+        """Decode one script body; tolerates CDATA/comment wrappers and raw newlines in strings"""
+        text = block.strip()
+        text = re.sub(r'^(?:<!--|/\*\s*<!\[CDATA\[\s*\*/|<!\[CDATA\[)', '', text)
+        text = re.sub(r'(?:-->|/\*\s*\]\]>\s*\*/|\]\]>)$', '', text).strip()
+        try:
+            return json.loads(text, strict=False)
+        except ValueError:
+            return None
+
+    @classmethod
+    def iter_nodes(cls, data: Any):
+        """Yield every JobPosting node, looking inside lists, @graph and ItemList wrappers"""
+        if isinstance(data, list):
+            for item in data:
+                yield from cls.iter_nodes(item)
+        elif isinstance(data, dict):
+            types = data.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if 'JobPosting' in types:
+                yield data
+                return
+            for key in ('@graph', 'itemListElement', 'item', 'mainEntity'):
+                if key in data:
+                    yield from cls.iter_nodes(data[key])
+
+    @classmethod
+    def to_job(cls, node: Dict[str, Any]) -> Dict[str, Any]:
+        identifier = node.get('identifier')
+        if isinstance(identifier, dict):
+            identifier = identifier.get('value')
+
+        job = {
+            **JobParser.EMPTY_JOB,
+            'title': cls.text(node.get('title') or node.get('name')),
+            'location': cls.extract_location(node),
+            'employment_type': cls.extract_employment_type(node.get('employmentType')),
+            'salary_range': cls.extract_salary(node.get('baseSalary') or node.get('estimatedSalary')),
+            'job_url': cls.text(node.get('url')),
+            'job_id': cls.text(identifier),
+            'posted_date': cls.text(node.get('datePosted')),
+            'department': cls.text(node.get('occupationalCategory'))
+        }
+        job = JobParser.clean_job_data(job, structured=True)
+        # Cleaned after the whitespace collapse so paragraphs survive
+        job['description'] = JobParser.html_to_text(cls.text(node.get('description')))
+        return job
+
+    @staticmethod
+    def text(value: Any) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, list):
+            value = value[0] if value else ''
+        if isinstance(value, dict):
+            value = value.get('name') or value.get('@value') or ''
+        return str(value).strip()
+
+    @classmethod
+    def extract_location(cls, node: Dict[str, Any]) -> str:
+        """First jobLocation's "City, Region, Country", or Remote for telecommute postings"""
+        if str(node.get('jobLocationType', '')).upper() == 'TELECOMMUTE':
+            return 'Remote'
+
+        locations = node.get('jobLocation') or []
+        if isinstance(locations, dict):
+            locations = [locations]
+        for place in locations:
+            if not isinstance(place, dict):
+                continue
+            address = place.get('address') or {}
+            if isinstance(address, str):
+                return address.strip()
+            parts = [cls.text(address.get(key)) for key in ('addressLocality', 'addressRegion', 'addressCountry')]
+            location = ', '.join(part for part in parts if part)
+            if location:
+                return location
+        return ''
+
+    @staticmethod
+    def extract_employment_type(value: Any) -> str:
+        values = value if isinstance(value, list) else [value]
+        for item in values:
+            if item:
+                key = str(item).strip().upper().replace('-', '_').replace(' ', '_')
+                return EMPLOYMENT_TYPES.get(key, str(item).strip())
+        return ''
+
+    @classmethod
+    def extract_salary(cls, salary: Any) -> str:
+        """Format a MonetaryAmount as "USD 100,000 - 150,000 per year" """
+        if not isinstance(salary, dict):
+            return cls.text(salary)
+
+        currency = cls.text(salary.get('currency'))
+        value = salary.get('value', salary)
+        unit = ''
+        if isinstance(value, dict):
+            unit = SALARY_UNITS.get(cls.text(value.get('unitText')).upper(), '')
+            low, high = value.get('minValue'), value.get('maxValue')
+            single = value.get('value')
+        else:
+            low = high = None
+            single = value
+
+        amounts = [cls.format_amount(amount) for amount in (low, high) if amount not in (None, '')]
+        if not amounts and single not in (None, ''):
+            amounts = [cls.format_amount(single)]
+        if not amounts:
+            return ''
+
+        salary_range = ' - '.join(dict.fromkeys(amounts))
+        if currency:
+            salary_range = f"{currency} {salary_range}"
+        return f"{salary_range} per {unit}" if unit else salary_range
+
+    @staticmethod
+    def format_amount(amount: Any) -> str:
+        try:
+            amount = float(amount)
+            return f"{amount:,.0f}" if amount.is_integer() else f"{amount:,.2f}"
+        except (TypeError, ValueError):
+            return str(amount)
+
+
+class SitemapJobFinder:
+    """Discover job pages through robots.txt / sitemap.xml and read their JSON-LD"""
+
+    def __init__(self, http_client: HttpClient, max_sitemaps: int = 5, max_jobs: int = 25):
+        self.http_client = http_client
+        self.max_sitemaps = max_sitemaps
+        self.max_jobs = max_jobs
+
+    @staticmethod
+    def candidate_urls(domain: str) -> List[str]:
+        """Where a site's sitemaps are usually announced or published"""
+        return [f"https://{domain}/robots.txt", f"https://{domain}/sitemap.xml"]
+
+    @staticmethod
+    def parse_sitemap(content: str) -> Tuple[List[str], List[str]]:
+        """(child sitemaps, page URLs) listed in a sitemap or sitemap index"""
+        locations = [loc.replace('&amp;', '&') for loc in LOC_PATTERN.findall(content)]
+        if '<sitemapindex' in content[:2000].lower():
+            return locations, []
+        return [], locations
+
+    def job_urls(self, start_url: str) -> List[str]:
+        """Job page URLs reachable from robots.txt or a sitemap, job-named sitemaps first"""
+        if start_url.endswith('robots.txt'):
+            robots = self.http_client.get(start_url)
+            queue = SITEMAP_LINE_PATTERN.findall(robots or '')
+        else:
+            queue = [start_url]
+
+        seen_sitemaps = set()
+        job_urls = []
+        while queue and len(seen_sitemaps) < self.max_sitemaps and len(job_urls) < self.max_jobs:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in seen_sitemaps:
+                continue
+            seen_sitemaps.add(sitemap_url)
+
+            content = self.http_client.get(sitemap_url)
+            if not content:
+                continue
+            children, pages = self.parse_sitemap(content)
+            # Job/career sitemaps first, others only if room is left
+            queue.extend(sorted(children, key=lambda url: not JOB_SITEMAP_PATTERN.search(url)))
+            job_urls.extend(url for url in pages if JOB_URL_PATTERN.search(urlparse(url).path))
+
+        return list(dict.fromkeys(job_urls))[:self.max_jobs]
+
+    def find_jobs(self, start_url: str) -> List[Dict[str, Any]]:
+        """JobPostings from the job pages a sitemap lists; pages without JSON-LD are skipped"""
+        jobs = []
+        for page_url in self.job_urls(start_url):
+            content = self.http_client.get(page_url)
+            for job in JsonLdJobParser.parse(content or ''):
+                # A job page is the posting's own URL even if the JSON-LD omits it
+                job['job_url'] = urljoin(page_url, job['job_url'] or page_url)
+                jobs.append(job)
+        return jobs
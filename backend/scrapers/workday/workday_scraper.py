@@ -4,72 +4,38 @@ Workday Job Scraper
 Scrapes jobs from companies that use Workday platform
 """
 
-import json
 import re
-import requests
-import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 import sys
-import os
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
-# Add backend to path for database imports
+# Add scrapers and backend directories to path
+sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from database_service import UnifiedDatabaseService
+from shared_utils import BaseScraper, ScrapingResult, register_platform
 from standardize_locations import LocationStandardizer
+from job_classifier import JobClassifier
 
-class WorkdayScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive'
-        })
-        self.db = UnifiedDatabaseService()
+@register_platform('workday')
+class WorkdayScraper(BaseScraper):
+    link_patterns = ('myworkdayjobs.com',)
+    default_delay = 1.0
+    max_workers = 4  # Each job page is rendered with Selenium
+
+    def __init__(self, db_file: str = None, **kwargs):
+        super().__init__('workday', db_file, **kwargs)
         self.location_standardizer = LocationStandardizer()
-        self.tracker_path = Path(__file__).parent.parent / "company_job_tracker.json"
-        
-    def load_workday_companies(self) -> List[Dict[str, Any]]:
-        """Load companies with Workday job links from tracker"""
-        if not self.tracker_path.exists():
-            print(f"❌ Company tracker not found: {self.tracker_path}")
-            return []
-            
-        with open(self.tracker_path, 'r') as f:
-            data = json.load(f)
-            
-        workday_companies = []
-        for company in data.get('companies', []):
-            job_links = company.get('job_links', [])
-            if not job_links:
-                # Handle old format with single job_link
-                job_links = [company.get('job_link')] if company.get('job_link') else []
-            
-            # Find Workday links
-            workday_links = [link for link in job_links if 'myworkdayjobs.com' in link]
-            if workday_links:
-                workday_companies.append({
-                    'name': company['company'],
-                    'workday_urls': workday_links
-                })
-                
-        return workday_companies
+        self.classifier = JobClassifier()
     
     def fetch_workday_page(self, url: str) -> Optional[str]:
         """Fetch content from Workday page"""
-        try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            return response.text
-        except Exception as e:
-            print(f"      ❌ Failed to fetch {url}: {e}")
-            return None
+        content = self.http_client.get(url)
+        if content is None:
+            print(f"      ❌ Failed to fetch {url}")
+        return content
     
     def extract_job_details_from_page_selenium(self, job_url: str) -> Dict[str, str]:
         """Extract job_type, work_type, location, and description from individual job page using Selenium"""
@@ -233,21 +199,8 @@ class WorkdayScraper:
     
     def extract_work_type_from_location(self, location_text: str) -> str:
         """Extract work_type from location text that might contain remote/hybrid indicators"""
-        if not location_text:
-            return 'On-site'
-        
-        location_lower = location_text.lower()
-        
-        # Check for explicit work type indicators
-        if any(term in location_lower for term in ['remote', 'work from home', 'wfh']):
-            return 'Remote'
-        elif 'hybrid' in location_lower:
-            return 'Hybrid'
-        elif any(term in location_lower for term in ['on-site', 'onsite', 'office', 'resident']):
-            return 'On-site'
-        else:
-            # If it's a pure location (City, State/Country), assume on-site
-            return 'On-site'
+        # Pure locations (City, State/Country) fall through to the On-site default
+        return self.classifier.work_type(location_text or '')
     
     def extract_text_near_element(self, element) -> str:
         """Extract text near an icon element (next sibling, parent, etc.)"""
@@ -280,97 +233,25 @@ class WorkdayScraper:
     
     def normalize_job_type(self, text: str) -> str:
         """Normalize job type text to standard values"""
-        text_lower = text.lower().strip()
-        
-        if 'full' in text_lower and 'time' in text_lower:
-            return 'Full-time'
-        elif 'part' in text_lower and 'time' in text_lower:
-            return 'Part-time'
-        elif 'contract' in text_lower:
-            return 'Contract'
-        elif 'intern' in text_lower:
-            return 'Internship'
-        elif 'temporary' in text_lower or 'temp' in text_lower:
-            return 'Contract'
-        else:
-            return 'Full-time'  # Default
+        return self.classifier.job_type(text)
     
     def normalize_work_type(self, text: str) -> str:
         """Normalize work type text to standard values"""
-        text_lower = text.lower().strip()
-        
-        if 'remote' in text_lower:
-            return 'Remote'
-        elif 'hybrid' in text_lower:
-            return 'Hybrid'
-        elif any(keyword in text_lower for keyword in ['on-site', 'onsite', 'office', 'in-person']):
-            return 'On-site'
-        else:
-            return 'On-site'  # Default
+        return self.classifier.work_type(text)
     
     def extract_job_details_from_data(self, title: str, location: str, subtitles: List[Dict]) -> Dict[str, str]:
         """Extract job_type and work_type from available AJAX data"""
-        details = {
-            'job_type': 'Full-time',  # Default
-            'work_type': 'On-site'    # Default  
-        }
-        
-        # Enhanced job type detection from title
-        title_lower = title.lower()
-        
-        # Job type inference
-        if any(term in title_lower for term in ['intern', 'internship', 'student']):
-            details['job_type'] = 'Internship'
-        elif any(term in title_lower for term in ['contract', 'contractor', 'consultant', 'temp', 'temporary']):
-            details['job_type'] = 'Contract'  
-        elif any(term in title_lower for term in ['part time', 'part-time', 'parttime']):
-            details['job_type'] = 'Part-time'
-        elif any(term in title_lower for term in ['full time', 'full-time', 'fulltime', 'permanent']):
-            details['job_type'] = 'Full-time'
-        # If none found, check subtitles for additional context
-        else:
-            for subtitle in subtitles:
-                if isinstance(subtitle, dict):
-                    instances = subtitle.get('instances', [])
-                    for instance in instances:
-                        if isinstance(instance, dict):
-                            text = instance.get('text', '').lower()
-                            if any(term in text for term in ['intern', 'contract', 'part time', 'temporary']):
-                                if 'intern' in text:
-                                    details['job_type'] = 'Internship'
-                                elif 'contract' in text:
-                                    details['job_type'] = 'Contract'
-                                elif 'part time' in text:
-                                    details['job_type'] = 'Part-time'
-                                break
-        
-        # Work type inference
-        location_lower = location.lower() if location else ''
-        
-        if any(term in title_lower for term in ['remote', 'work from home', 'wfh', 'distributed']):
-            details['work_type'] = 'Remote'
-        elif any(term in title_lower for term in ['hybrid']):
-            details['work_type'] = 'Hybrid'
-        elif any(term in location_lower for term in ['remote', 'work from home', 'anywhere']):
-            details['work_type'] = 'Remote'
-        elif any(term in location_lower for term in ['hybrid']):
-            details['work_type'] = 'Hybrid'
-        else:
-            # Check subtitles for work type info
-            for subtitle in subtitles:
-                if isinstance(subtitle, dict):
-                    instances = subtitle.get('instances', [])
-                    for instance in instances:
-                        if isinstance(instance, dict):
-                            text = instance.get('text', '').lower()
-                            if 'remote' in text:
-                                details['work_type'] = 'Remote'
-                                break
-                            elif 'hybrid' in text:
-                                details['work_type'] = 'Hybrid'
-                                break
+        subtitle_texts = [
+            instance.get('text', '')
+            for subtitle in subtitles if isinstance(subtitle, dict)
+            for instance in subtitle.get('instances', []) if isinstance(instance, dict)
+        ]
         
-        return details
+        # Title first, then location, then subtitles for additional context
+        return {
+            'job_type': self.classifier.job_type(title, *subtitle_texts),
+            'work_type': self.classifier.work_type(title, location or '', *subtitle_texts)
+        }
     
     def fetch_workday_jobs_ajax(self, base_url: str) -> Optional[List[Dict]]:
         """Fetch jobs from Workday using AJAX endpoint"""
@@ -380,7 +261,7 @@ class WorkdayScraper:
             
             # Set appropriate headers for AJAX request
             ajax_headers = {
-                'User-Agent': self.session.headers['User-Agent'],
+                'User-Agent': self.http_client.session.headers['User-Agent'],
                 'Accept': 'application/json, text/plain, */*',
                 'Accept-Language': 'en-US,en;q=0.9',
                 'Referer': base_url,
@@ -388,7 +269,9 @@ class WorkdayScraper:
             }
             
             print(f"      🔗 Trying AJAX endpoint: {ajax_url}")
-            response = self.session.get(ajax_url, headers=ajax_headers, timeout=15)
+            response = self.http_client.request('GET', ajax_url, headers=ajax_headers)
+            if response is None:
+                return None
             
             if response.status_code == 200:
                 data = response.json()
@@ -465,22 +348,14 @@ class WorkdayScraper:
                     # Try to extract location from surrounding elements
                     location = self.extract_workday_location(job_link)
                     
-                    # Create job dictionary
-                    work_type = self.extract_workday_work_type(title, location)
-                    # Standardize location format before final assignment
-                    standardized_location = self.location_standardizer.standardize_location(location) if location else 'No location'
-                    final_location = 'No location' if work_type == 'Remote' else standardized_location
-                    
+                    # Create job dictionary (location and classification filled in by classify_html_jobs)
                     job = {
                         'title': title,
                         'company': '',  # Will be set by caller
-                        'location': final_location,
+                        'location': location,
                         'description': '',  # Could be enhanced by fetching job details
                         'link': job_url,
                         'platform': 'workday',
-                        'job_type': self.extract_workday_job_type(title),
-                        'work_type': work_type,
-                        'experience_level': self.extract_workday_experience_level(title),
                         'salary_range': '',
                         'fetched_at': datetime.now(),
                         'updated_at': datetime.now()
@@ -518,9 +393,6 @@ class WorkdayScraper:
                                 'description': '',
                                 'link': job_url,
                                 'platform': 'workday',
-                                'job_type': '',
-                                'work_type': 'On-site',  # Default value
-                                'experience_level': '',
                                 'salary_range': '',
                                 'fetched_at': datetime.now(),
                                 'updated_at': datetime.now()
@@ -533,6 +405,8 @@ class WorkdayScraper:
             print(f"      ❌ Error parsing HTML with BeautifulSoup: {e}")
             return []
         
+        self.classify_html_jobs(jobs)
+        
         # Remove duplicates based on title and link
         seen_jobs = set()
         unique_jobs = []
@@ -621,7 +495,7 @@ class WorkdayScraper:
                     'platform': 'workday',
                     'job_type': job_details['job_type'],  # From actual job page
                     'work_type': work_type,
-                    'experience_level': self.extract_workday_experience_level(title),
+                    'experience_level': self.extract_workday_experience_level(title, job_details['job_type']),
                     'salary_range': '',
                     'fetched_at': datetime.now(),
                     'updated_at': datetime.now()
@@ -636,6 +510,17 @@ class WorkdayScraper:
         print(f"      ✅ Successfully parsed {len(jobs)} jobs from AJAX data")
         return jobs
     
+    def classify_html_jobs(self, jobs: List[Dict[str, Any]]):
+        """Classify all jobs parsed from one HTML page in a single batch, then standardize locations"""
+        labels = self.classifier.classify_batch([
+            {'title': job['title'], 'work_type': job['location']} for job in jobs
+        ])
+        for job, label in zip(jobs, labels):
+            job.update(label)
+            location = job['location']
+            standardized_location = self.location_standardizer.standardize_location(location) if location else 'No location'
+            job['location'] = 'No location' if label['work_type'] == 'Remote' else standardized_location
+    
     def is_valid_job_title(self, title: str) -> bool:
         """Check if title looks like a valid job title"""
         if not title or len(title) < 3 or len(title) > 150:
@@ -684,21 +569,9 @@ class WorkdayScraper:
         except Exception as e:
             return ''
     
-    def extract_workday_experience_level(self, title: str) -> str:
+    def extract_workday_experience_level(self, title: str, job_type: str = None) -> str:
         """Extract standardized experience level from Workday job title (Entry Level, Mid, Senior, Lead)"""
-        title_lower = title.lower()
-        
-        # Senior level indicators
-        if any(term in title_lower for term in ['senior', 'sr.', 'sr ']):
-            return 'Senior'
-        # Leadership level indicators
-        elif any(term in title_lower for term in ['lead', 'principal', 'staff', 'director', 'manager', 'head of', 'vp', 'vice president']):
-            return 'Lead'
-        # Entry level indicators
-        elif any(term in title_lower for term in ['junior', 'jr.', 'jr ', 'entry', 'associate', 'graduate', 'new grad', 'intern', 'student']):
-            return 'Entry Level'
-        else:
-            return 'Mid'
+        return self.classifier.experience_level(title, job_type)
     
     
     def extract_location_from_title(self, title: str) -> str:
@@ -709,15 +582,16 @@ class WorkdayScraper:
             return location_match.group(1).strip()
         return ''
     
-    def scrape_company(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
+    def scrape_company(self, company: Dict[str, Any]) -> ScrapingResult:
         """Scrape jobs for a single company using AJAX method"""
-        company_name = company_data['name']
-        workday_urls = company_data['workday_urls']
+        company_name = company['name']
+        workday_urls = company['urls']
         
         print(f"  📊 Scraping {company_name} ({len(workday_urls)} Workday URLs)...")
         
         all_jobs = []
         successful_urls = []
+        method = ''
         
         for url in workday_urls:
             print(f"    🌐 Trying: {url}")
@@ -727,12 +601,9 @@ class WorkdayScraper:
             if job_items:
                 jobs = self.parse_workday_jobs_from_ajax(job_items, url)
                 if jobs:
-                    # Set company name for all jobs
-                    for job in jobs:
-                        job['company'] = company_name
-                    
                     all_jobs.extend(jobs)
                     successful_urls.append(url)
+                    method = 'ajax'
                     print(f"      ✅ Found {len(jobs)} jobs via AJAX")
                 else:
                     print(f"      ⚠️  AJAX response received but no valid jobs parsed")
@@ -741,46 +612,34 @@ class WorkdayScraper:
                 print(f"      🔄 AJAX failed, trying HTML fallback...")
                 content = self.fetch_workday_page(url)
                 if content:
-                    jobs = self.parse_workday_jobs(content, url)
+                    with self.metrics.parse_timer():
+                        jobs = self.parse_workday_jobs(content, url)
                     if jobs:
-                        # Set company name for all jobs
-                        for job in jobs:
-                            job['company'] = company_name
-                        
                         all_jobs.extend(jobs)
                         successful_urls.append(url)
+                        method = method or 'html'
                         print(f"      ✅ Found {len(jobs)} jobs via HTML")
                     else:
                         print(f"      ⚠️  HTML loaded but no jobs found")
                 else:
                     print(f"      ❌ Both AJAX and HTML methods failed")
-            
-            # Rate limiting
-            time.sleep(1.0)
         
-        return {
-            'company': company_name,
-            'jobs': all_jobs,
-            'successful_urls': successful_urls,
-            'total_jobs': len(all_jobs)
-        }
-    
-    def save_jobs_to_database(self, jobs: List[Dict[str, Any]]) -> int:
-        """Save jobs to database"""
-        if not jobs:
-            return 0
-            
-        saved_count = 0
-        for job in jobs:
-            try:
-                # Save job (the service handles duplicate checking by link)
-                self.db.save_scraped_job(job)
-                saved_count += 1
-            except Exception as e:
-                print(f"    ❌ Error saving job {job['title']}: {e}")
-                continue
-                
-        return saved_count
+        # Set company name for all jobs
+        for job in all_jobs:
+            job['company'] = company_name
+        
+        company_url = successful_urls[0] if successful_urls else workday_urls[0]
+        new_jobs, updated_jobs, duplicate_jobs = self.save_company_jobs(company_name, company_url, all_jobs)
+        
+        if all_jobs:
+            status = 'success_with_jobs'
+        else:
+            status = 'success_no_jobs' if successful_urls else 'error_no_jobs'
+        
+        return ScrapingResult(
+            company, self.platform_name, company_url, status, len(all_jobs), method,
+            new_jobs=new_jobs, duplicate_jobs=duplicate_jobs, updated_jobs=updated_jobs
+        )
     
     def run_scraping(self) -> Dict[str, Any]:
         """Run the complete Workday scraping process"""
@@ -788,7 +647,7 @@ class WorkdayScraper:
         print("=" * 50)
         
         # Load companies with Workday links
-        companies = self.load_workday_companies()
+        companies = self.load_companies()
         if not companies:
             return {
                 'success': False,
@@ -797,55 +656,25 @@ class WorkdayScraper:
         
         print(f"📋 Found {len(companies)} companies with Workday job pages")
         
-        total_jobs = 0
-        successful_companies = 0
-        failed_companies = 0
-        all_results = []
-        
-        for i, company_data in enumerate(companies, 1):
-            print(f"\n[{i}/{len(companies)}] {company_data['name']}")
-            
-            try:
-                result = self.scrape_company(company_data)
-                all_results.append(result)
-                
-                if result['total_jobs'] > 0:
-                    # Save jobs to database
-                    saved_count = self.save_jobs_to_database(result['jobs'])
-                    total_jobs += saved_count
-                    successful_companies += 1
-                    print(f"  ✅ Saved {saved_count} new jobs to database")
-                else:
-                    failed_companies += 1
-                    print(f"  ⚠️  No jobs found")
-                    
-            except Exception as e:
-                print(f"  ❌ Error scraping {company_data['name']}: {e}")
-                failed_companies += 1
-                continue
-        
-        # Summary
-        print(f"\n" + "=" * 50)
-        print(f"📊 WORKDAY SCRAPING SUMMARY")
-        print(f"   🏢 Companies processed: {len(companies)}")
-        print(f"   ✅ Successful: {successful_companies}")
-        print(f"   ❌ Failed: {failed_companies}")
-        print(f"   💼 Total jobs saved: {total_jobs}")
-        print(f"   📈 Average jobs per company: {total_jobs/max(successful_companies,1):.1f}")
+        results = self.run(companies)
+        stats = self.metrics.snapshot()
         
         return {
             'success': True,
-            'companies_processed': len(companies),
-            'successful_companies': successful_companies,
-            'failed_companies': failed_companies,
-            'total_jobs_saved': total_jobs,
-            'results': all_results
+            'companies_processed': stats['companies_processed'],
+            'successful_companies': stats['companies_with_jobs'],
+            'failed_companies': stats['companies_processed'] - stats['companies_with_jobs'],
+            'total_jobs_saved': stats['jobs_new'],
+            'results': results
         }
 
 def main():
     """Main entry point"""
     scraper = WorkdayScraper()
-    result = scraper.run_scraping()
+    try:
+        result = scraper.run_scraping()
+    finally:
+        scraper.close()
     
     if not result['success']:
         print(f"❌ Scraping failed: {result.get('error')}")
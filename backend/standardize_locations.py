@@ -0,0 +1,1003 @@
+#!/usr/bin/env python3
+"""
+Location standardization engine
+Shared by the scrapers, /jobs/search and /jobs/countries so every location string
+is interpreted the same way.
+
+The gazetteer (countries, states/provinces, cities, regions and their aliases) is
+compiled once at import into a token trie. Each raw location is split into
+comma-style segments and matched longest-first against the trie, so a lookup costs
+O(tokens) instead of a scan over every known place name. Parsed results are kept
+in a bounded LRU keyed by the raw string - job boards repeat the same handful of
+office locations thousands of times.
+
+Run directly for a microbenchmark, or pass location strings to standardize them:
+    python standardize_locations.py
+    python standardize_locations.py "Bengaluru, IND" "Denver, CO, USA"
+"""
+
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+CACHE_SIZE = 8192
+
+# name | ISO2 | ISO3 | aliases (";" separated)
+COUNTRY_DATA = """
+Afghanistan|AF|AFG|
+Albania|AL|ALB|
+Algeria|DZ|DZA|
+Andorra|AD|AND|
+Angola|AO|AGO|
+Argentina|AR|ARG|
+Armenia|AM|ARM|
+Australia|AU|AUS|
+Austria|AT|AUT|Osterreich
+Azerbaijan|AZ|AZE|
+Bahamas|BS|BHS|The Bahamas
+Bahrain|BH|BHR|
+Bangladesh|BD|BGD|
+Barbados|BB|BRB|
+Belarus|BY|BLR|
+Belgium|BE|BEL|Belgique;Belgie
+Belize|BZ|BLZ|
+Benin|BJ|BEN|
+Bhutan|BT|BTN|
+Bolivia|BO|BOL|
+Bosnia and Herzegovina|BA|BIH|Bosnia
+Botswana|BW|BWA|
+Brazil|BR|BRA|Brasil
+Brunei|BN|BRN|Brunei Darussalam
+Bulgaria|BG|BGR|
+Burkina Faso|BF|BFA|
+Burundi|BI|BDI|
+Cambodia|KH|KHM|
+Cameroon|CM|CMR|
+Canada|CA|CAN|
+Cape Verde|CV|CPV|Cabo Verde
+Central African Republic|CF|CAF|
+Chad|TD|TCD|
+Chile|CL|CHL|
+China|CN|CHN|PRC;People's Republic of China;Mainland China
+Colombia|CO|COL|
+Comoros|KM|COM|
+Congo|CG|COG|Democratic Republic of the Congo;DRC;Republic of the Congo
+Costa Rica|CR|CRI|
+Croatia|HR|HRV|Hrvatska
+Cuba|CU|CUB|
+Cyprus|CY|CYP|
+Czech Republic|CZ|CZE|Czechia
+Denmark|DK|DNK|Danmark
+Djibouti|DJ|DJI|
+Dominica|DM|DMA|
+Dominican Republic|DO|DOM|
+Ecuador|EC|ECU|
+Egypt|EG|EGY|
+El Salvador|SV|SLV|
+Equatorial Guinea|GQ|GNQ|
+Eritrea|ER|ERI|
+Estonia|EE|EST|
+Eswatini|SZ|SWZ|Swaziland
+Ethiopia|ET|ETH|
+Fiji|FJ|FJI|
+Finland|FI|FIN|Suomi
+France|FR|FRA|
+Gabon|GA|GAB|
+Gambia|GM|GMB|The Gambia
+Georgia|GE|GEO|
+Germany|DE|DEU|Deutschland
+Ghana|GH|GHA|
+Greece|GR|GRC|Hellas
+Grenada|GD|GRD|
+Guatemala|GT|GTM|
+Guinea|GN|GIN|
+Guinea-Bissau|GW|GNB|
+Guyana|GY|GUY|
+Haiti|HT|HTI|
+Honduras|HN|HND|
+Hungary|HU|HUN|Magyarorszag
+Iceland|IS|ISL|
+India|IN|IND|Bharat
+Indonesia|ID|IDN|
+Iran|IR|IRN|
+Iraq|IQ|IRQ|
+Ireland|IE|IRL|Republic of Ireland;Eire
+Israel|IL|ISR|
+Italy|IT|ITA|Italia
+Jamaica|JM|JAM|
+Japan|JP|JPN|Nippon
+Jordan|JO|JOR|
+Kazakhstan|KZ|KAZ|
+Kenya|KE|KEN|
+Kiribati|KI|KIR|
+Kuwait|KW|KWT|
+Kyrgyzstan|KG|KGZ|
+Laos|LA|LAO|
+Latvia|LV|LVA|
+Lebanon|LB|LBN|
+Lesotho|LS|LSO|
+Liberia|LR|LBR|
+Libya|LY|LBY|
+Liechtenstein|LI|LIE|
+Lithuania|LT|LTU|
+Luxembourg|LU|LUX|
+Madagascar|MG|MDG|
+Malawi|MW|MWI|
+Malaysia|MY|MYS|
+Maldives|MV|MDV|
+Mali|ML|MLI|
+Malta|MT|MLT|
+Marshall Islands|MH|MHL|
+Mauritania|MR|MRT|
+Mauritius|MU|MUS|
+Mexico|MX|MEX|
+Micronesia|FM|FSM|
+Moldova|MD|MDA|
+Monaco|MC|MCO|
+Mongolia|MN|MNG|
+Montenegro|ME|MNE|
+Morocco|MA|MAR|Maroc
+Mozambique|MZ|MOZ|
+Myanmar|MM|MMR|Burma
+Namibia|NA|NAM|
+Nauru|NR|NRU|
+Nepal|NP|NPL|
+Netherlands|NL|NLD|The Netherlands;Holland;Nederland
+New Zealand|NZ|NZL|Aotearoa
+Nicaragua|NI|NIC|
+Niger|NE|NER|
+Nigeria|NG|NGA|
+North Korea|KP|PRK|
+North Macedonia|MK|MKD|Macedonia
+Norway|NO|NOR|Norge
+Oman|OM|OMN|
+Pakistan|PK|PAK|
+Palau|PW|PLW|
+Palestine|PS|PSE|
+Panama|PA|PAN|
+Papua New Guinea|PG|PNG|
+Paraguay|PY|PRY|
+Peru|PE|PER|
+Philippines|PH|PHL|
+Poland|PL|POL|Polska
+Portugal|PT|PRT|
+Qatar|QA|QAT|
+Romania|RO|ROU|
+Russia|RU|RUS|Russian Federation
+Rwanda|RW|RWA|
+Saint Kitts and Nevis|KN|KNA|
+Saint Lucia|LC|LCA|
+Saint Vincent and the Grenadines|VC|VCT|
+Samoa|WS|WSM|
+San Marino|SM|SMR|
+Sao Tome and Principe|ST|STP|
+Saudi Arabia|SA|SAU|KSA
+Senegal|SN|SEN|
+Serbia|RS|SRB|
+Seychelles|SC|SYC|
+Sierra Leone|SL|SLE|
+Singapore|SG|SGP|
+Slovakia|SK|SVK|Slovak Republic
+Slovenia|SI|SVN|
+Solomon Islands|SB|SLB|
+Somalia|SO|SOM|
+South Africa|ZA|ZAF|
+South Korea|KR|KOR|Korea;Republic of Korea;Korea Republic of
+South Sudan|SS|SSD|
+Spain|ES|ESP|Espana
+Sri Lanka|LK|LKA|
+Sudan|SD|SDN|
+Suriname|SR|SUR|
+Sweden|SE|SWE|Sverige
+Switzerland|CH|CHE|Schweiz;Suisse
+Syria|SY|SYR|
+Taiwan|TW|TWN|
+Tajikistan|TJ|TJK|
+Tanzania|TZ|TZA|
+Thailand|TH|THA|
+Timor-Leste|TL|TLS|East Timor
+Togo|TG|TGO|
+Tonga|TO|TON|
+Trinidad and Tobago|TT|TTO|
+Tunisia|TN|TUN|
+Turkey|TR|TUR|Turkiye
+Turkmenistan|TM|TKM|
+Tuvalu|TV|TUV|
+Uganda|UG|UGA|
+Ukraine|UA|UKR|
+United Arab Emirates|AE|ARE|UAE;U.A.E.;Emirates
+United Kingdom|GB|GBR|UK;U.K.;Great Britain;Britain;England;Scotland;Wales;Northern Ireland
+United States|US|USA|U.S.;U.S.A.;United States of America;America
+Uruguay|UY|URY|
+Uzbekistan|UZ|UZB|
+Vanuatu|VU|VUT|
+Vatican City|VA|VAT|Holy See
+Venezuela|VE|VEN|
+Vietnam|VN|VNM|Viet Nam
+Yemen|YE|YEM|
+Zambia|ZM|ZMB|
+Zimbabwe|ZW|ZWE|
+"""
+
+# country | code | name
+STATE_DATA = """
+United States|AL|Alabama
+United States|AK|Alaska
+United States|AZ|Arizona
+United States|AR|Arkansas
+United States|CA|California
+United States|CO|Colorado
+United States|CT|Connecticut
+United States|DE|Delaware
+United States|DC|District of Columbia
+United States|FL|Florida
+United States|GA|Georgia
+United States|HI|Hawaii
+United States|ID|Idaho
+United States|IL|Illinois
+United States|IN|Indiana
+United States|IA|Iowa
+United States|KS|Kansas
+United States|KY|Kentucky
+United States|LA|Louisiana
+United States|ME|Maine
+United States|MD|Maryland
+United States|MA|Massachusetts
+United States|MI|Michigan
+United States|MN|Minnesota
+United States|MS|Mississippi
+United States|MO|Missouri
+United States|MT|Montana
+United States|NE|Nebraska
+United States|NV|Nevada
+United States|NH|New Hampshire
+United States|NJ|New Jersey
+United States|NM|New Mexico
+United States|NY|New York
+United States|NC|North Carolina
+United States|ND|North Dakota
+United States|OH|Ohio
+United States|OK|Oklahoma
+United States|OR|Oregon
+United States|PA|Pennsylvania
+United States|RI|Rhode Island
+United States|SC|South Carolina
+United States|SD|South Dakota
+United States|TN|Tennessee
+United States|TX|Texas
+United States|UT|Utah
+United States|VT|Vermont
+United States|VA|Virginia
+United States|WA|Washington
+United States|WV|West Virginia
+United States|WI|Wisconsin
+United States|WY|Wyoming
+Canada|AB|Alberta
+Canada|BC|British Columbia
+Canada|MB|Manitoba
+Canada|NB|New Brunswick
+Canada|NL|Newfoundland and Labrador
+Canada|NS|Nova Scotia
+Canada|NT|Northwest Territories
+Canada|NU|Nunavut
+Canada|ON|Ontario
+Canada|PE|Prince Edward Island
+Canada|QC|Quebec
+Canada|SK|Saskatchewan
+Canada|YT|Yukon
+Australia|NSW|New South Wales
+Australia|VIC|Victoria
+Australia|QLD|Queensland
+Australia|WA|Western Australia
+Australia|SA|South Australia
+Australia|TAS|Tasmania
+Australia|ACT|Australian Capital Territory
+Australia|NT|Northern Territory
+"""
+
+# city | country | state code | aliases (";" separated)
+CITY_DATA = """
+New York|United States|NY|NYC;New York City;Manhattan;Brooklyn
+San Francisco|United States|CA|SF;San Francisco Bay Area;Bay Area
+Los Angeles|United States|CA|
+San Jose|United States|CA|
+Palo Alto|United States|CA|
+Mountain View|United States|CA|
+Menlo Park|United States|CA|
+Sunnyvale|United States|CA|
+Cupertino|United States|CA|
+Santa Clara|United States|CA|
+Redwood City|United States|CA|
+San Mateo|United States|CA|
+Foster City|United States|CA|
+South San Francisco|United States|CA|
+San Bruno|United States|CA|
+Fremont|United States|CA|
+Milpitas|United States|CA|
+Oakland|United States|CA|
+Berkeley|United States|CA|
+San Diego|United States|CA|
+Irvine|United States|CA|
+Sacramento|United States|CA|
+Santa Monica|United States|CA|
+Santa Barbara|United States|CA|
+Pasadena|United States|CA|
+Burbank|United States|CA|
+Culver City|United States|CA|
+Seattle|United States|WA|
+Bellevue|United States|WA|
+Redmond|United States|WA|
+Kirkland|United States|WA|
+Portland|United States|OR|
+Austin|United States|TX|
+Dallas|United States|TX|
+Houston|United States|TX|
+San Antonio|United States|TX|
+Plano|United States|TX|
+Denver|United States|CO|
+Boulder|United States|CO|
+Chicago|United States|IL|
+Boston|United States|MA|
+Atlanta|United States|GA|
+Miami|United States|FL|
+Tampa|United States|FL|
+Orlando|United States|FL|
+Jacksonville|United States|FL|
+Boca Raton|United States|FL|
+Fort Lauderdale|United States|FL|
+Phoenix|United States|AZ|
+Scottsdale|United States|AZ|
+Tempe|United States|AZ|
+Salt Lake City|United States|UT|
+Lehi|United States|UT|
+Minneapolis|United States|MN|
+Detroit|United States|MI|
+Ann Arbor|United States|MI|
+Pittsburgh|United States|PA|
+Philadelphia|United States|PA|
+Washington|United States|DC|Washington DC;Washington D.C.
+Arlington|United States|VA|
+Reston|United States|VA|
+Herndon|United States|VA|
+McLean|United States|VA|
+Richmond|United States|VA|
+Raleigh|United States|NC|
+Charlotte|United States|NC|
+Nashville|United States|TN|
+Memphis|United States|TN|
+Columbus|United States|OH|
+Cleveland|United States|OH|
+Cincinnati|United States|OH|
+Indianapolis|United States|IN|
+St. Louis|United States|MO|Saint Louis;St Louis
+Kansas City|United States|MO|
+Las Vegas|United States|NV|
+Baltimore|United States|MD|
+Newark|United States|NJ|
+Jersey City|United States|NJ|
+Hoboken|United States|NJ|
+Princeton|United States|NJ|
+Stamford|United States|CT|
+New Haven|United States|CT|
+Providence|United States|RI|
+Madison|United States|WI|
+Milwaukee|United States|WI|
+Omaha|United States|NE|
+Boise|United States|ID|
+Albuquerque|United States|NM|
+Honolulu|United States|HI|
+Anchorage|United States|AK|
+New Orleans|United States|LA|
+Louisville|United States|KY|
+Charleston|United States|SC|
+Toronto|Canada|ON|
+Ottawa|Canada|ON|
+Waterloo|Canada|ON|
+Kitchener|Canada|ON|
+Mississauga|Canada|ON|
+Vancouver|Canada|BC|
+Montreal|Canada|QC|
+Quebec City|Canada|QC|
+Calgary|Canada|AB|
+Edmonton|Canada|AB|
+Winnipeg|Canada|MB|
+Halifax|Canada|NS|
+Mexico City|Mexico||Ciudad de Mexico;CDMX
+Guadalajara|Mexico||
+Monterrey|Mexico||
+Sao Paulo|Brazil||
+Rio de Janeiro|Brazil||
+Belo Horizonte|Brazil||
+Brasilia|Brazil||
+Curitiba|Brazil||
+Porto Alegre|Brazil||
+Florianopolis|Brazil||
+Recife|Brazil||
+Buenos Aires|Argentina||
+Santiago|Chile||
+Bogota|Colombia||
+Medellin|Colombia||
+Lima|Peru||
+Montevideo|Uruguay||
+Caracas|Venezuela||
+Quito|Ecuador||
+London|United Kingdom||
+Manchester|United Kingdom||
+Edinburgh|United Kingdom||
+Glasgow|United Kingdom||
+Birmingham|United Kingdom||
+Bristol|United Kingdom||
+Leeds|United Kingdom||
+Cambridge|United Kingdom||
+Oxford|United Kingdom||
+Belfast|United Kingdom||
+Cardiff|United Kingdom||
+Liverpool|United Kingdom||
+Newcastle|United Kingdom||Newcastle upon Tyne
+Reading|United Kingdom||
+Brighton|United Kingdom||
+Nottingham|United Kingdom||
+Sheffield|United Kingdom||
+Dublin|Ireland||
+Cork|Ireland||
+Galway|Ireland||
+Limerick|Ireland||
+Berlin|Germany||
+Munich|Germany||Munchen;Muenchen
+Hamburg|Germany||
+Frankfurt|Germany||Frankfurt am Main
+Cologne|Germany||Koln;Koeln
+Stuttgart|Germany||
+Dusseldorf|Germany||Duesseldorf
+Leipzig|Germany||
+Dresden|Germany||
+Nuremberg|Germany||Nurnberg;Nuernberg
+Karlsruhe|Germany||
+Bonn|Germany||
+Hanover|Germany||Hannover
+Paris|France||
+Lyon|France||
+Marseille|France||
+Toulouse|France||
+Nice|France||
+Bordeaux|France||
+Lille|France||
+Nantes|France||
+Grenoble|France||
+Sophia Antipolis|France||
+Amsterdam|Netherlands||
+Rotterdam|Netherlands||
+The Hague|Netherlands||Den Haag
+Utrecht|Netherlands||
+Eindhoven|Netherlands||
+Delft|Netherlands||
+Brussels|Belgium||Bruxelles;Brussel
+Antwerp|Belgium||Antwerpen
+Ghent|Belgium||Gent
+Zurich|Switzerland||
+Geneva|Switzerland||Geneve
+Basel|Switzerland||
+Lausanne|Switzerland||
+Bern|Switzerland||
+Zug|Switzerland||
+Vienna|Austria||Wien
+Graz|Austria||
+Madrid|Spain||
+Barcelona|Spain||
+Valencia|Spain||
+Seville|Spain||Sevilla
+Malaga|Spain||
+Bilbao|Spain||
+Lisbon|Portugal||Lisboa
+Porto|Portugal||
+Rome|Italy||Roma
+Milan|Italy||Milano
+Turin|Italy||Torino
+Florence|Italy||Firenze
+Naples|Italy||Napoli
+Bologna|Italy||
+Stockholm|Sweden||
+Gothenburg|Sweden||Goteborg
+Malmo|Sweden||
+Copenhagen|Denmark||Kobenhavn
+Aarhus|Denmark||
+Oslo|Norway||
+Bergen|Norway||
+Stavanger|Norway||
+Trondheim|Norway||
+Helsinki|Finland||
+Espoo|Finland||
+Tampere|Finland||
+Reykjavik|Iceland||
+Warsaw|Poland||Warszawa
+Krakow|Poland||Cracow
+Wroclaw|Poland||
+Gdansk|Poland||
+Poznan|Poland||
+Lodz|Poland||
+Prague|Czech Republic||Praha
+Brno|Czech Republic||
+Budapest|Hungary||
+Bucharest|Romania||Bucuresti
+Cluj-Napoca|Romania||Cluj
+Iasi|Romania||
+Sofia|Bulgaria||
+Belgrade|Serbia||Beograd
+Zagreb|Croatia||
+Athens|Greece||
+Istanbul|Turkey||
+Ankara|Turkey||
+Izmir|Turkey||
+Kyiv|Ukraine||Kiev
+Lviv|Ukraine||
+Kharkiv|Ukraine||
+Tallinn|Estonia||
+Riga|Latvia||
+Vilnius|Lithuania||
+Bratislava|Slovakia||
+Ljubljana|Slovenia||
+Moscow|Russia||
+Saint Petersburg|Russia||St Petersburg;St. Petersburg
+Minsk|Belarus||
+Limassol|Cyprus||
+Nicosia|Cyprus||
+Valletta|Malta||
+Dubai|United Arab Emirates||
+Abu Dhabi|United Arab Emirates||
+Tel Aviv|Israel||Tel Aviv-Yafo
+Jerusalem|Israel||
+Haifa|Israel||
+Herzliya|Israel||
+Riyadh|Saudi Arabia||
+Jeddah|Saudi Arabia||
+Doha|Qatar||
+Cairo|Egypt||
+Amman|Jordan||
+Beirut|Lebanon||
+Lagos|Nigeria||
+Abuja|Nigeria||
+Nairobi|Kenya||
+Cape Town|South Africa||
+Johannesburg|South Africa||
+Durban|South Africa||
+Pretoria|South Africa||
+Casablanca|Morocco||
+Accra|Ghana||
+Kigali|Rwanda||
+Tunis|Tunisia||
+Tokyo|Japan||
+Osaka|Japan||
+Kyoto|Japan||
+Yokohama|Japan||
+Fukuoka|Japan||
+Seoul|South Korea||
+Busan|South Korea||
+Pangyo|South Korea||
+Beijing|China||
+Shanghai|China||
+Shenzhen|China||
+Guangzhou|China||
+Hangzhou|China||
+Chengdu|China||
+Suzhou|China||
+Hong Kong|China||
+Taipei|Taiwan||
+Hsinchu|Taiwan||
+Bangalore|India||Bengaluru
+Mumbai|India||Bombay
+Delhi|India||New Delhi
+Gurgaon|India||Gurugram
+Noida|India||
+Hyderabad|India||
+Chennai|India||Madras
+Pune|India||
+Kolkata|India||Calcutta
+Ahmedabad|India||
+Jaipur|India||
+Kochi|India||Cochin
+Coimbatore|India||
+Karachi|Pakistan||
+Lahore|Pakistan||
+Islamabad|Pakistan||
+Dhaka|Bangladesh||
+Colombo|Sri Lanka||
+Kathmandu|Nepal||
+Manila|Philippines||Metro Manila
+Makati|Philippines||
+Taguig|Philippines||
+Quezon City|Philippines||
+Cebu|Philippines||Cebu City
+Jakarta|Indonesia||
+Bandung|Indonesia||
+Kuala Lumpur|Malaysia||
+Penang|Malaysia||
+Cyberjaya|Malaysia||
+Bangkok|Thailand||
+Ho Chi Minh City|Vietnam||Saigon
+Hanoi|Vietnam||
+Da Nang|Vietnam||
+Phnom Penh|Cambodia||
+Yangon|Myanmar||
+Almaty|Kazakhstan||
+Tashkent|Uzbekistan||
+Sydney|Australia|NSW|
+Melbourne|Australia|VIC|
+Brisbane|Australia|QLD|
+Perth|Australia|WA|
+Adelaide|Australia|SA|
+Canberra|Australia|ACT|
+Hobart|Australia|TAS|
+Auckland|New Zealand||
+Wellington|New Zealand||
+Christchurch|New Zealand||
+"""
+
+# Continents and sales regions; a region with no country counts as Remote
+REGION_DATA = """
+Europe|EU;European Union
+Asia|
+South East Asia|Southeast Asia;SEA
+North America|NA;NAMER
+South America|
+Latin America|LATAM
+Central America|
+Africa|
+Oceania|
+Middle East|
+Americas|
+EMEA|
+APAC|Asia Pacific;Asia-Pacific
+"""
+
+REMOTE_TERMS = ('remote', 'work from home', 'wfh', 'anywhere', 'worldwide', 'distributed', 'fully remote')
+
+# Words that carry no place information when choosing an unrecognized city segment
+NOISE_TOKENS = frozenset({
+    'remote', 'hybrid', 'onsite', 'on', 'site', 'office', 'offices', 'hq', 'headquarters',
+    'multiple', 'locations', 'location', 'various', 'flexible', 'or', 'and', 'in', 'based',
+    'work', 'from', 'home', 'wfh', 'anywhere', 'worldwide', 'distributed', 'fully', 'time'
+})
+
+SEGMENT_SPLIT = re.compile(r'\s*(?:[,;|/()\[\]]|\s[-–—]\s)\s*')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+CODE_PATTERN = re.compile(r'^[A-Z]{2,3}$')
+
+class Place(NamedTuple):
+    kind: str       # 'country', 'state', 'city' or 'region'
+    name: str
+    country: str    # Owning country ('' for regions)
+    state: str      # State/province code or name ('' when not applicable)
+
+class ParsedLocation(NamedTuple):
+    city: str
+    state: str
+    country: str
+    region: str
+    remote: bool
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so "São Paulo" and "Sao Paulo" share one key"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_PATTERN.findall(normalize_text(text)))
+
+def _rows(table: str) -> List[List[str]]:
+    return [line.split('|') for line in table.strip().splitlines()]
+
+class Gazetteer:
+    """Token trie over every known place name and alias"""
+
+    TERMINAL = ''  # Tokens are never empty, so '' marks the end of a name
+
+    def __init__(self):
+        self.root: Dict[str, dict] = {}
+        self.max_depth = 0
+        self.countries: Dict[str, Place] = {}
+        self.country_codes: Dict[str, str] = {}
+        self.state_codes: Dict[str, Dict[str, Place]] = {}
+        self.aliases: Dict[str, List[str]] = {}
+        self.labels_by_country: Dict[str, List[str]] = {}
+        self.regions: List[str] = []
+
+    @classmethod
+    def build(cls) -> 'Gazetteer':
+        gazetteer = cls()
+
+        for name, iso2, iso3, aliases in _rows(COUNTRY_DATA):
+            place = Place('country', name, name, '')
+            gazetteer.countries[name] = place
+            gazetteer.country_codes[iso2] = name
+            gazetteer.country_codes[iso3] = name
+            gazetteer.add(name, place, [alias for alias in aliases.split(';') if alias])
+
+        for country, code, name in _rows(STATE_DATA):
+            place = Place('state', name, country, code)
+            gazetteer.state_codes.setdefault(code, {})[country] = place
+            gazetteer.add(name, place)
+
+        for name, country, state, aliases in _rows(CITY_DATA):
+            gazetteer.add(name, Place('city', name, country, state),
+                          [alias for alias in aliases.split(';') if alias])
+
+        for name, aliases in _rows(REGION_DATA):
+            gazetteer.add(name, Place('region', name, '', ''),
+                          [alias for alias in aliases.split(';') if alias and not CODE_PATTERN.match(alias)])
+
+        return gazetteer
+
+    def add(self, name: str, place: Place, aliases: List[str] = ()):
+        """Insert a name and its aliases; one key may map to several places (Georgia, Washington)"""
+        for label in (name, *aliases):
+            tokens = tokenize(label)
+            node = self.root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            places = node.setdefault(self.TERMINAL, [])
+            if place not in places:
+                places.append(place)
+            self.max_depth = max(self.max_depth, len(tokens))
+            if label != name:
+                self.aliases.setdefault(name, []).append(label)
+            if place.kind in ('city', 'state'):
+                self.labels_by_country.setdefault(place.country, []).append(label)
+        if place.kind == 'region':
+            self.regions.append(name)
+
+    def find(self, tokens: Tuple[str, ...]) -> List[Tuple[int, int, List[Place]]]:
+        """Longest non-overlapping matches as (start, end, candidates), scanning left to right"""
+        matches = []
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            best = None
+            j = i
+            while j < len(tokens) and j - i < self.max_depth:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if self.TERMINAL in node:
+                    best = (i, j, node[self.TERMINAL])
+            if best:
+                matches.append(best)
+                i = best[1]
+            else:
+                i += 1
+        return matches
+
+    def names_for_country(self, country: str) -> List[str]:
+        """Country name, aliases, state and city names - used to pre-filter SQL queries"""
+        names = [country, *self.aliases.get(country, []), *self.labels_by_country.get(country, [])]
+        return list(dict.fromkeys(names))
+
+GAZETTEER = Gazetteer.build()
+COUNTRY_NAMES = sorted(GAZETTEER.countries)
+
+def _pick(candidates: List[Place], anchor: str, filled: set, state: str = '') -> Place:
+    """Resolve an ambiguous name, preferring the anchor country, the given state and unfilled slots"""
+    priority = {'city': 0, 'country': 1, 'state': 2, 'region': 3}
+    consistent = [p for p in candidates if not anchor or p.kind == 'region' or p.country == anchor]
+    pool = consistent or candidates
+    return min(pool, key=lambda p: (p.kind in filled, bool(state) and p.kind == 'city' and p.state != state, priority[p.kind]))
+
+def _trailing_state(segments: List[str], matches: List[List[Place]]) -> Optional[Place]:
+    """
+    A trailing US/Canadian state code ("Paris, TX", "Vancouver, WA"), or another country's when a matched
+    city lies in that state ("Perth, WA"). Codes that are also country codes ("Bangalore, IN", "Toronto, CA")
+    stay countries when a matched place lies in that country.
+    """
+    last = segments[-1].strip() if len(segments) > 1 else ''
+    if len(last) != 2 or not CODE_PATTERN.match(last):
+        return None
+    by_country = GAZETTEER.state_codes.get(last, {})
+    in_state = next((p for candidates in matches for p in candidates
+                     if p.kind == 'city' and p.state == last and p.country in by_country), None)
+    if in_state:
+        return by_country[in_state.country]
+    state = by_country.get('United States') or by_country.get('Canada')
+    if state is None:
+        return None
+    code_country = GAZETTEER.country_codes.get(last)
+    if code_country and any(p.country == code_country for candidates in matches for p in candidates):
+        return None
+    return state
+
+def _parse_uncached(raw: str) -> ParsedLocation:
+    text = (raw or '').strip()
+    normalized = normalize_text(text)
+    remote = any(term in normalized for term in REMOTE_TERMS)
+
+    # Only the first of several alternatives ("NYC; London") is kept
+    segments = [s for s in SEGMENT_SPLIT.split(text) if s and s.strip()]
+
+    # Pass 1: trie matches per segment
+    segment_matches = []
+    for segment in segments:
+        segment_matches.append([candidates for _, _, candidates in GAZETTEER.find(tokenize(segment))])
+
+    # Anchor country from an unambiguous country name, then a trailing state code ("Paris, TX" is in
+    # Texas, not France), then any unambiguous city/state, then a trailing country code ("Lyon, FR")
+    all_matches = [candidates for found in segment_matches for candidates in found]
+    anchor = next((c[0].name for c in all_matches if all(p.kind == 'country' for p in c)), '')
+    trailing_state = _trailing_state(segments, all_matches)
+    if trailing_state and anchor and anchor != trailing_state.country:
+        trailing_state = None
+    if trailing_state:
+        anchor = trailing_state.country
+        segments, segment_matches = segments[:-1], segment_matches[:-1]
+    if not anchor:
+        anchor = next((c[0].country for c in all_matches
+                       if c[0].country and all(p.country == c[0].country for p in c)), '')
+
+    codes = [(i, s.strip()) for i, s in enumerate(segments) if CODE_PATTERN.match(s.strip())]
+    if not anchor and codes:
+        last_code = codes[-1][1]
+        us_state = GAZETTEER.state_codes.get(last_code, {}).get('United States')
+        if len(last_code) == 2 and us_state and len(segments) > 1:
+            anchor = 'United States'
+        elif last_code in GAZETTEER.country_codes:
+            anchor = GAZETTEER.country_codes[last_code]
+
+    # Pass 2: fill city/state/country slots
+    city = state = country = region = ''
+    state_place = trailing_state
+    filled = {'state'} if trailing_state else set()
+    unmatched = []
+    for index, segment in enumerate(segments):
+        found = segment_matches[index]
+        code = segment.strip()
+        if not found and CODE_PATTERN.match(code):
+            by_country = GAZETTEER.state_codes.get(code, {})
+            if anchor and anchor in by_country and 'state' not in filled:
+                state_place = by_country[anchor]
+                filled.add('state')
+            elif (code in GAZETTEER.country_codes and 'country' not in filled
+                  and GAZETTEER.country_codes[code] == (anchor or GAZETTEER.country_codes[code])):
+                country = GAZETTEER.country_codes[code]
+                filled.add('country')
+            continue
+        if not found:
+            unmatched.append(segment)
+            continue
+        for candidates in found:
+            place = _pick(candidates, anchor, filled, trailing_state.state if trailing_state else '')
+            if place.kind in filled:
+                continue
+            filled.add(place.kind)
+            if place.kind == 'city':
+                city = place.name
+                if place.state and 'state' not in filled:
+                    state_place = GAZETTEER.state_codes[place.state].get(place.country)
+            elif place.kind == 'state':
+                state_place = place
+            elif place.kind == 'country':
+                country = place.name
+            else:
+                region = place.name
+            anchor = anchor or place.country
+
+    if state_place:
+        state = state_place.state
+    country = country or anchor or (state_place.country if state_place else '')
+
+    if not city and (country or state_place):
+        for segment in unmatched:
+            candidate = segment.strip()
+            tokens = tokenize(candidate)
+            if (tokens and not any(ch.isdigit() for ch in candidate)
+                    and not set(tokens) <= NOISE_TOKENS and not CODE_PATTERN.match(candidate)):
+                city = candidate
+                break
+
+    if city and city == country:
+        city = ''
+    return ParsedLocation(city, state, country, region, remote)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_location(raw: str) -> ParsedLocation:
+    """Parse a raw location string into city/state/country/region (memoized)"""
+    return _parse_uncached(raw)
+
+class LocationStandardizer:
+    """Standardize scraped location strings to "City, ST, Country" using the shared gazetteer"""
+
+    def parse(self, raw_location: str) -> ParsedLocation:
+        return parse_location(raw_location or '')
+
+    def standardize_location(self, raw_location: str) -> str:
+        """Standardized display form; unrecognized strings are returned cleaned but unchanged"""
+        parsed = self.parse(raw_location)
+        parts = [part for part in (parsed.city, parsed.state, parsed.country or parsed.region) if part]
+        if parsed.remote:
+            parts.insert(0, 'Remote')
+        if parts:
+            return ', '.join(parts)
+        return ' '.join((raw_location or '').split()).strip(' ,') or 'No location'
+
+    def extract_country(self, raw_location: str) -> Optional[str]:
+        """Country name for grouping and filtering; remote and region-only locations map to "Remote" """
+        parsed = self.parse(raw_location)
+        if parsed.remote:
+            return 'Remote'
+        if parsed.country:
+            return parsed.country
+        if parsed.region:
+            return 'Remote'
+        return None
+
+    def is_country(self, name: str) -> bool:
+        return name in GAZETTEER.countries
+
+    def search_terms(self, country: str) -> List[str]:
+        """Substrings that can appear in a stored location for this country (SQL pre-filter)"""
+        if country == 'Remote':
+            return ['Remote', *GAZETTEER.regions]
+        terms = GAZETTEER.names_for_country(country)
+        codes = [code for code, name in GAZETTEER.country_codes.items() if name == country]
+        codes += [code for code, places in GAZETTEER.state_codes.items() if country in places]
+        return terms + [f", {code}" for code in codes]
+
+    @staticmethod
+    def cache_info():
+        return parse_location.cache_info()
+
+    @staticmethod
+    def clear_cache():
+        parse_location.cache_clear()
+
+BENCHMARK_SAMPLES = [
+    'San Francisco, CA, USA', 'Denver, CO, USA', 'Montreal, QC, CAN', 'Toronto, ON, CAN',
+    'Bengaluru, IND', 'Pune, IND', 'California, USA - Remote', 'United Kingdom, Edinburgh, SC, Freer',
+    'Turkey, Istanbul, Bilisim Vadisi', 'Spain, Valencia', 'Ireland, Limerick', 'Philippines, Cavite (jp)',
+    'Singapore, Kallang', 'India, Bangalore, Aveda Meta', 'Oslo, Radhusgata 27', 'Helsinki', 'Buenos Aires',
+    'New York, NY', 'London, GB', 'Berlin, DE', 'São Paulo, Brazil', 'Tel Aviv-Yafo, Israel',
+    'Remote - Europe', 'Atlanta, Georgia', 'Tbilisi, Georgia', 'Seattle, Washington', 'EMEA',
+    'Cupertino, California, United States', 'Sydney, NSW, Australia', 'Hong Kong'
+]
+
+def _naive_country(raw: str) -> Optional[str]:
+    """Baseline for the benchmark: substring scan over every country and city name"""
+    lowered = raw.lower()
+    for name in COUNTRY_NAMES:
+        if name.lower() in lowered:
+            return name
+    for line in _rows(CITY_DATA):
+        if line[0].lower() in lowered:
+            return line[1]
+    return None
+
+def run_benchmark(rounds: int = 2000):
+    """Microbenchmark: naive scan vs compiled trie (cold) vs LRU-cached lookups"""
+    standardizer = LocationStandardizer()
+    calls = rounds * len(BENCHMARK_SAMPLES)
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for sample in BENCHMARK_SAMPLES:
+                fn(sample)
+        elapsed = time.perf_counter() - start
+        print(f"  {label:<28} {elapsed * 1e6 / calls:8.2f} µs/call  ({calls:,} calls in {elapsed:.3f}s)")
+
+    print(f"📍 Location standardizer benchmark ({len(BENCHMARK_SAMPLES)} samples x {rounds} rounds)")
+    timed('naive substring scan', _naive_country)
+    timed('compiled trie (uncached)', _parse_uncached)
+    standardizer.clear_cache()
+    timed('trie + LRU cache', standardizer.standardize_location)
+    print(f"  cache: {standardizer.cache_info()}")
+    print()
+    for sample in BENCHMARK_SAMPLES:
+        print(f"  {sample!r:<42} → {standardizer.standardize_location(sample)!r}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        standardizer = LocationStandardizer()
+        for raw in sys.argv[1:]:
+            print(f"{raw!r} → {standardizer.standardize_location(raw)!r} (country: {standardizer.extract_country(raw)})")
+    else:
+        run_benchmark()
@@ -2641,6 +2641,9 @@ class JobApplicationAssistant {
                 
             case 'submitted':
                 this.updateAutomationStatus('Submission detected! 🎉', 100);
+                if (this.formFiller) {
+                    this.formFiller.rememberAcceptedAnswers();
+                }
                 setTimeout(() => {
                     if (progress.status === 'next_job') {
                         this.updateAutomationStatus(`Moving to: ${progress.nextJob.job_title}`, 100);
@@ -434,7 +434,15 @@ class SmartFormFiller {
             });
         }
         
-        const ollamaAnswers = await this.getOllamaFormAnswers(formStructure, this.currentProfile);
+        // Fields are filled as their streamed answers arrive; the pass below reuses those fills
+        this.streamedFills = new Map();
+        this.streamFillQueue = Promise.resolve();
+        const ollamaAnswers = await this.getOllamaFormAnswers(formStructure, this.currentProfile, (fieldId, value) => {
+            this.streamFillQueue = this.streamFillQueue
+                .then(() => this.fillStreamedAnswer(fieldId, value))
+                .catch(error => console.error('Error filling streamed answer:', fieldId, error));
+        });
+        await this.streamFillQueue;
         
         if (ollamaAnswers) {
             await this.updateProgressStep('ai-processing', 'completed');
@@ -532,9 +540,13 @@ class SmartFormFiller {
                 
                 
                 let result;
+                const streamed = this.streamedFills && this.streamedFills.get(fieldInfo);
                 
-                // RESUME UPLOAD: Use file upload logic for file fields
-                if (fieldInfo.type === 'file') {
+                if (streamed && streamed.value === ollamaValue) {
+                    // Already filled when its answer was streamed
+                    result = streamed.result;
+                } else if (fieldInfo.type === 'file') {
+                    // RESUME UPLOAD: Use file upload logic for file fields
                     console.log(`📎 RESUME_UPLOAD: Processing file field with resume upload`);
                     result = await this.fillFileFieldAIOnly(fieldInfo); // AI-only file upload
                 } else if (ollamaValue && ollamaValue !== "SKIP_FILE_UPLOAD") {
@@ -580,8 +592,10 @@ class SmartFormFiller {
                 }
 
                 // Sequential delay between fields - TEST_ID: OLLAMA_FILL_v1
-                // Brief pause between fields
-                await this.delay(500);
+                // Brief pause between fields (streamed fields were paced as they arrived)
+                if (!streamed) {
+                    await this.delay(500);
+                }
 
             } catch (error) {
                 console.error('Error filling field:', fieldInfo.label, error);
@@ -1131,7 +1145,29 @@ class SmartFormFiller {
         return 'generic';
     }
 
-    async getOllamaFormAnswers(formStructure, userProfile) {
+    findAnsweredField(fieldId) {
+        // The detected (non-file) field an answer's field id refers to
+        return this.detectedFields.find(field =>
+            field.type !== 'file' &&
+            [field.id, field.name, field.element.id, field.element.name].includes(fieldId)
+        );
+    }
+
+    async fillStreamedAnswer(fieldId, value) {
+        // Fill one field as soon as its streamed answer arrives (file fields wait for the final pass)
+        const fieldInfo = this.findAnsweredField(fieldId);
+        if (!fieldInfo || !value || value === "SKIP_FILE_UPLOAD" || this.streamedFills.has(fieldInfo)) {
+            return;
+        }
+
+        const result = await this.fillFieldWithOllamaAnswer(fieldInfo, value);
+        result.element = fieldInfo.element;
+        this.streamedFills.set(fieldInfo, { value, result });
+        console.log(`${result.success ? '✅' : '⚠️'} Streamed fill: ${fieldInfo.label || fieldInfo.name || fieldId}`);
+        await this.delay(500);
+    }
+
+    async getOllamaFormAnswers(formStructure, userProfile, onAnswer = null) {
         console.log('🧠 Sending profile and form data to AI backend');
         console.log('⏳ AI is thinking... Please wait while the language model analyzes the form and generates intelligent answers.');
         
@@ -1141,25 +1177,41 @@ class SmartFormFiller {
             aiThinkingStatus: 'Analyzing form fields with AI...'
         });
         
+        this.memoryQuestions = {};
+        const requestBody = JSON.stringify({
+            formStructure: formStructure,
+            userProfile: userProfile,
+            jobUrl: window.location.href  // Include current page URL to lookup job description
+        });
+        
+        // Signed-in users also get answers remembered from their earlier applications
+        const { authToken } = await chrome.storage.local.get(['authToken']);
+        const headers = { 'Content-Type': 'application/json' };
+        if (authToken) {
+            headers['Authorization'] = `Bearer ${authToken}`;
+        }
+        
         try {
-            // Call backend endpoint instead of Ollama directly
-            const response = await fetch('http://localhost:8000/api/chrome-extension/analyze-form', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    formStructure: formStructure,
-                    userProfile: userProfile,
-                    jobUrl: window.location.href  // Include current page URL to lookup job description
-                })
-            });
+            let answers;
+            try {
+                answers = await this.streamOllamaFormAnswers(requestBody, headers, onAnswer);
+            } catch (streamError) {
+                // Failed before any answer arrived (older backends have no streaming endpoint) - wait for the full answer instead
+                console.warn('🧠 ⚠️ Streaming analysis failed, retrying without streaming:', streamError);
+                const response = await fetch('http://localhost:8000/api/chrome-extension/analyze-form', {
+                    method: 'POST',
+                    headers: headers,
+                    body: requestBody
+                });
 
-            if (!response.ok) {
-                throw new Error(`Backend API error: ${response.status}`);
-            }
+                if (!response.ok) {
+                    throw new Error(`Backend API error: ${response.status}`);
+                }
 
-            const data = await response.json();
+                const data = await response.json();
+                answers = data.answers;
+                this.memoryQuestions = data.memory_questions || {};
+            }
             console.log('✅ AI analysis complete! Generated intelligent answers for form fields.');
             console.log('✅ Received AI answers from backend');
             
@@ -1169,7 +1221,7 @@ class SmartFormFiller {
                 aiThinkingStatus: 'Processing complete'
             });
             
-            return data.answers;
+            return answers;
             
         } catch (error) {
             console.error('🧠 ❌ Content: Error calling backend for Ollama analysis:', error);
@@ -1186,6 +1238,121 @@ class SmartFormFiller {
         }
     }
 
+    async streamOllamaFormAnswers(requestBody, headers, onAnswer = null) {
+        // The backend sends one JSON event per line as soon as each field's answer is generated
+        const response = await fetch('http://localhost:8000/api/chrome-extension/analyze-form/stream', {
+            method: 'POST',
+            headers: headers,
+            body: requestBody
+        });
+
+        if (!response.ok || !response.body) {
+            throw new Error(`Backend API error: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const answers = {};
+        let buffer = '';
+        let received = 0;
+
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+
+                for (const line of lines) {
+                    if (!line.trim()) {
+                        continue;
+                    }
+                    const event = JSON.parse(line);
+                    if (event.type === 'start') {
+                        this.memoryQuestions = event.memory_questions || {};
+                    } else if (event.type === 'answer') {
+                        answers[event.field_id] = event.value;
+                        received++;
+                        if (onAnswer) {
+                            onAnswer(event.field_id, event.value);
+                        }
+                        if (this.progressCallback) {
+                            this.progressCallback({
+                                current: received,
+                                total: this.totalFields,
+                                field: `🧠 AI answered: ${event.semantic_name || event.field_id}`,
+                                success: true
+                            });
+                        }
+                        await chrome.storage.local.set({
+                            aiThinkingStatus: `Generated ${received} of ${this.totalFields} answers...`
+                        });
+                    } else if (event.type === 'done') {
+                        return event.answers;
+                    } else if (event.type === 'error') {
+                        throw new Error(event.detail);
+                    }
+                }
+            }
+            throw new Error('Analysis stream ended without a result');
+        } catch (error) {
+            if (received === 0) {
+                throw error;
+            }
+            // Keep what was generated instead of running the whole analysis again
+            console.warn(`🧠 ⚠️ Analysis stream failed after ${received} answers, keeping them:`, error);
+            return answers;
+        }
+    }
+
+    submittedValue(fieldInfo) {
+        // A field's value as the user submitted it, or null when it was left empty
+        const element = fieldInfo.element;
+        if (element.tagName === 'SELECT') {
+            const option = element.options[element.selectedIndex];
+            return option && option.value ? option.text.trim() : null;
+        }
+        if (element.type === 'checkbox') {
+            return element.checked;
+        }
+        if (element.type === 'radio') {
+            const checked = document.querySelector(`input[type="radio"][name="${CSS.escape(element.name)}"]:checked`);
+            return checked ? checked.value : null;
+        }
+        return (element.value || '').trim() || null;
+    }
+
+    async rememberAcceptedAnswers() {
+        // After submission, the screening answers the user accepted (possibly edited) go into their answer memory
+        const answers = Object.entries(this.memoryQuestions || {}).map(([fieldId, question]) => {
+            const fieldInfo = this.findAnsweredField(fieldId);
+            const answer = fieldInfo ? this.submittedValue(fieldInfo) : null;
+            return { question, answer, field_type: fieldInfo ? fieldInfo.type : null };
+        }).filter(item => item.answer !== null);
+
+        const { authToken } = await chrome.storage.local.get(['authToken']);
+        if (!answers.length || !authToken) {
+            return;
+        }
+        try {
+            const response = await fetch('http://localhost:8000/user/answer-memory/accepted', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'Authorization': `Bearer ${authToken}` },
+                body: JSON.stringify({ answers })
+            });
+            if (!response.ok) {
+                throw new Error(`Backend API error: ${response.status}`);
+            }
+            const result = await response.json();
+            console.log(`🧠 Remembered ${result.stored} submitted answers`);
+        } catch (error) {
+            console.error('🧠 ❌ Could not remember submitted answers:', error);
+        }
+    }
+
     // Public methods for external use
     getDetectedFields() {
         return this.detectedFields;
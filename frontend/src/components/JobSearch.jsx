@@ -56,7 +56,7 @@ function JobSearch() {
     setFetching(true)
     try {
       const result = await fetchJobsManually()
-      alert(`Successfully fetched ${result.total_jobs} jobs!`)
+      alert(`${result.message} (job ${result.job_id}). ${result.total_jobs} jobs currently available.`)
       // Refresh search if we have a current search
       if (title.trim()) {
         const results = await searchJobs(title, location)
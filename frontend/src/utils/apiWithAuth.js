@@ -96,8 +96,13 @@ export const searchJobs = async (title, location = '', limit = 50) => {
   return response.data
 }
 
-export const fetchJobsManually = async () => {
-  const response = await api.post('/jobs/fetch')
+export const fetchJobsManually = async (scope = {}) => {
+  const response = await api.post('/jobs/fetch', scope)
+  return response.data
+}
+
+export const getJobFetchProgress = async (jobId) => {
+  const response = await api.get(`/jobs/fetch/${jobId}`)
   return response.data
 }
 